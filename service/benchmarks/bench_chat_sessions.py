@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark sustained chat message throughput for each session store
+
+Every simulated chat adds a user message, reads the history a prompt
+would use, and adds the assistant reply, all concurrently.
+
+Run from the service directory:
+    python benchmarks/bench_chat_sessions.py --chats 100 --turns 50
+    python benchmarks/bench_chat_sessions.py --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.repositories.in_memory_chat_session_repository import InMemoryChatSessionRepository
+from src.infrastructure.repositories.redis_chat_session_repository import RedisChatSessionRepository
+from src.infrastructure.repositories.sqlite_chat_session_repository import SqliteChatSessionRepository
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+
+async def run_chat(chat_service: ChatServiceImpl, turns: int) -> None:
+    session = await chat_service.create_chat_session("bench.csv")
+    for turn in range(turns):
+        await chat_service.add_message(session.session_id, f"Question {turn}?", "user")
+        await chat_service.repository.get_session(session.session_id, message_limit=10)
+        await chat_service.add_message(session.session_id, f"Answer {turn}", "assistant")
+
+async def measure(label: str, repository, chats: int, turns: int) -> None:
+    chat_service = ChatServiceImpl(Mock(), repository=repository)
+    start = time.perf_counter()
+    await asyncio.gather(*[run_chat(chat_service, turns) for _ in range(chats)])
+    await repository.flush()
+    elapsed = time.perf_counter() - start
+    await repository.close()
+
+    messages = chats * turns * 2
+    stats = repository.get_stats()
+    batches = stats.get("batches_written")
+    detail = f"  ({batches} transactions)" if batches is not None else ""
+    print(f"{label:<32} {messages / elapsed:10.0f} messages/s{detail}")
+
+async def main_async(args) -> None:
+    print(f"{args.chats} concurrent chats x {args.turns} turns\n")
+    await measure("in-memory", InMemoryChatSessionRepository(), args.chats, args.turns)
+    with tempfile.TemporaryDirectory() as tmp:
+        await measure("sqlite, write-through", SqliteChatSessionRepository(f"{tmp}/through.db", flush_interval=0), args.chats, args.turns)
+        await measure(
+            f"sqlite, write-behind {args.flush_interval_ms}ms",
+            SqliteChatSessionRepository(f"{tmp}/behind.db", flush_interval=args.flush_interval_ms / 1000),
+            args.chats, args.turns
+        )
+    if args.redis_url:
+        await measure("redis, pipelined", RedisChatSessionRepository(args.redis_url, key_prefix="bench:"), args.chats, args.turns)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat session stores under concurrent chats")
+    parser.add_argument("--chats", type=int, default=50, help="Concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=40, help="Question/answer turns per chat")
+    parser.add_argument("--flush-interval-ms", type=int, default=50, help="Write-behind flush interval")
+    parser.add_argument("--redis-url", help="Also measure the Redis store against this server")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
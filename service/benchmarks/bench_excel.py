@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark Excel ingestion engines on a large multi-sheet workbook
+
+Run from the service directory:
+    python benchmarks/bench_excel.py --rows 50000 --sheets 3
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.services import excel_reader
+
+def build_workbook(rows: int, sheets: int, columns: int) -> bytes:
+    """Build a workbook with mixed numeric, text and date columns"""
+    rng = np.random.default_rng(0)
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        for sheet in range(sheets):
+            data = {}
+            for col in range(columns):
+                kind = col % 4
+                if kind == 0:
+                    data[f"int_{col}"] = rng.integers(0, 1000, rows)
+                elif kind == 1:
+                    data[f"float_{col}"] = rng.random(rows) * 1000
+                elif kind == 2:
+                    data[f"text_{col}"] = rng.choice(["north", "south", "east", "west"], rows)
+                else:
+                    data[f"date_{col}"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+            pd.DataFrame(data).to_excel(writer, index=False, sheet_name=f"Sheet{sheet + 1}")
+    return buffer.getvalue()
+
+def timed(label: str, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    sheets = len(result) if isinstance(result, dict) else 1
+    print(f"{label:<45} {best * 1000:10.1f} ms  ({sheets} sheet(s))")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel ingestion engines")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows per sheet")
+    parser.add_argument("--sheets", type=int, default=3, help="Number of sheets")
+    parser.add_argument("--columns", type=int, default=12, help="Columns per sheet")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    print(f"Building workbook: {args.sheets} sheets x {args.rows} rows x {args.columns} columns")
+    content = build_workbook(args.rows, args.sheets, args.columns)
+    print(f"Workbook size: {len(content) / (1024 * 1024):.1f} MB\n")
+
+    baseline = timed("pd.read_excel (openpyxl, first sheet only)",
+                     lambda: pd.read_excel(io.BytesIO(content)), args.repeat)
+    timed("pd.read_excel (openpyxl, all sheets)",
+          lambda: pd.read_excel(io.BytesIO(content), sheet_name=None), args.repeat)
+    streaming = timed("read_excel_sheets (openpyxl read_only)",
+                      lambda: excel_reader.read_excel_sheets(io.BytesIO(content), engine=excel_reader.ENGINE_OPENPYXL), args.repeat)
+    print(f"{'':<45} {baseline / streaming:10.1f}x vs baseline")
+
+    if excel_reader.CalamineWorkbook is not None:
+        calamine = timed("read_excel_sheets (calamine)",
+                         lambda: excel_reader.read_excel_sheets(io.BytesIO(content), engine=excel_reader.ENGINE_CALAMINE), args.repeat)
+        print(f"{'':<45} {baseline / calamine:10.1f}x vs baseline")
+    else:
+        print("python-calamine is not installed; skipping calamine engine")
+
+if __name__ == "__main__":
+    main()
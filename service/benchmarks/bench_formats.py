@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark columnar upload formats against the equivalent CSV
+
+Run from the service directory:
+    python benchmarks/bench_formats.py --rows 500000
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.enums.file_format import FileFormat
+from src.infrastructure.services.file_service_impl import _ingest_columnar, _ingest_csv
+
+def build_frame(rows: int, columns: int) -> pd.DataFrame:
+    """Build a frame with mixed numeric, text and date columns"""
+    rng = np.random.default_rng(0)
+    data = {}
+    for col in range(columns):
+        kind = col % 4
+        if kind == 0:
+            data[f"int_{col}"] = rng.integers(0, 1000, rows)
+        elif kind == 1:
+            data[f"float_{col}"] = rng.random(rows) * 1000
+        elif kind == 2:
+            data[f"text_{col}"] = rng.choice(["north", "south", "east", "west"], rows)
+        else:
+            data[f"date_{col}"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    return pd.DataFrame(data)
+
+def encode(df: pd.DataFrame) -> dict:
+    encoded = {}
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False)
+    encoded["csv"] = buffer.getvalue()
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    encoded["parquet"] = buffer.getvalue()
+    buffer = io.BytesIO()
+    df.to_feather(buffer)
+    encoded["feather"] = buffer.getvalue()
+    buffer = io.BytesIO()
+    df.to_json(buffer, orient="records", lines=True, date_format="iso")
+    encoded["ndjson"] = buffer.getvalue()
+    return encoded
+
+def timed(label: str, fn, size: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.1f} ms  {size / (1024 * 1024):8.1f} MB")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark columnar upload formats against CSV")
+    parser.add_argument("--rows", type=int, default=200000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=12, help="Number of columns")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    parser.add_argument("--no-optimize", action="store_true", help="Skip the dtype optimisation stage")
+    args = parser.parse_args()
+
+    print(f"Building dataset: {args.rows} rows x {args.columns} columns\n")
+    df = build_frame(args.rows, args.columns)
+    encoded = encode(df)
+    optimize = not args.no_optimize
+    projection = list(df.columns[:2])
+
+    baseline = timed("csv", lambda: _ingest_csv(encoded["csv"], optimize, None, 1 << 40),
+                     len(encoded["csv"]), args.repeat)
+    for name, file_format in (("parquet", FileFormat.PARQUET), ("feather", FileFormat.FEATHER), ("ndjson", FileFormat.NDJSON)):
+        full = timed(name, lambda: _ingest_columnar(encoded[name], file_format, None, optimize, 1 << 40),
+                     len(encoded[name]), args.repeat)
+        print(f"{'':<40} {baseline / full:10.1f}x vs csv")
+        projected = timed(f"{name} ({len(projection)} columns)",
+                          lambda: _ingest_columnar(encoded[name], file_format, projection, optimize, 1 << 40),
+                          len(encoded[name]), args.repeat)
+        print(f"{'':<40} {baseline / projected:10.1f}x vs csv")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark heap bytes per retained chat message
+
+Compares the previous ChatMessage layout (dict-backed dataclass, UUID id,
+datetime timestamp, a file name string per message) against the current
+slotted one. Message contents are shared between both runs, so the
+numbers are the per-message overhead on top of the text itself.
+
+Run from the service directory:
+    python benchmarks/bench_message_memory.py --messages 200000
+"""
+import argparse
+import secrets
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.entities.chat_message import ChatMessage
+
+@dataclass
+class LegacyChatMessage:
+    id: str
+    content: str
+    role: str
+    timestamp: datetime
+    file_name: Optional[str] = None
+
+CONTENTS = [f"Question or answer number {i} about the uploaded data" for i in range(100)]
+
+def legacy_message(i: int) -> LegacyChatMessage:
+    # Messages loaded from a store each carried their own copy of role and file name
+    return LegacyChatMessage(
+        id=str(uuid.uuid4()),
+        content=CONTENTS[i % len(CONTENTS)],
+        role="".join(["us", "er"]),
+        timestamp=datetime.now(),
+        file_name="".join(["sales_", "2024.csv"])
+    )
+
+def compact_message(i: int) -> ChatMessage:
+    return ChatMessage(
+        id=secrets.token_urlsafe(9),
+        content=CONTENTS[i % len(CONTENTS)],
+        role="".join(["us", "er"]),
+        timestamp=time.time(),
+        file_name="".join(["sales_", "2024.csv"])
+    )
+
+def measure(label: str, factory, count: int) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    messages = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_message = (after - before) / len(messages)
+    print(f"{label:<10} {per_message:8.1f} bytes/message  ({(after - before) / 1024 / 1024:.1f} MB for {count})")
+    return per_message
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure heap bytes per retained chat message")
+    parser.add_argument("--messages", type=int, default=200000, help="Messages to build per layout")
+    args = parser.parse_args()
+
+    legacy = measure("before", legacy_message, args.messages)
+    compact = measure("after", compact_message, args.messages)
+    print(f"\n{1 - compact / legacy:.0%} less memory per message")
+
+if __name__ == "__main__":
+    main()
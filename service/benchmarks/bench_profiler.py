@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorised data profiler against the per-column summary loop
+
+Run from the service directory:
+    python benchmarks/bench_profiler.py --tall-rows 1000000 --wide-columns 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.services.data_profiler import profile_dataframe, profile_summary
+
+def build_frame(rows: int, columns: int) -> pd.DataFrame:
+    """Build a frame with numeric, text and categorical columns"""
+    rng = np.random.default_rng(0)
+    data = {}
+    for col in range(columns):
+        kind = col % 4
+        if kind == 0:
+            data[f"int_{col}"] = rng.integers(0, 1000, rows)
+        elif kind == 1:
+            data[f"float_{col}"] = np.where(rng.random(rows) < 0.05, np.nan, rng.random(rows) * 1000)
+        elif kind == 2:
+            data[f"text_{col}"] = rng.choice(["north", "south", "east", "west", None], rows)
+        else:
+            data[f"category_{col}"] = pd.Categorical(rng.choice(["a", "b", "c"], rows))
+    return pd.DataFrame(data)
+
+def legacy_summary(df: pd.DataFrame) -> dict:
+    """The per-column loop the services used before the shared profiler"""
+    summary = {"total_rows": len(df), "total_columns": len(df.columns), "columns": {}}
+    for col in df.columns:
+        col_info = {
+            "type": str(df[col].dtype),
+            "non_null_count": int(df[col].count()),
+            "null_count": int(df[col].isnull().sum())
+        }
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            if not df[col].empty and df[col].notna().any():
+                col_info.update({
+                    "min": float(df[col].min()),
+                    "max": float(df[col].max()),
+                    "mean": float(df[col].mean()),
+                    "std": float(df[col].std()) if df[col].std() == df[col].std() else 0
+                })
+        elif df[col].dtype == 'object' or isinstance(df[col].dtype, pd.CategoricalDtype):
+            col_info.update({
+                "unique_count": int(df[col].nunique()),
+                "most_common": str(df[col].mode().iloc[0]) if not df[col].mode().empty else "N/A"
+            })
+        summary["columns"][col] = col_info
+    sample = [[str(value) for value in row.values] for _, row in df.head(3).iterrows()]
+    return summary, sample
+
+def timed(label: str, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.1f} ms")
+    return best
+
+def compare(name: str, df: pd.DataFrame, repeat: int) -> None:
+    print(f"{name}: {len(df)} rows x {len(df.columns)} columns")
+    legacy = timed("  per-column loop + iterrows", lambda: legacy_summary(df), repeat)
+    profiled = timed("  profile_dataframe", lambda: profile_summary(profile_dataframe(df)), repeat)
+    print(f"{'':<40} {legacy / profiled:10.1f}x faster\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data profiler on tall and wide frames")
+    parser.add_argument("--tall-rows", type=int, default=500000, help="Rows in the tall frame")
+    parser.add_argument("--tall-columns", type=int, default=12, help="Columns in the tall frame")
+    parser.add_argument("--wide-rows", type=int, default=1000, help="Rows in the wide frame")
+    parser.add_argument("--wide-columns", type=int, default=1000, help="Columns in the wide frame")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    compare("Tall frame", build_frame(args.tall_rows, args.tall_columns), args.repeat)
+    compare("Wide frame", build_frame(args.wide_rows, args.wide_columns), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark chat prompt size for wide datasets, with and without column selection
+
+Builds the chat prompt for a few questions over a synthetic dataset with
+many columns, once with statistics for every column and once with the
+compact schema plus the columns relevant to the question. Tokens are
+estimated at four characters each. With --ollama-url the time to first
+token of both prompts is measured against a running model too.
+
+Run from the service directory:
+    python benchmarks/bench_wide_prompts.py --columns 1000
+    python benchmarks/bench_wide_prompts.py --columns 300 --ollama-url http://localhost:11434 --model gemma3:4b
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+
+QUESTIONS = [
+    "What is the total revenue?",
+    "Which city has the most customers?",
+    "How did the discount rate change over time?",
+    "Summarise the data"
+]
+
+TOPICS = ["revenue", "cost", "discount", "rating", "quantity", "margin", "visits", "returns", "score", "weight"]
+REGIONS = ["north", "south", "east", "west", "central"]
+
+def build_dataframe(columns: int, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {
+        "customer_name": rng.choice(["Ann", "Ben", "Cleo", "Dev"], rows),
+        "city": rng.choice(["Berlin", "Paris", "Madrid", "Rome"], rows),
+        "order_date": pd.date_range("2024-01-01", periods=rows, freq="h")
+    }
+    for i in range(columns - len(data)):
+        name = f"{REGIONS[i % len(REGIONS)]}_{TOPICS[i // len(REGIONS) % len(TOPICS)]}_{i}"
+        data[name] = rng.normal(100, 15, rows).round(2)
+    return pd.DataFrame(data)
+
+async def build_prompts(df: pd.DataFrame, max_columns: int) -> dict:
+    ai_service = Mock()
+    ai_service.make_api_request = Mock(return_value="")
+    chat_service = ChatServiceImpl(ai_service, prompt_max_columns=max_columns)
+    session = await chat_service.create_chat_session("wide.csv", dataset_key="bench")
+
+    prompts = {}
+    for question in QUESTIONS:
+        await chat_service.get_chat_response(session.session_id, question, df)
+        prompts[question] = ai_service.make_api_request.call_args.args[0]
+    await chat_service.history.drain()
+    return prompts
+
+def time_to_first_token(ai_service, messages) -> float:
+    start = time.perf_counter()
+    for _ in ai_service.make_streaming_api_request(messages, max_tokens=50):
+        return time.perf_counter() - start
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare chat prompts for wide datasets with and without column selection")
+    parser.add_argument("--columns", type=int, default=1000, help="Columns in the synthetic dataset")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows in the synthetic dataset")
+    parser.add_argument("--top-k", type=int, default=30, help="Columns described in full per question")
+    parser.add_argument("--ollama-url", help="Also measure time to first token against this Ollama server")
+    parser.add_argument("--model", default="gemma3:4b", help="Ollama model for the time to first token runs")
+    args = parser.parse_args()
+
+    df = build_dataframe(args.columns, args.rows)
+    full = asyncio.run(build_prompts(df, max_columns=args.columns))
+    selected = asyncio.run(build_prompts(df, max_columns=args.top_k))
+
+    ai_service = None
+    if args.ollama_url:
+        from src.infrastructure.services.ollama_ai_service_impl import OllamaAIServiceImpl
+        ai_service = OllamaAIServiceImpl(args.ollama_url, args.model)
+
+    print(f"{args.columns} columns x {args.rows} rows, top {args.top_k} columns per question\n")
+    for question in QUESTIONS:
+        full_messages = full[question]
+        selected_messages = selected[question]
+        full_tokens = len(full_messages[1]["content"]) // 4
+        selected_tokens = len(selected_messages[1]["content"]) // 4
+        line = f"{question:<46} {full_tokens:8d} -> {selected_tokens:6d} tokens ({1 - selected_tokens / full_tokens:.0%} fewer)"
+        if ai_service is not None:
+            line += f"  TTFT {time_to_first_token(ai_service, full_messages):6.2f}s -> {time_to_first_token(ai_service, selected_messages):6.2f}s"
+        print(line)
+
+if __name__ == "__main__":
+    main()
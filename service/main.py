@@ -1,19 +1,33 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from src.infrastructure.config import get_settings
+from src.infrastructure.dependencies import get_chat_session_repository, get_dataset_store, get_executor, get_job_queue
+from src.infrastructure.services.session_sweeper import sweep_sessions
 from src.presentation.api.v1.file_routes import router as file_router
 from src.presentation.api.v1.openrouter_chat_routes import router as chat_router
 from src.presentation.api.v1.ollama_chat_routes import router as ollama_chat_router
+from src.presentation.api.v1.metrics_routes import router as metrics_router
+from src.presentation.api.v1.upload_routes import router as upload_router
+from src.presentation.api.v1.job_routes import router as job_router
+from src.presentation.api.v1.message_pagination import PAGINATION_HEADERS
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     settings = get_settings()
     print(f"Starting FastAPI server with environment: {settings.environment}")
+    sweeper = asyncio.create_task(
+        sweep_sessions(get_chat_session_repository(), settings.chat_session_sweep_interval_seconds, get_dataset_store())
+    )
     yield
     # Shutdown
     print("Shutting down FastAPI server")
+    sweeper.cancel()
+    await get_job_queue().shutdown()
+    await get_chat_session_repository().close()
+    get_executor().shutdown()
 
 app = FastAPI(
     title="File Analysis API",
@@ -29,12 +43,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGINATION_HEADERS,
 )
 
 # Include routers
 app.include_router(file_router, prefix="/api/v1", tags=["files"])
 app.include_router(chat_router, prefix="/api/v1", tags=["chat"])
 app.include_router(ollama_chat_router, prefix="/api/v1", tags=["ollama-chat"])
+app.include_router(metrics_router, prefix="/api/v1", tags=["metrics"])
+app.include_router(upload_router, prefix="/api/v1", tags=["uploads"])
+app.include_router(job_router, prefix="/api/v1", tags=["jobs"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,39 @@
+import io
+from typing import AsyncIterator, Optional
+from ...entities.analysis_job import AnalysisJob
+from ...enums.file_format import FileFormat
+from ...services.job_queue import JobQueueInterface, ProgressCallback
+from .chat_use_case import ChatUseCase
+from .file_upload_use_case import FileUploadUseCase
+
+class AnalysisJobUseCase:
+    """Runs upload analyses in the background and reports their progress"""
+    
+    def __init__(self, job_queue: JobQueueInterface, file_upload_use_case: FileUploadUseCase, chat_use_case: Optional[ChatUseCase] = None):
+        self.job_queue = job_queue
+        self.file_upload_use_case = file_upload_use_case
+        self.chat_use_case = chat_use_case
+    
+    async def submit(self, content: bytes, filename: str, force_refresh: bool = False) -> AnalysisJob:
+        """Queue the analysis of an uploaded file"""
+        async def run(progress: ProgressCallback):
+            analysis = await self.file_upload_use_case.execute(io.BytesIO(content), filename, force_refresh, progress)
+            
+            # Create chat session for single-table uploads
+            chat_session = None
+            if self.chat_use_case is not None and FileFormat.is_chat_supported(filename):
+                try:
+                    chat_session = await self.chat_use_case.create_session(filename, content)
+                except Exception as e:
+                    print(f"Error creating chat session: {e}")
+            return analysis, chat_session
+        
+        return await self.job_queue.submit(filename, run)
+    
+    def get_job(self, job_id: str) -> Optional[AnalysisJob]:
+        """Get the current state of a job"""
+        return self.job_queue.get_job(job_id)
+    
+    def watch(self, job_id: str) -> AsyncIterator[AnalysisJob]:
+        """Follow a job until it completes or fails"""
+        return self.job_queue.subscribe(job_id)
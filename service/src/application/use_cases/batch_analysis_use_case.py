@@ -0,0 +1,49 @@
+import asyncio
+import io
+from typing import AsyncIterator, List, Optional, Tuple
+from ...entities.batch_result import BatchFileResult
+from ...enums.file_format import FileFormat
+from .chat_use_case import ChatUseCase
+from .file_upload_use_case import FileUploadUseCase
+
+class BatchAnalysisUseCase:
+    """Analyses many uploads at once and reports each as soon as it is done.
+
+    Every file is started immediately: parsing and profiling run side by
+    side on the CPU pool and the LLM calls queue behind the provider's
+    request limit, so a batch takes about as long as its slowest file.
+    """
+    
+    def __init__(self, file_upload_use_case: FileUploadUseCase, chat_use_case: Optional[ChatUseCase] = None):
+        self.file_upload_use_case = file_upload_use_case
+        self.chat_use_case = chat_use_case
+    
+    async def execute(self, files: List[Tuple[str, bytes]], force_refresh: bool = False) -> AsyncIterator[BatchFileResult]:
+        """Yield one result per ``(filename, content)`` in completion order"""
+        tasks = [
+            asyncio.create_task(self._analyse(index, filename, content, force_refresh))
+            for index, (filename, content) in enumerate(files)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # The caller stopped listening; don't keep paying for LLM calls
+            for task in tasks:
+                task.cancel()
+    
+    async def _analyse(self, index: int, filename: str, content: bytes, force_refresh: bool) -> BatchFileResult:
+        try:
+            analysis = await self.file_upload_use_case.execute(io.BytesIO(content), filename, force_refresh)
+        except Exception as e:
+            print(f"Error processing file {filename}: {e}")
+            return BatchFileResult(index=index, file_name=filename, error=str(e))
+        
+        # Create chat session for single-table uploads
+        chat_session = None
+        if self.chat_use_case is not None and FileFormat.is_chat_supported(filename):
+            try:
+                chat_session = await self.chat_use_case.create_session(filename, content)
+            except Exception as e:
+                print(f"Error creating chat session: {e}")
+        return BatchFileResult(index=index, file_name=filename, analysis=analysis, chat_session=chat_session)
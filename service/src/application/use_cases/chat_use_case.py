@@ -1,36 +1,52 @@
-from typing import AsyncGenerator, List, Optional, Generator
+import asyncio
+import io
+from typing import AsyncGenerator, List, Optional, Tuple
 import pandas as pd
-from ...entities.chat_message import ChatMessage, ChatSession
+from ...entities.chat_message import ChatMessage, ChatSession, Cursor
+from ...enums.chat_mode import ChatMode
+from ...enums.file_format import FileFormat
 from ...services.chat_service import ChatServiceInterface
+from ...services.dataset_store import DatasetStoreInterface
+from ...services.fast_answer import FastAnswerInterface
 from ...services.file_service import FileServiceInterface
 
 class ChatUseCase:
-    def __init__(self, chat_service: ChatServiceInterface, file_service: FileServiceInterface):
+    def __init__(self, chat_service: ChatServiceInterface, file_service: FileServiceInterface, dataset_store: Optional[DatasetStoreInterface] = None, fast_answer: Optional[FastAnswerInterface] = None):
         self.chat_service = chat_service
         self.file_service = file_service
+        # Keeps each session's parsed upload so later turns need not resend it
+        self.dataset_store = dataset_store
+        # Answers simple lookups without the model
+        self.fast_answer = fast_answer
     
-    async def create_session(self, file_name: str) -> ChatSession:
-        """Create a new chat session for a file"""
-        return await self.chat_service.create_chat_session(file_name)
+    async def create_session(self, file_name: str, file_data: Optional[bytes] = None) -> ChatSession:
+        """Create a new chat session for a file, retaining its data when given"""
+        dataset_key = None
+        if file_data is not None:
+            _, dataset_key = await self._load_dataset(file_data, file_name)
+        return await self.chat_service.create_chat_session(file_name, dataset_key)
     
-    async def send_message(self, session_id: str, message: str, file_data: bytes, filename: str) -> str:
+    async def send_message(self, session_id: str, message: str, file_data: Optional[bytes] = None, filename: Optional[str] = None, mode: ChatMode = ChatMode.CHAT) -> str:
         """Send a message and get AI response"""
         try:
             # Add user message to session
             await self.chat_service.add_message(session_id, message, "user")
             
-            # Read the file data
-            import io
-            file_obj = io.BytesIO(file_data)
+            session = await self._get_session_data(session_id, file_data)
+            response, df = await self._get_fast_answer(session_id, session, message, file_data, filename)
+            if response is not None:
+                await self.chat_service.add_message(session_id, response, "assistant")
+                return response
             
-            # Parse the CSV data
-            if filename.lower().endswith('.csv'):
-                df = self.file_service.read_csv(file_obj)
-            else:
-                raise ValueError("Only CSV files are supported for chat")
+            # Queries read every column; chat answers may only need the cached profile
+            if df is None:
+                df = await self._get_dataframe(session_id, file_data, filename, full=mode == ChatMode.QUERY, session=session)
             
             # Get AI response
-            response = await self.chat_service.get_chat_response(session_id, message, df)
+            if mode == ChatMode.QUERY:
+                response = await self.chat_service.get_query_response(session_id, message, df)
+            else:
+                response = await self.chat_service.get_chat_response(session_id, message, df)
             
             # Add AI response to session
             await self.chat_service.add_message(session_id, response, "assistant")
@@ -42,44 +58,126 @@ class ChatUseCase:
             await self.chat_service.add_message(session_id, error_msg, "assistant")
             return error_msg
     
-    async def send_streaming_message(self, session_id: str, message: str, file_data: bytes, filename: str) -> AsyncGenerator[str, None]:
+    async def send_streaming_message(self, session_id: str, message: str, file_data: Optional[bytes] = None, filename: Optional[str] = None) -> AsyncGenerator[str, None]:
         """Send a message and get streaming AI response"""
         try:
             # Add user message to session
             await self.chat_service.add_message(session_id, message, "user")
             
-            # Read the file data
-            import io
-            file_obj = io.BytesIO(file_data)
+            session = await self._get_session_data(session_id, file_data)
+            response, df = await self._get_fast_answer(session_id, session, message, file_data, filename)
+            if response is not None:
+                await self.chat_service.add_message(session_id, response, "assistant")
+                yield response
+                return
             
-            # Parse the CSV data
-            if filename.lower().endswith('.csv'):
-                df = self.file_service.read_csv(file_obj)
-            else:
-                raise ValueError("Only CSV files are supported for chat")
+            if df is None:
+                df = await self._get_dataframe(session_id, file_data, filename, session=session)
             
             # Get streaming AI response
             response_stream = self.chat_service.get_streaming_chat_response(session_id, message, df)
             
             # Collect the full response for storage
-            full_response = ""
+            fragments: List[str] = []
             async for chunk in response_stream:
                 content = str(chunk)
-                full_response += content
+                fragments.append(content)
                 yield content
             
             # Add AI response to session
-            await self.chat_service.add_message(session_id, full_response, "assistant")
+            await self.chat_service.add_message(session_id, "".join(fragments), "assistant")
             
         except Exception as e:
             error_msg = f"Error processing message: {str(e)}"
             await self.chat_service.add_message(session_id, error_msg, "assistant")
             yield error_msg
     
-    async def get_session_messages(self, session_id: str) -> List[ChatMessage]:
-        """Get all messages for a session"""
-        return await self.chat_service.get_session_messages(session_id)
+    async def get_session_messages(self, session_id: str, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+        """Get all messages for a session, optionally only those between the cursors"""
+        return await self.chat_service.get_session_messages(session_id, before=before, after=after)
+    
+    async def get_message_page(self, session_id: str, limit: int, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> Tuple[List[ChatMessage], bool]:
+        """Get up to ``limit`` messages between the cursors and whether more lie beyond the page"""
+        # One extra message tells whether there is another page
+        messages = await self.chat_service.get_session_messages(session_id, limit + 1, before, after)
+        has_more = len(messages) > limit
+        if not has_more:
+            return messages, False
+        # The extra one sits at the far end in the paging direction
+        forward = after is not None and before is None
+        return (messages[:limit] if forward else messages[1:]), True
     
     async def get_session(self, session_id: str) -> Optional[ChatSession]:
         """Get a chat session"""
-        return await self.chat_service.get_chat_session(session_id) 
\ No newline at end of file
+        return await self.chat_service.get_chat_session(session_id)
+    
+    async def _get_session_data(self, session_id: str, file_data: Optional[bytes]) -> Optional[ChatSession]:
+        """Fetch the session's dataset fields once per turn, without its messages"""
+        if file_data is not None:
+            # The file sent with the message is used instead
+            return None
+        return await self.chat_service.get_chat_session(session_id, message_limit=0)
+    
+    async def _get_fast_answer(self, session_id: str, session: Optional[ChatSession], message: str, file_data: Optional[bytes], filename: Optional[str]) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """Answer simple lookups from the data, returning any frame loaded on the way for reuse"""
+        if self.fast_answer is None:
+            return None, None
+        
+        profile, df = None, None
+        if session is not None and session.data_profile is not None:
+            # The cached profile answers most of these without touching the data
+            profile = session.data_profile
+            columns = [column.name for column in profile.columns]
+        else:
+            df = await self._get_dataframe(session_id, file_data, filename, session=session)
+            columns = list(df.columns)
+        
+        intent = self.fast_answer.match(message, columns)
+        response = self.fast_answer.answer(intent, profile, df) if intent is not None else None
+        column_read = False
+        if response is None and intent is not None and df is None and session.dataset_key and self.dataset_store is not None:
+            # The profile lacks it; read the one column asked about
+            column_df = await asyncio.to_thread(self.dataset_store.get, session.dataset_key, 0, [intent.column])
+            if column_df is not None:
+                response = self.fast_answer.answer(intent, profile, column_df)
+                column_read = True
+        self.fast_answer.record(response is not None, column_read)
+        return response, df
+    
+    async def _get_dataframe(self, session_id: str, file_data: Optional[bytes], filename: Optional[str], full: bool = False, session: Optional[ChatSession] = None) -> pd.DataFrame:
+        """Use the file sent with the message, else the session's retained dataset"""
+        if file_data is not None:
+            df, dataset_key = await self._load_dataset(file_data, filename)
+            if dataset_key is not None:
+                # Later turns can omit the file again
+                await self.chat_service.attach_dataset(session_id, dataset_key)
+            return df
+        
+        if session is None:
+            session = await self.chat_service.get_chat_session(session_id, message_limit=0)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+        if session.dataset_key and self.dataset_store is not None:
+            # With the data prompt and profile cached the turn reads no
+            # columns, so a cold frame is not pulled back into memory
+            cached = session.prompt_prefix is not None and session.data_profile is not None
+            columns = [] if cached and not full else None
+            df = await asyncio.to_thread(self.dataset_store.get, session.dataset_key, 0, columns)
+            if df is not None:
+                return df
+            raise ValueError("The session's data is no longer available; send the file again")
+        raise ValueError("No data is attached to this session; send the file with the message")
+    
+    async def _load_dataset(self, file_data: bytes, filename: Optional[str]):
+        """Parse an upload and retain it, returning the frame and its store key"""
+        if not FileFormat.is_chat_supported(filename):
+            raise ValueError("Only CSV, Parquet, Feather and JSON Lines files are supported for chat")
+        
+        # Parse the data off the event loop
+        df = await self.file_service.load_dataframe(io.BytesIO(file_data), filename)
+        if self.dataset_store is None:
+            return df, None
+        
+        dataset_key = await asyncio.to_thread(self.dataset_store.fingerprint, file_data)
+        await asyncio.to_thread(self.dataset_store.put, dataset_key, df)
+        return df, dataset_key
@@ -0,0 +1,95 @@
+import asyncio
+import io
+from typing import Dict, Optional, Tuple
+from ...entities.chat_message import ChatSession
+from ...entities.file_analysis import FileAnalysis
+from ...entities.upload_session import UploadSession
+from ...enums.file_format import FileFormat
+from ...services.upload_service import UploadServiceInterface
+from .chat_use_case import ChatUseCase
+from .file_upload_use_case import FileUploadUseCase
+
+class ChunkedUploadUseCase:
+    """Resumable uploads that are analysed once every byte has arrived.
+
+    Analysis starts in the background as soon as the last missing chunk
+    lands (and the checksum, if one was declared, matches), so by the time
+    the client asks to complete the upload the work is usually done.
+    """
+    
+    def __init__(self, upload_service: UploadServiceInterface, file_upload_use_case: FileUploadUseCase, chat_use_case: Optional[ChatUseCase] = None):
+        self.upload_service = upload_service
+        self.file_upload_use_case = file_upload_use_case
+        self.chat_use_case = chat_use_case
+        self._analyses: Dict[str, asyncio.Task] = {}
+    
+    async def start(self, file_name: str, total_size: int, checksum: Optional[str] = None) -> UploadSession:
+        """Open a new upload"""
+        session = await asyncio.to_thread(self.upload_service.create_upload, file_name, total_size, checksum)
+        # Creating an upload purges expired ones; their analyses go with them
+        await self._purge_stale_analyses()
+        return session
+    
+    async def upload_chunk(self, upload_id: str, offset: int, data: bytes) -> UploadSession:
+        """Store a chunk and start the analysis once the file is complete"""
+        session = await asyncio.to_thread(self.upload_service.write_chunk, upload_id, offset, data)
+        if session.complete and upload_id not in self._analyses:
+            if session.checksum is None or session.checksum == await self._checksum(upload_id):
+                self._analyses[upload_id] = asyncio.create_task(self._analyse(session))
+        return session
+    
+    async def get_status(self, upload_id: str) -> Optional[UploadSession]:
+        """Return the upload's received ranges"""
+        return await asyncio.to_thread(self.upload_service.get_upload, upload_id)
+    
+    async def complete(self, upload_id: str, checksum: Optional[str] = None) -> Tuple[FileAnalysis, Optional[ChatSession]]:
+        """Verify the assembled file and return its analysis and chat session"""
+        session = await self.get_status(upload_id)
+        if session is None:
+            raise ValueError(f"Upload not found: {upload_id}")
+        
+        expected = (checksum or session.checksum or "").lower()
+        if expected:
+            actual = await self._checksum(upload_id)
+            if actual != expected:
+                self._discard_analysis(upload_id)
+                raise ValueError(f"Checksum mismatch: expected {expected}, got {actual}")
+        
+        task = self._analyses.pop(upload_id, None)
+        if task is None:
+            task = asyncio.create_task(self._analyse(session))
+        analysis = await task
+        
+        # Create chat session for single-table uploads while the bytes are still here
+        chat_session = None
+        if self.chat_use_case is not None and FileFormat.is_chat_supported(session.file_name):
+            try:
+                content = await asyncio.to_thread(self.upload_service.read_upload, upload_id)
+                chat_session = await self.chat_use_case.create_session(session.file_name, content)
+            except Exception as e:
+                print(f"Error creating chat session: {e}")
+        
+        await asyncio.to_thread(self.upload_service.delete_upload, upload_id)
+        return analysis, chat_session
+    
+    async def abort(self, upload_id: str) -> bool:
+        """Cancel any analysis in progress and delete the upload"""
+        self._discard_analysis(upload_id)
+        return await asyncio.to_thread(self.upload_service.delete_upload, upload_id)
+    
+    async def _checksum(self, upload_id: str) -> str:
+        return await asyncio.to_thread(self.upload_service.get_checksum, upload_id)
+    
+    async def _analyse(self, session: UploadSession) -> FileAnalysis:
+        content = await asyncio.to_thread(self.upload_service.read_upload, session.upload_id)
+        return await self.file_upload_use_case.execute(io.BytesIO(content), session.file_name)
+    
+    async def _purge_stale_analyses(self) -> None:
+        for upload_id in list(self._analyses):
+            if await self.get_status(upload_id) is None:
+                self._discard_analysis(upload_id)
+    
+    def _discard_analysis(self, upload_id: str) -> None:
+        task = self._analyses.pop(upload_id, None)
+        if task is not None:
+            task.cancel()
@@ -1,17 +1,41 @@
-from typing import BinaryIO
+import asyncio
+import dataclasses
+from datetime import datetime
+from typing import BinaryIO, Callable, Optional
 from ...entities.file_analysis import FileAnalysis
 from ...services.file_service import FileServiceInterface
 from ...services.ai_service import AIServiceInterface
+from ...services.analysis_cache import AnalysisCacheInterface
+from ...enums.job_status import AnalysisStage
 
 class FileUploadUseCase:
-    def __init__(self, file_service: FileServiceInterface, ai_service: AIServiceInterface):
+    def __init__(self, file_service: FileServiceInterface, ai_service: AIServiceInterface, analysis_cache: Optional[AnalysisCacheInterface] = None):
         self.file_service = file_service
         self.ai_service = ai_service
+        self.analysis_cache = analysis_cache
     
-    async def execute(self, file: BinaryIO, filename: str) -> FileAnalysis:
+    async def execute(self, file: BinaryIO, filename: str, force_refresh: bool = False, progress: Optional[Callable[[AnalysisStage], None]] = None) -> FileAnalysis:
         try:
+            # Identical bytes get the stored analysis instead of new LLM calls
+            cache_key = None
+            if self.analysis_cache is not None:
+                file.seek(0)
+                content = file.read()
+                file.seek(0)
+                # Insights depend on the provider and model, so both are part of the key
+                namespace = f"{type(self.ai_service).__name__}:{getattr(self.ai_service, 'model', '')}"
+                cache_key = await asyncio.to_thread(self.analysis_cache.fingerprint, content, namespace)
+                if not force_refresh:
+                    cached = await asyncio.to_thread(self.analysis_cache.get, cache_key)
+                    if cached is not None:
+                        return dataclasses.replace(cached, file_name=filename, upload_timestamp=datetime.now())
+            
             # Process the file
-            analysis = await self.file_service.process_file(file, filename)
+            analysis = await self.file_service.process_file(file, filename, progress=progress)
+            
+            # An analysis the model failed on is worth retrying next time
+            if cache_key is not None and analysis.insights and not analysis.ai_fallback:
+                await asyncio.to_thread(self.analysis_cache.put, cache_key, analysis)
             return analysis
         except Exception as e:
-            raise Exception(f"Failed to process file: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to process file: {str(e)}")
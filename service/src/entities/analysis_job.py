@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+from .chat_message import ChatSession
+from .file_analysis import FileAnalysis
+from ..enums.job_status import AnalysisStage, JobStatus
+
+@dataclass
+class AnalysisJob:
+    job_id: str
+    file_name: str
+    status: JobStatus
+    created_at: datetime
+    updated_at: datetime
+    stage: Optional[AnalysisStage] = None
+    progress: float = 0.0  # 0..1, advanced as each stage starts
+    result: Optional[FileAnalysis] = None
+    chat_session: Optional[ChatSession] = None
+    error: Optional[str] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+from .chat_message import ChatSession
+from .file_analysis import FileAnalysis
+
+@dataclass
+class BatchFileResult:
+    index: int  # position of the file in the batch
+    file_name: str
+    analysis: Optional[FileAnalysis] = None
+    chat_session: Optional[ChatSession] = None
+    error: Optional[str] = None
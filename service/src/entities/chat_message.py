@@ -1,19 +1,51 @@
+import sys
 from dataclasses import dataclass
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Union
+from .data_profile import DataProfile
 
-@dataclass
+# Sessions and their messages are retained by the hundred thousand, so both
+# are slotted and carry timestamps as epoch seconds (time.time()); the API
+# layer converts them to datetimes.
+
+@dataclass(slots=True)
 class ChatMessage:
     id: str
     content: str
     role: str  # 'user' or 'assistant'
-    timestamp: datetime
+    timestamp: float
     file_name: Optional[str] = None
 
-@dataclass
+    def __post_init__(self):
+        # Loaded messages share one string per role and file instead of a copy each
+        self.role = sys.intern(self.role)
+        if self.file_name is not None:
+            self.file_name = sys.intern(self.file_name)
+
+@dataclass(frozen=True, slots=True)
+class MessageCursor:
+    """A position in a session's messages: at the message ``message_id``.
+
+    Messages can share a timestamp, so the id tells which of them the
+    cursor points at. Without one (or when that message is gone) the
+    cursor stands for the timestamp as a whole.
+    """
+    timestamp: float
+    message_id: Optional[str] = None
+
+# Repositories take a bare epoch timestamp wherever they take a cursor
+Cursor = Union[float, MessageCursor]
+
+@dataclass(slots=True)
 class ChatSession:
     session_id: str
     file_name: str
     messages: List[ChatMessage]
-    created_at: datetime
-    last_updated: datetime 
\ No newline at end of file
+    created_at: float
+    last_updated: float
+    dataset_key: Optional[str] = None  # parsed upload retained in the dataset store
+    # Derived from the dataset; cleared whenever dataset_key changes
+    data_profile: Optional[DataProfile] = None
+    prompt_prefix: Optional[str] = None
+    # Running summary of the messages up to and including summarized_until
+    summary: Optional[str] = None
+    summarized_until: Optional[float] = None
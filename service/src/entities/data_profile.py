@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    non_null_count: int
+    null_count: int
+    # Numeric columns
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    # Text and categorical columns
+    unique_count: Optional[int] = None
+    most_common: Optional[str] = None
+
+@dataclass
+class DataProfile:
+    total_rows: int
+    total_columns: int
+    columns: List[ColumnProfile]
+    sample_data: List[List[str]] = field(default_factory=list)
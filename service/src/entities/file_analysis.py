@@ -1,7 +1,17 @@
 from dataclasses import dataclass
-from typing import List, Any, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
+@dataclass
+class SheetAnalysis:
+    sheet_name: str
+    rows: int
+    columns: int
+    headers: List[str]
+    sample_data: List[List[str]]
+    column_types: Dict[str, str]
+    missing_values: int
+
 @dataclass
 class FileAnalysis:
     file_name: str
@@ -13,3 +23,5 @@ class FileAnalysis:
     sample_questions: List[str]
     upload_timestamp: Optional[datetime] = None
     file_size: Optional[int] = None
+    sheets: Optional[List[SheetAnalysis]] = None
+    ai_fallback: bool = False  # insights or questions are canned because the model failed
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+from typing import Optional
+from ..enums.question_intent import IntentKind
+
+@dataclass
+class QuestionIntent:
+    kind: IntentKind
+    column: Optional[str] = None  # dataset column name as stored
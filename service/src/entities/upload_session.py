@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from datetime import datetime
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    file_name: str
+    total_size: int
+    created_at: datetime
+    last_updated: datetime
+    checksum: Optional[str] = None  # expected SHA-256 of the whole file, hex
+    received_ranges: List[List[int]] = field(default_factory=list)  # merged [start, end) byte ranges
+    received_bytes: int = 0
+    complete: bool = False
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class ChatMode(Enum):
+    """How a chat message is answered"""
+    CHAT = "chat"  # From the data summary and the conversation
+    QUERY = "query"  # The model writes SQL, run locally over the full dataset
@@ -0,0 +1,49 @@
+from enum import Enum
+from typing import Optional, Tuple
+
+class Compression(Enum):
+    GZIP = "gzip"
+    ZSTD = "zstd"
+    ZIP = "zip"
+
+class FileFormat(Enum):
+    CSV = "csv"
+    EXCEL = "excel"
+    PARQUET = "parquet"
+    FEATHER = "feather"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def detect(cls, filename: str) -> Tuple[Optional["FileFormat"], Optional[Compression]]:
+        """Return the format and compression implied by a file name"""
+        name = (filename or "").lower()
+        # Longest suffixes first so ".csv.gz" is not mistaken for ".gz"
+        for suffix, detected in sorted(_SUFFIXES.items(), key=lambda item: -len(item[0])):
+            if name.endswith(suffix):
+                return detected
+        return None, None
+
+    @classmethod
+    def is_csv(cls, filename: str) -> bool:
+        """True for plain and compressed CSV uploads"""
+        return cls.detect(filename)[0] == cls.CSV
+
+    @classmethod
+    def is_chat_supported(cls, filename: str) -> bool:
+        """True for single-table formats that chat sessions can query"""
+        return cls.detect(filename)[0] in (cls.CSV, cls.PARQUET, cls.FEATHER, cls.NDJSON)
+
+_SUFFIXES = {
+    ".csv": (FileFormat.CSV, None),
+    ".csv.gz": (FileFormat.CSV, Compression.GZIP),
+    ".csv.zst": (FileFormat.CSV, Compression.ZSTD),
+    # A zip archive holding a single CSV file
+    ".zip": (FileFormat.CSV, Compression.ZIP),
+    ".xlsx": (FileFormat.EXCEL, None),
+    ".xls": (FileFormat.EXCEL, None),
+    ".parquet": (FileFormat.PARQUET, None),
+    ".feather": (FileFormat.FEATHER, None),
+    ".arrow": (FileFormat.FEATHER, None),
+    ".jsonl": (FileFormat.NDJSON, None),
+    ".ndjson": (FileFormat.NDJSON, None),
+}
@@ -0,0 +1,18 @@
+from enum import Enum
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+class AnalysisStage(Enum):
+    """Steps of an upload analysis, in the order they run"""
+    PARSING = "parsing"
+    PROFILING = "profiling"
+    INSIGHTS = "insights"
+    QUESTIONS = "questions"
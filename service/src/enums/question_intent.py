@@ -0,0 +1,17 @@
+from enum import Enum
+
+class IntentKind(Enum):
+    """Questions answered from the data without the model"""
+    ROW_COUNT = "row_count"
+    COLUMN_COUNT = "column_count"
+    MEAN = "mean"
+    MEDIAN = "median"
+    SUM = "sum"
+    MIN = "min"
+    MAX = "max"
+    MOST_COMMON = "most_common"
+    UNIQUE_COUNT = "unique_count"
+
+    @property
+    def needs_column(self) -> bool:
+        return self not in (IntentKind.ROW_COUNT, IntentKind.COLUMN_COUNT)
@@ -8,7 +8,47 @@ class Settings(BaseSettings):
     ollama_url: str = "http://localhost:11434"
     ollama_model: str = "gemma3:4b" #"llama3.1:8b"
     max_file_size: int = 10 * 1024 * 1024  # 10MB
-    allowed_extensions: list = [".csv", ".xlsx", ".xls"]
+    max_decompressed_size: int = 100 * 1024 * 1024  # 100MB after gzip/zstd/zip expansion
+    allowed_extensions: list = [".csv", ".csv.gz", ".csv.zst", ".zip", ".xlsx", ".xls", ".parquet", ".feather", ".arrow", ".jsonl", ".ndjson"]
+    optimize_dtypes: bool = True
+    llm_max_concurrent_requests: int = 4  # Per provider, across all uploads and chats
+    batch_max_files: int = 50
+    executor_kind: str = "thread"  # "thread" or "process"
+    executor_max_workers: int = 0  # 0 = one worker per CPU
+    dataset_cache_dir: str = ".cache/datasets"
+    dataset_cache_max_bytes: int = 512 * 1024 * 1024  # 512MB on disk
+    dataset_cache_memory_items: int = 8
+    dataset_cache_max_memory_bytes: int = 1024 * 1024 * 1024  # Parsed frames kept in memory
+    dataset_cache_memory_idle_seconds: int = 5 * 60  # Unused frames then live on disk only
+    dataset_cache_format: str = "arrow"  # "arrow" (memory-mapped, shared across workers) or "parquet"
+    analysis_cache_dir: str = ".cache/analyses"
+    analysis_cache_max_entries: int = 1000
+    chat_session_store: str = "memory"  # "memory", "sqlite" (durable, shared by workers on one host) or "redis" (shared across hosts; their data needs a shared dataset_cache_dir)
+    chat_session_db_path: str = ".cache/chat_sessions.db"
+    chat_session_flush_interval_ms: int = 50  # Longest a message waits before it is committed
+    chat_session_flush_batch_size: int = 500
+    chat_session_idle_ttl_seconds: int = 6 * 60 * 60
+    chat_session_max_sessions: int = 10000
+    chat_session_max_memory_bytes: int = 256 * 1024 * 1024  # In-memory store only
+    chat_session_sweep_interval_seconds: int = 60
+    chat_session_max_messages: int = 1000  # Redis store only; older messages are trimmed
+    chat_history_verbatim_messages: int = 6  # Latest messages quoted in prompts; older ones are summarised
+    chat_history_token_budget: int = 1500
+    chat_summary_max_tokens: int = 300
+    chat_prompt_max_columns: int = 30  # Wider datasets get only the columns relevant to the question
+    query_timeout_seconds: float = 10  # Query mode SQL, per statement
+    query_max_result_rows: int = 50
+    query_max_cell_chars: int = 500  # Longer text values in results are cut
+    query_memory_limit: str = "512MB"
+    redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 20  # Per worker
+    job_max_concurrent: int = 2  # Analyses (and their LLM calls) running at once
+    job_max_queued: int = 100
+    job_result_ttl_seconds: int = 60 * 60
+    upload_dir: str = ".cache/uploads"
+    max_chunked_upload_size: int = 1024 * 1024 * 1024  # 1GB via the resumable upload API
+    upload_chunk_size: int = 8 * 1024 * 1024  # 8MB, suggested to clients
+    upload_ttl_seconds: int = 24 * 60 * 60  # Abandoned uploads are removed after a day
     
     class Config:
         env_file = ".env"
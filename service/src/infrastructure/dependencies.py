@@ -1,32 +1,187 @@
 from functools import lru_cache
 
+from ..application.use_cases.chat_use_case import ChatUseCase
+from ..application.use_cases.chunked_upload_use_case import ChunkedUploadUseCase
+from ..application.use_cases.file_upload_use_case import FileUploadUseCase
 from ..enums.ai_provider import AIProvider
 from .config import get_settings
+from .executor import DataFrameExecutor
+from .repositories.in_memory_chat_session_repository import InMemoryChatSessionRepository
+from .repositories.redis_chat_session_repository import RedisChatSessionRepository
+from .repositories.sqlite_chat_session_repository import SqliteChatSessionRepository
+from .services.analysis_cache_impl import AnalysisCacheImpl
 from .services.chat_service_impl import ChatServiceImpl
+from .services.conversation_history import ConversationHistory
+from .services.dataset_store_impl import DatasetStoreImpl
+from .services.duckdb_query_engine_impl import DuckDBQueryEngineImpl
+from .services.fast_answer_impl import FastAnswerImpl
 from .services.file_service_impl import FileServiceImpl
+from .services.job_queue_impl import JobQueueImpl
 from .services.ollama_ai_service_impl import OllamaAIServiceImpl
 from .services.openrouter_ai_service_impl import OpenRouterAIServiceImpl
+from .services.upload_service_impl import UploadServiceImpl
 
 
+@lru_cache()
+def get_executor():
+    """Get the shared pool for CPU-bound DataFrame work"""
+    settings = get_settings()
+    return DataFrameExecutor(
+        kind=settings.executor_kind,
+        max_workers=settings.executor_max_workers or None
+    )
+
 @lru_cache()
 def get_ai_service(ai_provider: AIProvider = AIProvider.OLLAMA):
     settings = get_settings()
     
     if ai_provider == AIProvider.OPENROUTER:
-        return OpenRouterAIServiceImpl(settings.openrouter_api_key)
+        return OpenRouterAIServiceImpl(settings.openrouter_api_key, executor=get_executor(), max_concurrent_requests=settings.llm_max_concurrent_requests)
     elif ai_provider == AIProvider.OLLAMA:
-        return OllamaAIServiceImpl(settings.ollama_url, settings.ollama_model)
+        return OllamaAIServiceImpl(settings.ollama_url, settings.ollama_model, executor=get_executor(), max_concurrent_requests=settings.llm_max_concurrent_requests)
     raise ValueError(f"Unsupported AI provider: {AIProvider}. Supported providers: {AIProvider.OPENROUTER}, {AIProvider.OLLAMA}")
 
+@lru_cache()
+def get_dataset_store():
+    """Get the process-wide parsed dataset cache"""
+    settings = get_settings()
+    return DatasetStoreImpl(
+        cache_dir=settings.dataset_cache_dir,
+        max_disk_bytes=settings.dataset_cache_max_bytes,
+        max_memory_items=settings.dataset_cache_memory_items,
+        max_memory_bytes=settings.dataset_cache_max_memory_bytes,
+        memory_idle_seconds=settings.dataset_cache_memory_idle_seconds,
+        file_format=settings.dataset_cache_format
+    )
+
+@lru_cache()
+def get_query_engine():
+    """Get the SQL sandbox for query mode chats, None when duckdb is not installed"""
+    settings = get_settings()
+    try:
+        return DuckDBQueryEngineImpl(
+            timeout_seconds=settings.query_timeout_seconds,
+            max_rows=settings.query_max_result_rows,
+            memory_limit=settings.query_memory_limit,
+            max_cell_chars=settings.query_max_cell_chars
+        )
+    except ValueError as e:
+        print(f"Query mode disabled: {e}")
+        return None
+
+@lru_cache()
+def get_fast_answer():
+    """Get the model-free answerer for simple chat questions"""
+    return FastAnswerImpl()
+
+@lru_cache()
+def get_analysis_cache():
+    """Get the cache of finished upload analyses"""
+    settings = get_settings()
+    return AnalysisCacheImpl(
+        cache_dir=settings.analysis_cache_dir,
+        max_entries=settings.analysis_cache_max_entries
+    )
+
+@lru_cache()
+def get_chat_session_repository():
+    """Get the chat session store shared by every chat service"""
+    settings = get_settings()
+    if settings.chat_session_store == "memory":
+        return InMemoryChatSessionRepository(
+            max_sessions=settings.chat_session_max_sessions,
+            idle_ttl_seconds=settings.chat_session_idle_ttl_seconds,
+            max_memory_bytes=settings.chat_session_max_memory_bytes
+        )
+    if settings.chat_session_store == "sqlite":
+        return SqliteChatSessionRepository(
+            settings.chat_session_db_path,
+            flush_interval=settings.chat_session_flush_interval_ms / 1000,
+            max_batch_size=settings.chat_session_flush_batch_size,
+            idle_ttl_seconds=settings.chat_session_idle_ttl_seconds,
+            max_sessions=settings.chat_session_max_sessions
+        )
+    if settings.chat_session_store == "redis":
+        return RedisChatSessionRepository(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            max_messages=settings.chat_session_max_messages,
+            idle_ttl_seconds=settings.chat_session_idle_ttl_seconds
+        )
+    raise ValueError(f"Unsupported chat session store: {settings.chat_session_store}. Supported stores: memory, sqlite, redis")
+
+@lru_cache()
+def get_job_queue():
+    """Get the background analysis job queue"""
+    settings = get_settings()
+    return JobQueueImpl(
+        max_concurrent=settings.job_max_concurrent,
+        max_queued=settings.job_max_queued,
+        result_ttl_seconds=settings.job_result_ttl_seconds
+    )
+
+@lru_cache()
+def get_upload_service():
+    """Get the resumable upload store"""
+    settings = get_settings()
+    return UploadServiceImpl(
+        upload_dir=settings.upload_dir,
+        max_upload_size=settings.max_chunked_upload_size,
+        ttl_seconds=settings.upload_ttl_seconds
+    )
+
 @lru_cache()
 def get_file_service(ai_provider: AIProvider = AIProvider.OLLAMA):
     ai_service = get_ai_service(ai_provider)
-    return FileServiceImpl(ai_service)
+    settings = get_settings()
+    return FileServiceImpl(
+        ai_service,
+        get_dataset_store(),
+        optimize_dtypes=settings.optimize_dtypes,
+        executor=get_executor(),
+        max_decompressed_size=settings.max_decompressed_size
+    )
+
+@lru_cache()
+def get_chunked_file_service():
+    """Get a file service for resumable uploads, which may exceed the plain upload size"""
+    settings = get_settings()
+    return FileServiceImpl(
+        get_ai_service(),
+        get_dataset_store(),
+        optimize_dtypes=settings.optimize_dtypes,
+        executor=get_executor(),
+        max_decompressed_size=max(settings.max_decompressed_size, settings.max_chunked_upload_size)
+    )
+
+@lru_cache()
+def get_chunked_upload_use_case():
+    """Get the resumable upload use case.
+
+    Shared so analyses started by one chunk request are found on completion.
+    """
+    file_service = get_chunked_file_service()
+    file_upload_use_case = FileUploadUseCase(file_service, get_ai_service(), get_analysis_cache())
+    chat_use_case = ChatUseCase(get_chat_service(), file_service, get_dataset_store(), get_fast_answer())
+    return ChunkedUploadUseCase(get_upload_service(), file_upload_use_case, chat_use_case)
+
+def _chat_service(ai_service) -> ChatServiceImpl:
+    settings = get_settings()
+    repository = get_chat_session_repository()
+    history = ConversationHistory(
+        ai_service,
+        repository,
+        verbatim_messages=settings.chat_history_verbatim_messages,
+        verbatim_token_budget=settings.chat_history_token_budget,
+        summary_max_tokens=settings.chat_summary_max_tokens,
+        request_executor=ai_service.request_executor
+    )
+    return ChatServiceImpl(ai_service, get_executor(), repository, history, get_query_engine(), settings.chat_prompt_max_columns, ai_service.request_executor)
 
 @lru_cache()
 def get_chat_service(ai_provider: AIProvider = AIProvider.OLLAMA):
     ai_service = get_ai_service(ai_provider)
-    return ChatServiceImpl(ai_service)
+    return _chat_service(ai_service)
 
 @lru_cache()
 def get_ollama_ai_service():
@@ -42,10 +197,10 @@ def get_openrouter_ai_service():
 def get_ollama_chat_service():
     """Get chat service with Ollama AI"""
     ai_service = get_ollama_ai_service()
-    return ChatServiceImpl(ai_service)
+    return _chat_service(ai_service)
 
 @lru_cache()
 def get_openrouter_chat_service():
     """Get chat service with OpenRouter AI"""
     ai_service = get_openrouter_ai_service()
-    return ChatServiceImpl(ai_service)
\ No newline at end of file
+    return _chat_service(ai_service)
\ No newline at end of file
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import pandas as pd
+import pyarrow as pa
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+class DataFrameExecutor:
+    """Runs CPU-bound DataFrame work off the event loop.
+
+    ``thread`` mode suits work that mostly runs inside pandas/numpy and
+    releases the GIL; ``process`` mode isolates pure-Python heavy parsing.
+    In process mode ``fn`` and its arguments must be picklable (module-level
+    functions, plain data), and DataFrames in the result are shipped back as
+    Arrow IPC buffers, falling back to pickle protocol 5 for frames Arrow
+    cannot encode.
+    """
+
+    def __init__(self, kind: str = EXECUTOR_THREAD, max_workers: Optional[int] = None):
+        if kind not in (EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"Unsupported executor kind: {kind}. Supported kinds: {EXECUTOR_THREAD}, {EXECUTOR_PROCESS}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        if kind == EXECUTOR_PROCESS:
+            self._pool: Executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dataframe")
+
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "in_flight": 0,
+            "total_wait_ms": 0.0,
+            "total_run_ms": 0.0,
+            "max_wait_ms": 0.0
+        }
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run ``fn(*args)`` on the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        self._record_submit()
+
+        try:
+            started_at, result = await loop.run_in_executor(
+                self._pool, _timed_call, fn, args, self.kind == EXECUTOR_PROCESS
+            )
+        except Exception:
+            self._record_done(failed=True)
+            raise
+
+        finished_at = time.time()
+        self._record_done(wait_ms=(started_at - submitted_at) * 1000, run_ms=(finished_at - started_at) * 1000)
+        return _decode(result) if self.kind == EXECUTOR_PROCESS else result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue and latency counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        finished = stats["completed"] + stats["failed"]
+        stats["kind"] = self.kind
+        stats["max_workers"] = self.max_workers
+        stats["queue_depth"] = max(0, stats["in_flight"] - self.max_workers)
+        stats["avg_wait_ms"] = stats["total_wait_ms"] / finished if finished else 0.0
+        stats["avg_run_ms"] = stats["total_run_ms"] / finished if finished else 0.0
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _record_submit(self) -> None:
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["in_flight"] += 1
+
+    def _record_done(self, failed: bool = False, wait_ms: float = 0.0, run_ms: float = 0.0) -> None:
+        with self._lock:
+            self._stats["in_flight"] -= 1
+            self._stats["failed" if failed else "completed"] += 1
+            self._stats["total_wait_ms"] += max(0.0, wait_ms)
+            self._stats["total_run_ms"] += max(0.0, run_ms)
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+
+class _FramePayload:
+    """A DataFrame serialised in a worker process"""
+
+    def __init__(self, fmt: str, data: bytes, attrs: Optional[Dict[str, Any]] = None):
+        self.fmt = fmt
+        self.data = data
+        # Arrow does not carry DataFrame.attrs (e.g. reader statistics)
+        self.attrs = attrs or {}
+
+def _timed_call(fn: Callable, args: tuple, encode: bool):
+    # Wall clock time so start times are comparable across processes
+    started_at = time.time()
+    result = fn(*args)
+    return started_at, _encode(result) if encode else result
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, pd.DataFrame):
+        try:
+            table = pa.Table.from_pandas(value)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return _FramePayload("arrow", sink.getvalue().to_pybytes(), dict(value.attrs))
+        except (pa.ArrowException, TypeError, ValueError):
+            return _FramePayload("pickle", pickle.dumps(value, protocol=5))
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_encode(item) for item in value)
+    return value
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, _FramePayload):
+        if value.fmt == "arrow":
+            df = pa.ipc.open_stream(pa.py_buffer(value.data)).read_all().to_pandas()
+            df.attrs.update(value.attrs)
+            return df
+        return pickle.loads(value.data)
+    if isinstance(value, dict):
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_decode(item) for item in value)
+    return value
+
+async def offload(executor: Optional[DataFrameExecutor], fn: Callable, *args) -> Any:
+    """Run ``fn`` on ``executor`` if one is configured, inline otherwise"""
+    if executor is None:
+        return fn(*args)
+    return await executor.run(fn, *args)
@@ -0,0 +1,140 @@
+import dataclasses
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from ...entities.chat_message import ChatMessage, ChatSession, Cursor
+from ...repositories.chat_session_repository import ChatSessionRepositoryInterface, page_messages
+
+# Rough per-object cost of a message or session beyond its text
+# (see benchmarks/bench_message_memory.py)
+_OBJECT_OVERHEAD = 200
+
+class InMemoryChatSessionRepository(ChatSessionRepositoryInterface):
+    """Chat sessions held in process memory; lost on restart.
+
+    Sessions are kept in least-recently-used order. A session not touched
+    for ``idle_ttl_seconds`` is dropped by ``evict``, and the least recently
+    used ones are dropped as soon as there are more than ``max_sessions``
+    or their estimated size passes ``max_memory_bytes``.
+    """
+
+    def __init__(self, max_sessions: int = 10000, idle_ttl_seconds: int = 6 * 60 * 60, max_memory_bytes: int = 256 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._resident_bytes = 0
+        self._stats = {
+            "sessions_created": 0,
+            "messages_written": 0,
+            "evicted_idle": 0,
+            "evicted_lru": 0
+        }
+
+    async def create_session(self, session: ChatSession) -> None:
+        """Store a new session"""
+        self._sessions[session.session_id] = dataclasses.replace(session, messages=list(session.messages))
+        self._resize(session.session_id)
+        self._touch(session.session_id)
+        self._stats["sessions_created"] += 1
+        self._enforce_limits()
+
+    async def get_session(self, session_id: str, message_limit: Optional[int] = None) -> Optional[ChatSession]:
+        """Return a copy of the session with its last ``message_limit`` messages (all when None)"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        self._touch(session_id)
+        if message_limit is None:
+            messages = session.messages
+        else:
+            messages = session.messages[-message_limit:] if message_limit > 0 else []
+        return dataclasses.replace(session, messages=list(messages))
+
+    async def update_session(self, session: ChatSession) -> None:
+        """Save the session's fields; its messages are managed by add_message"""
+        stored = self._sessions.get(session.session_id)
+        if stored is None:
+            raise ValueError(f"Session {session.session_id} not found")
+        self._sessions[session.session_id] = dataclasses.replace(session, messages=stored.messages)
+        self._resize(session.session_id)
+        self._touch(session.session_id)
+        self._enforce_limits()
+
+    async def add_message(self, session_id: str, message: ChatMessage) -> None:
+        """Append a message and bump the session's last update"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+        session.messages.append(message)
+        session.last_updated = message.timestamp
+        self._sizes[session_id] += _message_size(message)
+        self._resident_bytes += _message_size(message)
+        self._touch(session_id)
+        self._stats["messages_written"] += 1
+        self._enforce_limits()
+
+    async def get_messages(self, session_id: str, limit: Optional[int] = None, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+        """Return a page of a session's messages (all by default), oldest first"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return []
+        self._touch(session_id)
+        # Slices a copy of just the page; the bounds are found by bisection
+        return page_messages(session.messages, limit, before, after)
+
+    async def evict(self) -> int:
+        """Drop sessions idle for longer than the TTL"""
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        evicted = 0
+        # Least recently used first, so stop at the first live session
+        while self._sessions:
+            session_id = next(iter(self._sessions))
+            if self._last_access[session_id] >= cutoff:
+                break
+            self._remove(session_id)
+            self._stats["evicted_idle"] += 1
+            evicted += 1
+        return evicted
+
+    async def flush(self) -> None:
+        """Nothing is buffered"""
+
+    async def close(self) -> None:
+        """Nothing to release"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return write and eviction counters and the estimated footprint"""
+        stats = dict(self._stats)
+        stats["sessions"] = len(self._sessions)
+        stats["resident_bytes"] = self._resident_bytes
+        return stats
+
+    def _touch(self, session_id: str) -> None:
+        self._sessions.move_to_end(session_id)
+        self._last_access[session_id] = time.monotonic()
+
+    def _resize(self, session_id: str) -> None:
+        session = self._sessions[session_id]
+        size = _OBJECT_OVERHEAD + sys.getsizeof(session.prompt_prefix or "")
+        size += sum(_message_size(message) for message in session.messages)
+        self._resident_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+
+    def _enforce_limits(self) -> None:
+        # Never evict the session that was just used
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions or self._resident_bytes > self.max_memory_bytes):
+            self._remove(next(iter(self._sessions)))
+            self._stats["evicted_lru"] += 1
+
+    def _remove(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+        self._resident_bytes -= self._sizes.pop(session_id, 0)
+
+def _message_size(message: ChatMessage) -> int:
+    return _OBJECT_OVERHEAD + sys.getsizeof(message.content)
@@ -0,0 +1,218 @@
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # optional, only needed for the redis session store
+    redis = None
+
+from ...entities.chat_message import ChatMessage, ChatSession, Cursor
+from ...repositories.chat_session_repository import ChatSessionRepositoryInterface, as_cursor, cursor_end, decode_profile, encode_profile, page_messages
+
+class RedisChatSessionRepository(ChatSessionRepositoryInterface):
+    """Chat sessions in Redis, shared by every worker behind the balancer.
+
+    A session is a hash and its messages a list of compact JSON arrays,
+    trimmed to the last ``max_messages`` on every append. Each operation is
+    a single pipelined round trip. Both keys expire ``idle_ttl_seconds``
+    after the session was last used, so Redis itself evicts idle sessions.
+    Connections come from a pool of at most ``max_connections``.
+
+    Only the session is shared: its ``dataset_key`` names a frame in the
+    dataset cache, which is per host unless ``dataset_cache_dir`` is on
+    storage every host mounts. Without that, turns that omit the file need
+    sticky routing to the host that parsed it.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", max_connections: int = 20, max_messages: int = 1000, idle_ttl_seconds: int = 6 * 60 * 60, key_prefix: str = "chat:", client=None):
+        if client is None:
+            if redis is None:
+                raise ValueError("The redis package is required for the redis chat session store")
+            pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+            client = redis.Redis(connection_pool=pool)
+        self._client = client
+        self.max_messages = max_messages
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.key_prefix = key_prefix
+        self._stats = {
+            "sessions_created": 0,
+            "messages_written": 0,
+            "round_trips": 0
+        }
+
+    async def create_session(self, session: ChatSession) -> None:
+        """Store a new session with any messages it already has"""
+        session_key, messages_key = self._keys(session.session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(session_key, mapping=_session_fields(session))
+            if session.messages:
+                pipe.rpush(messages_key, *[_encode_message(message) for message in session.messages])
+                pipe.ltrim(messages_key, -self.max_messages, -1)
+            self._expire(pipe, session_key, messages_key)
+            await self._execute(pipe)
+        self._stats["sessions_created"] += 1
+
+    async def get_session(self, session_id: str, message_limit: Optional[int] = None) -> Optional[ChatSession]:
+        """Return the session with its last ``message_limit`` messages (all when None)"""
+        session_key, messages_key = self._keys(session_id)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(session_key)
+            if message_limit != 0:
+                pipe.lrange(messages_key, 0 if message_limit is None else -message_limit, -1)
+            self._expire(pipe, session_key, messages_key)
+            results = await self._execute(pipe)
+
+        fields = {key.decode(): value.decode() for key, value in results[0].items()}
+        if not fields:
+            return None
+        messages = [_decode_message(raw) for raw in results[1]] if message_limit != 0 else []
+        return ChatSession(
+            session_id=session_id,
+            file_name=fields["file_name"],
+            messages=messages,
+            created_at=float(fields["created_at"]),
+            last_updated=float(fields["last_updated"]),
+            dataset_key=fields.get("dataset_key"),
+            data_profile=decode_profile(fields.get("data_profile")),
+            prompt_prefix=fields.get("prompt_prefix"),
+            summary=fields.get("summary"),
+            summarized_until=float(fields["summarized_until"]) if "summarized_until" in fields else None
+        )
+
+    async def update_session(self, session: ChatSession) -> None:
+        """Save the session's fields; its messages are managed by add_message"""
+        session_key, messages_key = self._keys(session.session_id)
+        if not await self._client.exists(session_key):
+            raise ValueError(f"Session {session.session_id} not found")
+        fields = _session_fields(session)
+        # Advanced by add_message; an older copy must not move it back
+        del fields["last_updated"]
+        cleared = [name for name in _OPTIONAL_FIELDS if name not in fields]
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(session_key, mapping=fields)
+            if cleared:
+                pipe.hdel(session_key, *cleared)
+            self._expire(pipe, session_key, messages_key)
+            await self._execute(pipe)
+
+    async def add_message(self, session_id: str, message: ChatMessage) -> None:
+        """Append a message, trim the list and bump the session in one round trip"""
+        session_key, messages_key = self._keys(session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.exists(session_key)
+            pipe.rpush(messages_key, _encode_message(message))
+            pipe.ltrim(messages_key, -self.max_messages, -1)
+            pipe.hset(session_key, "last_updated", _format_time(message.timestamp))
+            self._expire(pipe, session_key, messages_key)
+            results = await self._execute(pipe)
+
+        if not results[0]:
+            # Checked in the same round trip; undo the writes to a missing session
+            await self._client.delete(session_key, messages_key)
+            raise ValueError(f"Session {session_id} not found")
+        self._stats["messages_written"] += 1
+
+    async def get_messages(self, session_id: str, limit: Optional[int] = None, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+        """Return a page of a session's retained messages (all by default), oldest first.
+
+        Cursors are resolved by reading the list backwards from its tail in
+        chunks, so polling for recent messages costs about one page.
+        """
+        _, messages_key = self._keys(session_id)
+        if after is None and (before is None or limit is None):
+            # The tail page, or everything before a cursor: one range read
+            start = -limit if before is None and limit else 0
+            raw_messages = await self._client.lrange(messages_key, start, -1)
+            self._stats["round_trips"] += 1
+            return page_messages([_decode_message(raw) for raw in raw_messages], limit, before)
+
+        chunk = max(limit or 0, _SCAN_CHUNK)
+        window: List[ChatMessage] = []
+        end = -1
+        while True:
+            batch = [_decode_message(raw) for raw in await self._client.lrange(messages_key, end - chunk + 1, end)]
+            self._stats["round_trips"] += 1
+            window = batch + window
+            if len(batch) < chunk or _window_covers(window, limit, before, after):
+                break
+            end -= chunk
+        return page_messages(window, limit, before, after)
+
+    async def evict(self) -> int:
+        """Nothing to do; idle sessions expire in Redis"""
+        return 0
+
+    async def flush(self) -> None:
+        """Nothing is buffered"""
+
+    async def close(self) -> None:
+        """Close the client and its connection pool"""
+        await self._client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return write and round trip counters"""
+        return dict(self._stats)
+
+    def _keys(self, session_id: str):
+        return f"{self.key_prefix}session:{session_id}", f"{self.key_prefix}messages:{session_id}"
+
+    def _expire(self, pipe, session_key: str, messages_key: str) -> None:
+        pipe.expire(session_key, self.idle_ttl_seconds)
+        pipe.expire(messages_key, self.idle_ttl_seconds)
+
+    async def _execute(self, pipe) -> List[Any]:
+        results = await pipe.execute()
+        self._stats["round_trips"] += 1
+        return results
+
+# Messages read per round trip while looking for a cursor
+_SCAN_CHUNK = 100
+
+def _window_covers(window: List[ChatMessage], limit: Optional[int], before: Optional[Cursor], after: Optional[Cursor]) -> bool:
+    """Whether a tail window already holds the whole page"""
+    if not window:
+        return False
+    if after is not None:
+        after = as_cursor(after)
+        # Earlier messages at the cursor's timestamp may still be outside the window
+        if window[0].timestamp < after.timestamp or any(message.id == after.message_id for message in window):
+            return True
+        return after.message_id is None and window[0].timestamp == after.timestamp
+    # Paging back only needs ``limit`` messages older than the cursor
+    return limit is not None and cursor_end(window, before) >= limit
+
+_OPTIONAL_FIELDS = ("dataset_key", "data_profile", "prompt_prefix", "summary", "summarized_until")
+
+def _session_fields(session: ChatSession) -> Dict[str, str]:
+    fields = {
+        "file_name": session.file_name,
+        "created_at": _format_time(session.created_at),
+        "last_updated": _format_time(session.last_updated)
+    }
+    # Redis hashes have no null; unset fields are simply absent
+    if session.dataset_key is not None:
+        fields["dataset_key"] = session.dataset_key
+    if session.data_profile is not None:
+        fields["data_profile"] = encode_profile(session.data_profile)
+    if session.prompt_prefix is not None:
+        fields["prompt_prefix"] = session.prompt_prefix
+    if session.summary is not None:
+        fields["summary"] = session.summary
+    if session.summarized_until is not None:
+        fields["summarized_until"] = _format_time(session.summarized_until)
+    return fields
+
+def _encode_message(message: ChatMessage) -> str:
+    # Positional array instead of an object keeps the field names out of every entry
+    return json.dumps(
+        [message.id, message.role, message.content, message.timestamp, message.file_name],
+        separators=(",", ":")
+    )
+
+def _decode_message(raw: bytes) -> ChatMessage:
+    message_id, role, content, timestamp, file_name = json.loads(raw)
+    return ChatMessage(id=message_id, content=content, role=role, timestamp=timestamp, file_name=file_name)
+
+def _format_time(value: float) -> str:
+    # repr round-trips the float exactly
+    return repr(value)
@@ -0,0 +1,354 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...entities.chat_message import ChatMessage, ChatSession, Cursor, MessageCursor
+from ...repositories.chat_session_repository import ChatSessionRepositoryInterface, as_cursor, decode_profile, encode_profile
+
+# Buffered messages are ordered after every stored row, from this seq on
+_UNCOMMITTED_SEQ = 2 ** 63 - 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_sessions (
+    session_id TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_updated REAL NOT NULL,
+    dataset_key TEXT,
+    prompt_prefix TEXT,
+    data_profile TEXT,
+    summary TEXT,
+    summarized_until REAL
+);
+CREATE TABLE IF NOT EXISTS chat_messages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    file_name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_time ON chat_messages (session_id, timestamp, seq);
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_last_updated ON chat_sessions (last_updated);
+"""
+
+class SqliteChatSessionRepository(ChatSessionRepositoryInterface):
+    """Chat sessions in a SQLite database shared by every worker on the host.
+
+    The database runs in WAL mode so readers never wait for the writer.
+    Sessions are written straight away; messages are buffered and a
+    background thread commits them in batches, at the latest
+    ``flush_interval`` seconds after they were added (sooner once
+    ``max_batch_size`` are waiting). Reads in this process include the
+    buffered messages, so a session always sees its own latest turns.
+    A ``flush_interval`` of 0 writes every message as it is added.
+
+    ``evict`` deletes sessions with no update for ``idle_ttl_seconds`` and,
+    past ``max_sessions``, the least recently updated ones.
+    """
+
+    def __init__(self, db_path: str, flush_interval: float = 0.05, max_batch_size: int = 500, idle_ttl_seconds: int = 6 * 60 * 60, max_sessions: int = 10000):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_sessions = max_sessions
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # Serialises commits so a flush() never races the writer thread
+        self._write_lock = threading.Lock()
+        self._pending: List[Tuple[str, ChatMessage]] = []
+        # Taken from _pending but not yet committed; still visible to reads
+        self._in_flight: List[Tuple[str, ChatMessage]] = []
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._stats = {
+            "sessions_created": 0,
+            "messages_written": 0,
+            "batches_written": 0,
+            "largest_batch": 0,
+            "write_errors": 0,
+            "evicted_idle": 0,
+            "evicted_lru": 0
+        }
+
+        self._connection().executescript(_SCHEMA)
+        self._writer = None
+        if flush_interval > 0:
+            self._writer = threading.Thread(target=self._write_loop, name="chat-session-writer", daemon=True)
+            self._writer.start()
+
+    async def create_session(self, session: ChatSession) -> None:
+        """Store a new session; its messages are added separately"""
+        await asyncio.to_thread(self._insert_session, session)
+
+    async def get_session(self, session_id: str, message_limit: Optional[int] = None) -> Optional[ChatSession]:
+        """Return the session with its last ``message_limit`` messages (all when None)"""
+        return await asyncio.to_thread(self._load_session, session_id, message_limit)
+
+    async def update_session(self, session: ChatSession) -> None:
+        """Save the session's fields; its messages are managed by add_message"""
+        await asyncio.to_thread(self._update_session, session)
+
+    async def add_message(self, session_id: str, message: ChatMessage) -> None:
+        """Queue a message for the next batch"""
+        if self._writer is None:
+            await asyncio.to_thread(self._write_batch, [(session_id, message)])
+            return
+        with self._lock:
+            self._pending.append((session_id, message))
+            full = len(self._pending) >= self.max_batch_size
+        if full:
+            self._wakeup.set()
+
+    async def get_messages(self, session_id: str, limit: Optional[int] = None, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+        """Return a page of a session's messages (all by default), oldest first"""
+        return await asyncio.to_thread(self._load_messages, session_id, limit, before, after)
+
+    async def evict(self) -> int:
+        """Delete idle sessions and the oldest ones past the session cap"""
+        return await asyncio.to_thread(self._evict)
+
+    async def flush(self) -> None:
+        """Commit every buffered message now"""
+        await asyncio.to_thread(self._write_pending)
+
+    async def close(self) -> None:
+        """Stop the writer after committing what is buffered"""
+        self._closed = True
+        self._wakeup.set()
+        if self._writer is not None:
+            await asyncio.to_thread(self._writer.join)
+        self._write_pending()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return write counters and the current backlog"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending_messages"] = len(self._pending) + len(self._in_flight)
+        return stats
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets them read while another writes"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Only ever used by this thread, but close() may run elsewhere
+            connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Durable at every checkpoint; a power cut can lose the last commits
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _insert_session(self, session: ChatSession) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT INTO chat_sessions (session_id, file_name, created_at, last_updated, dataset_key, prompt_prefix, data_profile, summary, summarized_until) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (session.session_id, session.file_name, session.created_at, session.last_updated, session.dataset_key, session.prompt_prefix, encode_profile(session.data_profile), session.summary, session.summarized_until)
+            )
+        with self._lock:
+            self._stats["sessions_created"] += 1
+        if session.messages:
+            self._write_batch([(session.session_id, message) for message in session.messages])
+
+    def _update_session(self, session: ChatSession) -> None:
+        connection = self._connection()
+        with connection:
+            updated = connection.execute(
+                "UPDATE chat_sessions SET file_name = ?, last_updated = MAX(last_updated, ?), dataset_key = ?, prompt_prefix = ?, data_profile = ?, summary = ?, summarized_until = ? WHERE session_id = ?",
+                (session.file_name, session.last_updated, session.dataset_key, session.prompt_prefix, encode_profile(session.data_profile), session.summary, session.summarized_until, session.session_id)
+            ).rowcount
+        if not updated:
+            raise ValueError(f"Session {session.session_id} not found")
+
+    def _load_session(self, session_id: str, message_limit: Optional[int]) -> Optional[ChatSession]:
+        row = self._connection().execute(
+            "SELECT file_name, created_at, last_updated, dataset_key, prompt_prefix, data_profile, summary, summarized_until FROM chat_sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        file_name, created_at, last_updated, dataset_key, prompt_prefix, data_profile, summary, summarized_until = row
+
+        messages = self._load_messages(session_id, message_limit) if message_limit != 0 else []
+        for buffered_id, message in self._buffered():
+            if buffered_id == session_id and message.timestamp > last_updated:
+                last_updated = message.timestamp
+        return ChatSession(
+            session_id=session_id,
+            file_name=file_name,
+            messages=messages,
+            created_at=created_at,
+            last_updated=last_updated,
+            dataset_key=dataset_key,
+            data_profile=decode_profile(data_profile),
+            prompt_prefix=prompt_prefix,
+            summary=summary,
+            summarized_until=summarized_until
+        )
+
+    def _load_messages(self, session_id: str, limit: Optional[int], before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+        # Taken before the query: a batch committed in between then shows
+        # up twice (and is deduplicated) rather than not at all
+        buffered = [message for buffered_id, message in self._buffered() if buffered_id == session_id]
+        # Messages are ordered by (timestamp, seq); buffered ones follow every stored row
+        buffered_keys = [(message.timestamp, _UNCOMMITTED_SEQ + i) for i, message in enumerate(buffered)]
+        bounds = []
+        
+        conditions, params = ["session_id = ?"], [session_id]
+        for cursor, operator in ((before, "<"), (after, ">")):
+            if cursor is None:
+                continue
+            cursor = as_cursor(cursor)
+            seq = self._cursor_seq(session_id, cursor, buffered)
+            if seq is None:
+                # Unknown message or a bare timestamp: everything at that time is excluded
+                conditions.append(f"timestamp {operator} ?")
+                params.append(cursor.timestamp)
+            else:
+                conditions.append(f"(timestamp {operator} ? OR (timestamp = ? AND seq {operator} ?))")
+                params.extend([cursor.timestamp, cursor.timestamp, min(seq, _UNCOMMITTED_SEQ)])
+            bounds.append((operator, cursor.timestamp, seq))
+        # Paging forward reads the oldest rows past the cursor; otherwise
+        # newest first so LIMIT keeps the latest turns. -1 means no limit
+        forward = after is not None and before is None
+        rows = self._connection().execute(
+            f"SELECT id, content, role, timestamp, file_name, seq FROM chat_messages WHERE {' AND '.join(conditions)} "
+            f"ORDER BY timestamp {'ASC' if forward else 'DESC'}, seq {'ASC' if forward else 'DESC'} LIMIT ?",
+            (*params, -1 if limit is None else limit)
+        ).fetchall()
+        if not forward:
+            rows.reverse()
+        keyed = [
+            ((row[3], row[5]), ChatMessage(id=row[0], content=row[1], role=row[2], timestamp=row[3], file_name=row[4]))
+            for row in rows
+        ]
+        if not buffered:
+            return [message for _, message in keyed]
+        
+        seen = {message.id for _, message in keyed}
+        keyed.extend(
+            (key, message) for key, message in zip(buffered_keys, buffered)
+            if message.id not in seen and all(_on_side(key, *bound) for bound in bounds)
+        )
+        keyed.sort(key=lambda item: item[0])
+        messages = [message for _, message in keyed]
+        if limit is None:
+            return messages
+        return messages[:limit] if forward else messages[-limit:]
+
+    def _cursor_seq(self, session_id: str, cursor: MessageCursor, buffered: List[ChatMessage]) -> Optional[int]:
+        """The seq of the message ``cursor`` points at, or None when it names none"""
+        if cursor.message_id is None:
+            return None
+        row = self._connection().execute(
+            "SELECT seq FROM chat_messages WHERE session_id = ? AND timestamp = ? AND id = ?",
+            (session_id, cursor.timestamp, cursor.message_id)
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        for i, message in enumerate(buffered):
+            if message.id == cursor.message_id:
+                return _UNCOMMITTED_SEQ + i
+        return None
+
+    def _evict(self) -> int:
+        # Buffered messages would otherwise advance last_updated after the delete
+        self._write_pending()
+        cutoff = time.time() - self.idle_ttl_seconds
+        connection = self._connection()
+        with self._write_lock, connection:
+            idle = connection.execute(
+                "SELECT session_id FROM chat_sessions WHERE last_updated < ?", (cutoff,)
+            ).fetchall()
+            self._delete_sessions(connection, idle)
+            overflow = connection.execute(
+                "SELECT session_id FROM chat_sessions ORDER BY last_updated DESC LIMIT -1 OFFSET ?", (self.max_sessions,)
+            ).fetchall()
+            self._delete_sessions(connection, overflow)
+        with self._lock:
+            self._stats["evicted_idle"] += len(idle)
+            self._stats["evicted_lru"] += len(overflow)
+        return len(idle) + len(overflow)
+
+    @staticmethod
+    def _delete_sessions(connection: sqlite3.Connection, rows: List[Tuple[str]]) -> None:
+        connection.executemany("DELETE FROM chat_messages WHERE session_id = ?", rows)
+        connection.executemany("DELETE FROM chat_sessions WHERE session_id = ?", rows)
+
+    def _buffered(self) -> List[Tuple[str, ChatMessage]]:
+        with self._lock:
+            return self._in_flight + self._pending
+
+    def _write_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._in_flight = batch
+            if not batch:
+                return
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"Error writing chat messages: {e}")
+                with self._lock:
+                    # Retried with the next batch
+                    self._pending = batch + self._pending
+                    self._stats["write_errors"] += 1
+            finally:
+                with self._lock:
+                    self._in_flight = []
+
+    def _write_batch(self, batch: List[Tuple[str, ChatMessage]]) -> None:
+        """Insert messages and advance their sessions' last update in one transaction"""
+        latest: Dict[str, float] = {}
+        for session_id, message in batch:
+            if session_id not in latest or message.timestamp > latest[session_id]:
+                latest[session_id] = message.timestamp
+
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT INTO chat_messages (id, session_id, role, content, timestamp, file_name) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (message.id, session_id, message.role, message.content, message.timestamp, message.file_name)
+                    for session_id, message in batch
+                ]
+            )
+            connection.executemany(
+                "UPDATE chat_sessions SET last_updated = MAX(last_updated, ?) WHERE session_id = ?",
+                [(timestamp, session_id) for session_id, timestamp in latest.items()]
+            )
+        with self._lock:
+            self._stats["messages_written"] += len(batch)
+            self._stats["batches_written"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+
+def _on_side(key: Tuple[float, int], operator: str, timestamp: float, seq: Optional[int]) -> bool:
+    """Whether a message at ``key`` lies on the ``operator`` side of a cursor"""
+    bound = (timestamp, seq) if seq is not None else None
+    if operator == "<":
+        return key < bound if bound else key[0] < timestamp
+    return key > bound if bound else key[0] > timestamp
\ No newline at end of file
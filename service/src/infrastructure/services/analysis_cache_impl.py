@@ -0,0 +1,155 @@
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ...entities.file_analysis import FileAnalysis, SheetAnalysis
+from ...services.analysis_cache import AnalysisCacheInterface
+
+class AnalysisCacheImpl(AnalysisCacheInterface):
+    """Finished FileAnalysis results keyed by upload content.
+
+    Results are small, so every entry is kept both in memory and as a JSON
+    file under ``cache_dir`` (which survives restarts and is shared by all
+    workers). Both tiers hold at most ``max_entries`` results and drop the
+    least recently used first.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 1000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._entries: "OrderedDict[str, FileAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0
+        }
+
+    def fingerprint(self, content: bytes, namespace: str = "") -> str:
+        """Return the cache key for ``content`` analysed by ``namespace``"""
+        digest = hashlib.sha256(namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[FileAnalysis]:
+        """Return the cached analysis for ``key`` or None"""
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return analysis
+
+        path = self._path_for(key)
+        try:
+            with open(path) as f:
+                analysis = _from_dict(json.load(f))
+        except FileNotFoundError:
+            analysis = None
+        except Exception as e:
+            print(f"Error reading cached analysis {key}: {e}")
+            self._remove_file(path)
+            analysis = None
+
+        with self._lock:
+            if analysis is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._remember(key, analysis)
+        self._touch(path)
+        return analysis
+
+    def put(self, key: str, analysis: FileAnalysis) -> None:
+        """Store a finished analysis"""
+        with self._lock:
+            self._remember(key, analysis)
+
+        path = self._path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(_to_dict(analysis), f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error caching analysis {key}: {e}")
+            self._remove_file(tmp_path)
+            return
+
+        with self._lock:
+            self._stats["writes"] += 1
+        self._enforce_limit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, analysis: FileAnalysis) -> None:
+        self._entries[key] = analysis
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _enforce_limit(self) -> None:
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        except FileNotFoundError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+
+        files = []
+        for entry in entries:
+            try:
+                files.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+        # Oldest modification time first: hits bump mtime, so this is LRU order
+        files.sort()
+        for _, path in files[:len(files) - self.max_entries]:
+            if self._remove_file(path):
+                with self._lock:
+                    self._stats["evictions"] += 1
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _remove_file(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+def _to_dict(analysis: FileAnalysis) -> Dict[str, Any]:
+    data = dataclasses.asdict(analysis)
+    if analysis.upload_timestamp is not None:
+        data["upload_timestamp"] = analysis.upload_timestamp.isoformat()
+    return data
+
+def _from_dict(data: Dict[str, Any]) -> FileAnalysis:
+    if data.get("upload_timestamp"):
+        data["upload_timestamp"] = datetime.fromisoformat(data["upload_timestamp"])
+    if data.get("sheets") is not None:
+        data["sheets"] = [SheetAnalysis(**sheet) for sheet in data["sheets"]]
+    return FileAnalysis(**data)
@@ -1,90 +1,99 @@
+import asyncio
+import functools
+import re
+import secrets
+import time
 import uuid
-from typing import List, Optional, Dict, Generator
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import List, Optional
 import pandas as pd
-from datetime import datetime
 
 from ...infrastructure.services.openrouter_ai_service_impl import OpenRouterAIServiceImpl
 from ...services.chat_service import ChatServiceInterface
 from ...services.ai_service import AIServiceInterface
-from ...entities.chat_message import ChatMessage, ChatSession
+from ...services.query_engine import QueryEngineInterface
+from ...entities.chat_message import ChatMessage, ChatSession, Cursor
+from ...entities.data_profile import DataProfile
+from ...repositories.chat_session_repository import ChatSessionRepositoryInterface
+from ..repositories.in_memory_chat_session_repository import InMemoryChatSessionRepository
+from ..executor import DataFrameExecutor, offload
+from ..streaming import iterate_in_thread
+from .column_index import ColumnIndex
+from .conversation_history import ConversationHistory
+from .data_profiler import profile_dataframe, profile_summary
 
 class ChatServiceImpl(ChatServiceInterface):
-    def __init__(self, ai_service: AIServiceInterface):
+    def __init__(self, ai_service: AIServiceInterface, executor: Optional[DataFrameExecutor] = None, repository: Optional[ChatSessionRepositoryInterface] = None, history: Optional[ConversationHistory] = None, query_engine: Optional[QueryEngineInterface] = None, prompt_max_columns: int = 30, request_executor: Optional[Executor] = None):
         self.ai_service = ai_service
-        # In-memory storage for chat sessions (in production, use a database)
-        self.sessions: Dict[str, ChatSession] = {}
+        self.executor = executor
+        # The AI service's request threads; None uses the default executor
+        self.request_executor = request_executor
+        self.repository = repository or InMemoryChatSessionRepository()
+        self.history = history or ConversationHistory(ai_service, self.repository, request_executor=request_executor)
+        self.query_engine = query_engine
+        # Wider datasets get a compact schema plus statistics for the columns the question is about
+        self.prompt_max_columns = prompt_max_columns
+        self._column_indexes: OrderedDict[str, ColumnIndex] = OrderedDict()
     
-    async def create_chat_session(self, file_name: str) -> ChatSession:
+    async def create_chat_session(self, file_name: str, dataset_key: Optional[str] = None) -> ChatSession:
         """Create a new chat session for a file"""
         session_id = str(uuid.uuid4())
-        now = datetime.now()
+        now = time.time()
         
         session = ChatSession(
             session_id=session_id,
             file_name=file_name,
             messages=[],
             created_at=now,
-            last_updated=now
+            last_updated=now,
+            dataset_key=dataset_key
         )
         
-        self.sessions[session_id] = session
+        await self.repository.create_session(session)
         return session
     
-    async def get_chat_session(self, session_id: str) -> Optional[ChatSession]:
-        """Get a chat session by ID"""
-        return self.sessions.get(session_id)
+    async def attach_dataset(self, session_id: str, dataset_key: str) -> None:
+        """Point a session at the dataset its messages are answered from"""
+        session = await self.repository.get_session(session_id, message_limit=0)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+        if session.dataset_key != dataset_key:
+            session.dataset_key = dataset_key
+            session.data_profile = None
+            session.prompt_prefix = None
+            await self.repository.update_session(session)
+    
+    async def get_chat_session(self, session_id: str, message_limit: Optional[int] = None) -> Optional[ChatSession]:
+        """Get a chat session by ID, with only its latest ``message_limit`` messages when given"""
+        return await self.repository.get_session(session_id, message_limit=message_limit)
     
     async def add_message(self, session_id: str, content: str, role: str) -> ChatMessage:
         """Add a message to a chat session"""
-        session = self.sessions.get(session_id)
+        session = await self.repository.get_session(session_id, message_limit=0)
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
         message = ChatMessage(
-            id=str(uuid.uuid4()),
+            # Only unique within the session, so 12 characters suffice
+            id=secrets.token_urlsafe(9),
             content=content,
             role=role,
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             file_name=session.file_name
         )
         
-        session.messages.append(message)
-        session.last_updated = datetime.now()
-        
+        await self.repository.add_message(session_id, message)
         return message
     
     async def get_chat_response(self, session_id: str, user_message: str, df: pd.DataFrame) -> str:
         """Get AI response for a user message about the CSV data"""
-        session = self.sessions.get(session_id)
+        session = await self.repository.get_session(session_id, message_limit=self.history.verbatim_messages)
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
-        # Get conversation history
-        conversation_history = []
-        for msg in session.messages[-10:]:  # Last 10 messages for context
-            conversation_history.append(f"{msg.role}: {msg.content}")
-        
-        # Create context about the data
-        data_summary = self._get_data_summary(df)
-        
-        # Build the prompt
-        prompt = """
-        You are a helpful data analyst assistant. You're helping analyze a CSV file called "{file_name}".
-        
-        Data Summary:
-        {data_summary}
-        
-        Previous conversation context:
-        {conversation_history}
-        
-        User's current question: {user_message}
-        
-        Please provide a helpful, accurate response about the data. If the user is asking for analysis, calculations, or insights, use the actual data from the CSV file. Be specific and mention actual numbers, column names, and patterns you find in the data.
-        
-        If the user asks for something that can't be answered with the available data, politely explain what information is missing.
-        
-        Keep your response concise but informative.
-        """.format(file_name = session.file_name, data_summary = data_summary, conversation_history = '\n'.join(conversation_history), user_message = user_message)
+        # Build the prompt; the data part is computed once per dataset
+        prompt = await self._build_prompt(session, user_message, df)
         
         try:
             # Use the AI service to generate response
@@ -96,47 +105,71 @@ class ChatServiceImpl(ChatServiceInterface):
                 {"role": "user", "content": prompt}
             ]
             
-            response = self.ai_service.make_api_request(messages, max_tokens=800)
+            response = await self._request(messages, max_tokens=800)
             return response.strip()
             
         except Exception as e:
             return f"I apologize, but I encountered an error while analyzing the data: {str(e)}. Please try rephrasing your question or ask about a different aspect of the data."
     
+    async def get_query_response(self, session_id: str, user_message: str, df: pd.DataFrame) -> str:
+        """Answer a question by having the model write SQL that runs over the full dataset"""
+        if self.query_engine is None:
+            return await self.get_chat_response(session_id, user_message, df)
+        
+        session = await self.repository.get_session(session_id, message_limit=self.history.verbatim_messages)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+        
+        try:
+            # The model only plans; the numbers come from the query, not from the prompt
+            plan = await self._request(
+                [
+                    {"role": "system", "content": "You translate questions about a table into DuckDB SQL."},
+                    {"role": "user", "content": _QUERY_PLAN_PROMPT.format(
+                        schema=", ".join(f"{column} ({dtype})" for column, dtype in df.dtypes.astype(str).items()),
+                        sample=df.head(3).to_csv(index=False),
+                        conversation_history=self.history.format_history(session),
+                        user_message=user_message
+                    )}
+                ],
+                max_tokens=300
+            )
+            sql = _extract_sql(plan)
+            result = await asyncio.to_thread(self.query_engine.execute, df, sql)
+        except Exception as e:
+            print(f"Query mode failed for session {session_id}, answering from the summary: {e}")
+            return await self.get_chat_response(session_id, user_message, df)
+        
+        try:
+            response = await self._request(
+                [
+                    {"role": "system", "content": "You are a helpful data analyst assistant. Answer using only the query result you are given."},
+                    {"role": "user", "content": _QUERY_ANSWER_PROMPT.format(
+                        user_message=user_message, sql=sql, result=result.to_csv(index=False)
+                    )}
+                ],
+                max_tokens=800
+            )
+            return response.strip()
+        except Exception as e:
+            return f"I apologize, but I encountered an error while analyzing the data: {str(e)}. Please try rephrasing your question or ask about a different aspect of the data."
+    
+    async def _request(self, messages: List[dict], max_tokens: int) -> str:
+        """Call the model on the request threads, so waiting for a provider slot blocks no shared pool"""
+        call = functools.partial(self.ai_service.make_api_request, messages, max_tokens=max_tokens)
+        return await asyncio.get_running_loop().run_in_executor(self.request_executor, call)
+    
     async def get_streaming_chat_response(self, session_id: str, user_message: str, df: pd.DataFrame):
         """Get streaming AI response for a user message about the CSV data"""
         if isinstance(self.ai_service, OpenRouterAIServiceImpl):
             raise ValueError("Streaming is not supported for OpenRouter AI service")
         
-        session = self.sessions.get(session_id)
+        session = await self.repository.get_session(session_id, message_limit=self.history.verbatim_messages)
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
-        # Get conversation history
-        conversation_history = []
-        for msg in session.messages[-10:]:  # Last 10 messages for context
-            conversation_history.append(f"{msg.role}: {msg.content}")
-        
-        # Create context about the data
-        data_summary = self._get_data_summary(df)
-        
-        # Build the prompt
-        prompt = """
-        You are a helpful data analyst assistant. You're helping analyze a CSV file called "{file_name}".
-        
-        Data Summary:
-        {data_summary}
-        
-        Previous conversation context:
-        {conversation_history}
-        
-        User's current question: {user_message}
-        
-        Please provide a helpful, accurate response about the data. If the user is asking for analysis, calculations, or insights, use the actual data from the CSV file. Be specific and mention actual numbers, column names, and patterns you find in the data.
-        
-        If the user asks for something that can't be answered with the available data, politely explain what information is missing.
-        
-        Keep your response concise but informative.
-        """.format(file_name = session.file_name, data_summary = data_summary, conversation_history = '\n'.join(conversation_history), user_message = user_message)
+        # Build the prompt; the data part is computed once per dataset
+        prompt = await self._build_prompt(session, user_message, df)
         
         try:
             # Use the AI service to generate streaming response
@@ -148,8 +181,9 @@ class ChatServiceImpl(ChatServiceInterface):
                 {"role": "user", "content": prompt}
             ]
             
-            response_stream = self.ai_service.make_streaming_api_request(messages, max_tokens=800)
-            for chunk in response_stream:
+            # The provider's iterator blocks on every token, so it runs on its own thread
+            response_stream = iterate_in_thread(lambda: self.ai_service.make_streaming_api_request(messages, max_tokens=800))
+            async for chunk in response_stream:
                 if hasattr(chunk, 'message') and hasattr(chunk.message, 'content'):
                     yield chunk.message.content
                 else:
@@ -160,42 +194,134 @@ class ChatServiceImpl(ChatServiceInterface):
             error_msg = f"I apologize, but I encountered an error while analyzing the data: {str(e)}. Please try rephrasing your question or ask about a different aspect of the data."
             yield error_msg
     
-    async def get_session_messages(self, session_id: str) -> List[ChatMessage]:
-        """Get all messages for a session"""
-        session = self.sessions.get(session_id)
-        if not session:
-            return []
-        return session.messages
+    async def get_session_messages(self, session_id: str, limit: Optional[int] = None, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+        """Get a page of a session's messages, all of them by default"""
+        return await self.repository.get_messages(session_id, limit, before, after)
+    
+    async def _build_prompt(self, session: ChatSession, user_message: str, df: pd.DataFrame) -> str:
+        """Fill the prompt template, reusing the session's cached data prefix"""
+        # The cache is only safe when the frame is known to be the session's dataset
+        prefix, profile = session.prompt_prefix, session.data_profile
+        if prefix is None or profile is None or session.dataset_key is None:
+            profile = await offload(self.executor, profile_dataframe, df)
+            prefix = _PROMPT_PREFIX.format(file_name=session.file_name, data_summary=self._format_data_summary(profile))
+            if session.dataset_key is not None:
+                session.data_profile = profile
+                session.prompt_prefix = prefix
+                await self.repository.update_session(session)
+        
+        relevant_columns = ""
+        if profile.total_columns > self.prompt_max_columns:
+            relevant_columns = _PROMPT_RELEVANT_COLUMNS.format(column_stats=self._relevant_column_stats(session, profile, user_message))
+        
+        # Older turns are summarised while the model answers this one
+        self.history.schedule_summary(session.session_id)
+        return prefix + self._format_turn(session, user_message, relevant_columns)
+    
+    def _format_turn(self, session: ChatSession, user_message: str, relevant_columns: str = "") -> str:
+        return _PROMPT_TURN.format(
+            conversation_history=self.history.format_history(session),
+            relevant_columns=relevant_columns,
+            user_message=user_message
+        )
+    
+    def _format_data_summary(self, profile: DataProfile) -> str:
+        """Full statistics for narrow datasets, names and types only for wide ones"""
+        if profile.total_columns <= self.prompt_max_columns:
+            return str(profile_summary(profile))
+        schema = ", ".join(f"{column.name}: {_short_type(column.dtype)}" for column in profile.columns)
+        return f"{profile.total_rows} rows, {profile.total_columns} columns (name: type): {schema}"
+    
+    def _relevant_column_stats(self, session: ChatSession, profile: DataProfile, user_message: str) -> str:
+        """Statistics for the ``prompt_max_columns`` columns that best match the question"""
+        index = self._column_indexes.get(session.dataset_key) if session.dataset_key is not None else None
+        if index is None:
+            index = ColumnIndex(profile)
+            if session.dataset_key is not None:
+                self._column_indexes[session.dataset_key] = index
+                if len(self._column_indexes) > _COLUMN_INDEX_CACHE_SIZE:
+                    self._column_indexes.popitem(last=False)
+        else:
+            self._column_indexes.move_to_end(session.dataset_key)
+        
+        names = set(index.rank(user_message, self.prompt_max_columns))
+        relevant = DataProfile(
+            total_rows=profile.total_rows,
+            total_columns=profile.total_columns,
+            columns=[column for column in profile.columns if column.name in names]
+        )
+        return str(profile_summary(relevant)["columns"])
     
-    def _get_data_summary(self, df: pd.DataFrame) -> str:
+    @staticmethod
+    def _get_data_summary(df: pd.DataFrame) -> str:
         """Get a concise summary of the dataframe structure"""
-        summary = {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "columns": {}
-        }
-        
-        for col in df.columns:
-            col_info = {
-                "type": str(df[col].dtype),
-                "non_null_count": int(df[col].count()),
-                "null_count": int(df[col].isnull().sum())
-            }
-            
-            if df[col].dtype in ['int64', 'float64']:
-                if not df[col].empty and df[col].notna().any():
-                    col_info.update({
-                        "min": float(df[col].min()),
-                        "max": float(df[col].max()),
-                        "mean": float(df[col].mean()),
-                        "std": float(df[col].std()) if df[col].std() == df[col].std() else 0
-                    })
-            elif df[col].dtype == 'object':
-                col_info.update({
-                    "unique_count": int(df[col].nunique()),
-                    "most_common": str(df[col].mode().iloc[0]) if not df[col].mode().empty else "N/A"
-                })
-            
-            summary["columns"][col] = col_info
+        return str(profile_summary(profile_dataframe(df))) 
+
+# Per-dataset column indexes kept; each is rebuilt from the profile when evicted
+_COLUMN_INDEX_CACHE_SIZE = 256
+
+def _short_type(dtype: str) -> str:
+    if dtype.startswith(("int", "uint", "Int", "UInt")):
+        return "int"
+    if dtype.startswith(("float", "Float")):
+        return "float"
+    if dtype.startswith("datetime"):
+        return "date"
+    if dtype in ("bool", "boolean", "category"):
+        return dtype
+    return "text"
+
+def _extract_sql(response: str) -> str:
+    """Return the SQL in a model reply, fenced or bare"""
+    match = re.search(r"```(?:sql)?\s*(.*?)```", response, re.DOTALL | re.IGNORECASE)
+    sql = (match.group(1) if match else response).strip()
+    if not sql:
+        raise ValueError("The model did not return a query")
+    return sql
+
+# The prompt is split where the per-turn part starts, so the data part can be cached
+_PROMPT_PREFIX = """
+        You are a helpful data analyst assistant. You're helping analyze a CSV file called "{file_name}".
+        
+        Data Summary:
+        {data_summary}
         
-        return str(summary) 
\ No newline at end of file
+        Previous conversation context:
+        """
+
+_PROMPT_TURN = """{conversation_history}
+        {relevant_columns}
+        User's current question: {user_message}
+        
+        Please provide a helpful, accurate response about the data. If the user is asking for analysis, calculations, or insights, use the actual data from the CSV file. Be specific and mention actual numbers, column names, and patterns you find in the data.
+        
+        If the user asks for something that can't be answered with the available data, politely explain what information is missing.
+        
+        Keep your response concise but informative.
+        """
+
+_PROMPT_RELEVANT_COLUMNS = """
+        Statistics for the columns most relevant to the question:
+        {column_stats}
+"""
+
+_QUERY_PLAN_PROMPT = """Write one DuckDB SELECT query over the table "data" that answers the user's question.
+
+Columns: {schema}
+
+First rows:
+{sample}
+Previous conversation context:
+{conversation_history}
+
+User's current question: {user_message}
+
+Reply with the query in a ```sql block and nothing else."""
+
+_QUERY_ANSWER_PROMPT = """User's question: {user_message}
+
+The query
+{sql}
+returned:
+{result}
+Answer the question from this result in a few sentences, mentioning the actual numbers."""
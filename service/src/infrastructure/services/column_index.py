@@ -0,0 +1,101 @@
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from ...entities.data_profile import DataProfile
+
+def _stem(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+# Words people use for what column names abbreviate or call differently
+_SYNONYM_GROUPS = [
+    {"revenue", "sales", "turnover", "income", "earnings"},
+    {"price", "cost", "amount", "fee", "charge", "value"},
+    {"salary", "pay", "wage", "compensation", "income", "earnings"},
+    {"date", "time", "day", "month", "year", "when", "timestamp", "period"},
+    {"quantity", "qty", "units", "volume", "count"},
+    {"customer", "client", "buyer", "account"},
+    {"employee", "staff", "worker", "person", "people"},
+    {"department", "dept", "team", "division", "unit"},
+    {"location", "city", "country", "region", "state", "place", "where", "address"},
+    {"category", "type", "kind", "class", "group", "segment"},
+    {"product", "item", "sku", "article"},
+    {"percent", "pct", "percentage", "rate", "ratio", "share"},
+    {"id", "identifier", "key", "code"},
+    {"name", "who", "title"},
+    {"age", "old", "older", "younger"},
+    {"gender", "sex"},
+    {"phone", "telephone", "mobile", "tel"},
+    {"email", "mail"},
+    {"score", "rating", "grade"},
+    {"profit", "margin", "gain"},
+    {"discount", "rebate", "reduction"}
+]
+_SYNONYMS: Dict[str, Set[str]] = defaultdict(set)
+for _group in _SYNONYM_GROUPS:
+    _stems = {_stem(word) for word in _group}
+    for _word in _stems:
+        _SYNONYMS[_word] |= _stems - {_word}
+
+# Weights of a question word matching a column's name, a synonym of it, or one of its values
+_NAME_WEIGHT = 3.0
+_SYNONYM_WEIGHT = 2.0
+_VALUE_WEIGHT = 1.0
+
+_STOP_WORDS = {_stem(word) for word in {
+    "a", "an", "the", "of", "in", "on", "for", "to", "by", "and", "or", "is", "are", "was", "were", "what",
+    "which", "how", "many", "much", "do", "does", "there", "with", "me", "show", "give", "tell", "per", "each",
+    "all", "from", "data", "dataset", "file", "column", "columns", "value", "values", "it", "this", "that"
+}}
+
+class ColumnIndex:
+    """Ranks a dataset's columns by relevance to a question.
+
+    Built once per dataset from its profile: every column is indexed under
+    the tokens of its name, their synonyms and the words of its sampled
+    and most common values. Question words are matched against that and
+    weighted by how few columns share them, so a word found in one column
+    name outranks one found in hundreds.
+    """
+
+    def __init__(self, profile: DataProfile):
+        self.columns = [column.name for column in profile.columns]
+        # token -> column position -> best weight
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for position, column in enumerate(profile.columns):
+            name_tokens = _tokenize(str(column.name))
+            self._add(position, name_tokens, _NAME_WEIGHT)
+            self._add(position, {synonym for token in name_tokens for synonym in _SYNONYMS.get(token, ())}, _SYNONYM_WEIGHT)
+            values = [row[position] for row in profile.sample_data if position < len(row)]
+            if column.most_common is not None:
+                values.append(column.most_common)
+            # Numbers say little about what a column is; words in text values do
+            self._add(position, {token for value in values for token in _tokenize(value) if not token.isdigit()}, _VALUE_WEIGHT)
+
+    def rank(self, question: str, k: int) -> List[str]:
+        """Return up to ``k`` column names for ``question``, most relevant first"""
+        scores: Dict[int, float] = defaultdict(float)
+        for token in _tokenize(question) - _STOP_WORDS:
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            rarity = math.log(1 + len(self.columns) / len(postings))
+            for position, weight in postings.items():
+                scores[position] += weight * rarity
+
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))[:k]
+        if not ranked:
+            # Nothing matched, e.g. "summarise the data": the leading columns stand in
+            ranked = list(range(min(k, len(self.columns))))
+        return [self.columns[position] for position in ranked]
+
+    def _add(self, position: int, tokens: Set[str], weight: float) -> None:
+        for token in tokens:
+            postings = self._postings[token]
+            postings[position] = max(postings.get(position, 0.0), weight)
+
+def _tokenize(text: str) -> Set[str]:
+    """Lower-case word tokens, split at camelCase and digits, with plurals reduced"""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    return {_stem(word) for word in re.findall(r"[a-z]+|\d+", text.lower())}
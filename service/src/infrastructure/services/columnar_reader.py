@@ -0,0 +1,144 @@
+import io
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+# Key in ``DataFrame.attrs`` holding statistics known without a data scan
+COLUMN_STATS_ATTR = "column_stats"
+
+def read_parquet(content: bytes, columns: Optional[List[str]] = None, max_bytes: Optional[int] = None) -> pd.DataFrame:
+    """Read a Parquet file, decoding only ``columns`` when given.
+
+    Per-column null counts and min/max values are taken from the row-group
+    statistics in the footer and attached to the frame (see
+    ``known_column_stats``), so profiling can skip those scans. Encoded
+    sizes say little about decoded ones, so with ``max_bytes`` the file is
+    decoded batch by batch and the total is capped.
+    """
+    parquet_file = pq.ParquetFile(pa.BufferReader(content))
+    if max_bytes is None:
+        table = parquet_file.read(columns=columns, use_pandas_metadata=True)
+    else:
+        batches = parquet_file.iter_batches(columns=columns, use_pandas_metadata=True)
+        table = _capped_table(batches, _projected_schema(parquet_file.schema_arrow, columns), max_bytes)
+    df = table.to_pandas()
+    stats = _parquet_column_stats(parquet_file.metadata)
+    df.attrs[COLUMN_STATS_ATTR] = {
+        "rows": parquet_file.metadata.num_rows,
+        "columns": {col: stats[col] for col in df.columns if col in stats}
+    }
+    return df
+
+def read_feather(content: bytes, columns: Optional[List[str]] = None, max_bytes: Optional[int] = None) -> pd.DataFrame:
+    """Read a Feather (Arrow IPC file) or Arrow IPC stream.
+
+    Compressed buffers are only sized once decoded, so with ``max_bytes``
+    the record batches are read one at a time and the total is capped.
+    """
+    if max_bytes is None:
+        try:
+            table = feather.read_table(pa.BufferReader(content), columns=columns)
+        except pa.ArrowInvalid:
+            # Not a file with a footer; try the streaming layout instead
+            table = pa.ipc.open_stream(pa.BufferReader(content)).read_all()
+            if columns is not None:
+                table = table.select(columns)
+        return table.to_pandas()
+
+    try:
+        reader = pa.ipc.open_file(pa.BufferReader(content))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        reader = pa.ipc.open_stream(pa.BufferReader(content))
+        batches = iter(reader)
+    if columns is not None:
+        batches = (batch.select(columns) for batch in batches)
+    return _capped_table(batches, _projected_schema(reader.schema, columns), max_bytes).to_pandas()
+
+def read_ndjson(content: bytes, columns: Optional[List[str]] = None, max_bytes: Optional[int] = None) -> pd.DataFrame:
+    """Read newline-delimited JSON with Arrow's multi-threaded parser"""
+    # JSON text is uncompressed, so its length bounds the parsed size
+    if max_bytes is not None:
+        _check_size(len(content), max_bytes)
+    try:
+        table = pa_json.read_json(pa.BufferReader(content))
+    except pa.ArrowInvalid:
+        # Arrow rejects columns whose type changes between records
+        df = pd.read_json(io.BytesIO(content), lines=True)
+        return df[columns] if columns is not None else df
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+def known_column_stats(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Return the statistics attached to ``df`` by a reader, keyed by column.
+
+    Statistics describe the file as read, so they are ignored once the frame
+    has been filtered to a different number of rows.
+    """
+    stats = df.attrs.get(COLUMN_STATS_ATTR)
+    if not stats or stats.get("rows") != len(df):
+        return {}
+    return stats["columns"]
+
+def _check_size(size: int, max_bytes: int) -> None:
+    if size > max_bytes:
+        raise ValueError(f"Decompressed file exceeds the maximum size of {max_bytes / (1024*1024)}MB")
+
+def _projected_schema(schema: pa.Schema, columns: Optional[List[str]]) -> pa.Schema:
+    if columns is None:
+        return schema
+    return pa.schema([schema.field(col) for col in columns], metadata=schema.metadata)
+
+def _capped_table(batches: Iterable[pa.RecordBatch], schema: pa.Schema, max_bytes: int) -> pa.Table:
+    """Collect decoded batches into a table, stopping once they pass ``max_bytes``.
+
+    ``schema`` is only used when there are no batches.
+    """
+    kept = []
+    total = 0
+    for batch in batches:
+        total += batch.nbytes
+        _check_size(total, max_bytes)
+        kept.append(batch)
+    # Readers may add columns such as a stored index, so batches win over ``schema``
+    return pa.Table.from_batches(kept) if kept else schema.empty_table()
+
+def _parquet_column_stats(metadata: pq.FileMetaData) -> Dict[str, Dict[str, Any]]:
+    """Merge row-group statistics into per-column null counts and min/max"""
+    stats: Dict[str, Dict[str, Any]] = {}
+    incomplete = set()
+
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            name = chunk.path_in_schema
+            # Nested fields have dotted paths and no single pandas column
+            if "." in name or name in incomplete:
+                continue
+
+            chunk_stats = chunk.statistics
+            if chunk_stats is None or not chunk_stats.has_null_count:
+                incomplete.add(name)
+                stats.pop(name, None)
+                continue
+
+            column = stats.setdefault(name, {"null_count": 0})
+            column["null_count"] += chunk_stats.null_count
+            if not chunk_stats.has_min_max:
+                # An all-null chunk has no bounds but does not widen them
+                if chunk_stats.null_count != chunk.num_values:
+                    column["bounds_unknown"] = True
+                continue
+            column["min"] = chunk_stats.min if "min" not in column else min(column["min"], chunk_stats.min)
+            column["max"] = chunk_stats.max if "max" not in column else max(column["max"], chunk_stats.max)
+
+    for column in stats.values():
+        if column.pop("bounds_unknown", False):
+            column.pop("min", None)
+            column.pop("max", None)
+    return stats
@@ -0,0 +1,121 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+from ...entities.chat_message import ChatMessage, ChatSession
+from ...repositories.chat_session_repository import ChatSessionRepositoryInterface
+from ...services.ai_service import AIServiceInterface
+
+# Rough tokens per character for English prose; budgets only need the order of magnitude
+_CHARS_PER_TOKEN = 4
+
+class ConversationHistory:
+    """Keeps the conversation part of chat prompts bounded.
+
+    The last ``verbatim_messages`` not yet summarised go into the prompt
+    as they are, newest first until ``verbatim_token_budget`` is used up.
+    Older ones are folded into a running summary of at most
+    ``summary_max_tokens`` by a background task, so no request waits for
+    it and earlier context is kept instead of dropped. Folding waits until
+    ``summary_batch_size`` messages have left the window, so a long chat
+    costs one summary request per batch rather than one per turn.
+    """
+
+    def __init__(self, ai_service: AIServiceInterface, repository: ChatSessionRepositoryInterface, verbatim_messages: int = 6, verbatim_token_budget: int = 1500, summary_max_tokens: int = 300, summary_batch_size: int = 20, request_executor: Optional[Executor] = None):
+        self.ai_service = ai_service
+        self.repository = repository
+        self.verbatim_messages = verbatim_messages
+        self.verbatim_token_budget = verbatim_token_budget
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_batch_size = summary_batch_size
+        # The AI service's request threads; None uses the default executor
+        self.request_executor = request_executor
+        # One summary at a time per session; later turns pick up the rest
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def format_history(self, session: ChatSession) -> str:
+        """Return the summary and the recent messages of ``session`` as prompt text"""
+        recent = [
+            message for message in session.messages[-self.verbatim_messages:]
+            if session.summarized_until is None or message.timestamp > session.summarized_until
+        ]
+        lines: List[str] = []
+        budget = self.verbatim_token_budget * _CHARS_PER_TOKEN
+        for message in reversed(recent):
+            line = f"{message.role}: {message.content}"
+            if len(line) > budget:
+                if not lines:
+                    # The latest message is always kept, cut to the budget
+                    lines.append(line[:budget])
+                break
+            lines.append(line)
+            budget -= len(line)
+        lines.reverse()
+
+        if session.summary:
+            lines.insert(0, f"Summary of the earlier conversation: {session.summary}")
+        return "\n".join(lines)
+
+    def schedule_summary(self, session_id: str) -> None:
+        """Fold a batch of messages that left the verbatim window into the summary, in the background"""
+        task = self._tasks.get(session_id)
+        if task is not None and not task.done():
+            return
+        task = asyncio.get_running_loop().create_task(self._summarize(session_id))
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda done: self._tasks.pop(session_id, None) if self._tasks.get(session_id) is done else None)
+
+    async def drain(self) -> None:
+        """Wait for the summaries in progress"""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _summarize(self, session_id: str) -> None:
+        try:
+            session = await self.repository.get_session(session_id, message_limit=0)
+            if session is None:
+                return
+            # Bounded read: the oldest unsummarised messages plus the verbatim window.
+            # A cursor is always given, as without one the page holds the newest messages
+            after = session.summarized_until if session.summarized_until is not None else float("-inf")
+            pending = await self.repository.get_messages(
+                session_id, limit=self.summary_batch_size + self.verbatim_messages, after=after
+            )
+            # Only a full batch is worth a model request; smaller ones wait for later turns
+            if len(pending) - self.verbatim_messages < self.summary_batch_size:
+                return
+            folded = pending[:len(pending) - self.verbatim_messages]
+
+            summary = await asyncio.get_running_loop().run_in_executor(self.request_executor, self._request_summary, session.summary, folded)
+            # Re-read so fields changed while the model was answering are kept
+            session = await self.repository.get_session(session_id, message_limit=0)
+            if session is None:
+                return
+            session.summary = summary
+            session.summarized_until = folded[-1].timestamp
+            await self.repository.update_session(session)
+        except Exception as e:
+            print(f"Error summarizing chat session {session_id}: {e}")
+
+    def _request_summary(self, previous: str, messages: List[ChatMessage]) -> str:
+        conversation = "\n".join(f"{message.role}: {message.content}" for message in messages)
+        words = self.summary_max_tokens * 3 // 4
+        prompt = _SUMMARY_PROMPT.format(previous=previous or "(none)", conversation=conversation, words=words)
+        response = self.ai_service.make_api_request(
+            [
+                {"role": "system", "content": "You summarize conversations between a user and a data analyst assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=self.summary_max_tokens
+        )
+        # Models overrun their limits; the prompt budget must hold regardless
+        return response.strip()[:self.summary_max_tokens * _CHARS_PER_TOKEN]
+
+_SUMMARY_PROMPT = """Update the running summary of a conversation about a dataset with the new messages below.
+Keep the user's goals, the facts and numbers established so far, and open questions. Use at most {words} words.
+
+Current summary:
+{previous}
+
+New messages:
+{conversation}
+
+Reply with the updated summary only."""
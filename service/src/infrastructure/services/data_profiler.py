@@ -0,0 +1,117 @@
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+from ...entities.data_profile import ColumnProfile, DataProfile
+from .columnar_reader import known_column_stats
+
+def profile_dataframe(df: pd.DataFrame, sample_rows: int = 3) -> DataProfile:
+    """Profile every column of ``df`` in a handful of vectorised passes.
+
+    Null counts come from one ``count()`` over the frame. Numeric columns
+    are reduced together (``min``/``max``/``mean``/``std`` run block-wise
+    rather than per column), and each text column is factorised once to
+    get both its distinct count and its mode; categoricals reuse their
+    codes.
+    Values already known from file metadata (Parquet statistics) are used
+    instead of being recomputed.
+    """
+    rows = len(df)
+    known = known_column_stats(df)
+    # Positional access keeps duplicate column names apart
+    columns = list(df.columns)
+    dtypes = df.dtypes.tolist()
+
+    null_counts = _null_counts(df, known)
+    profiles = [
+        ColumnProfile(name=col, dtype=str(dtypes[i]), non_null_count=rows - null_counts[i], null_count=null_counts[i])
+        for i, col in enumerate(columns)
+    ]
+
+    numeric = [
+        i for i, dtype in enumerate(dtypes)
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) and null_counts[i] < rows
+    ]
+    if numeric:
+        _profile_numeric(df.iloc[:, numeric], [profiles[i] for i in numeric], known)
+
+    for i, dtype in enumerate(dtypes):
+        if dtype == 'object' or isinstance(dtype, pd.CategoricalDtype):
+            _profile_categorical(df.iloc[:, i], profiles[i])
+
+    return DataProfile(
+        total_rows=rows,
+        total_columns=len(columns),
+        columns=profiles,
+        sample_data=extract_sample_data(df, sample_rows)
+    )
+
+def extract_sample_data(df: pd.DataFrame, rows: int = 3) -> List[List[str]]:
+    """Return the first ``rows`` rows as strings, one list per row"""
+    # object dtype keeps each value's own type (ints stay ints next to floats)
+    return [[str(value) for value in row] for row in df.head(rows).to_numpy(dtype=object).tolist()]
+
+def profile_summary(profile: DataProfile) -> Dict[str, Any]:
+    """Return the profile in the dict shape used in AI prompts"""
+    summary = {
+        "total_rows": profile.total_rows,
+        "total_columns": profile.total_columns,
+        "columns": {}
+    }
+    for column in profile.columns:
+        col_info = {
+            "type": column.dtype,
+            "non_null_count": column.non_null_count,
+            "null_count": column.null_count
+        }
+        if column.mean is not None:
+            col_info.update({"min": column.min, "max": column.max, "mean": column.mean, "std": column.std})
+        elif column.unique_count is not None:
+            col_info.update({"unique_count": column.unique_count, "most_common": column.most_common})
+        summary["columns"][column.name] = col_info
+    return summary
+
+def _null_counts(df: pd.DataFrame, known: Dict[str, Dict[str, Any]]) -> List[int]:
+    if known and all(col in known and "null_count" in known[col] for col in df.columns):
+        return [int(known[col]["null_count"]) for col in df.columns]
+    # One pass over every block; counts come back in column order
+    rows = len(df)
+    return [rows - int(count) for count in df.count().to_numpy()]
+
+def _profile_numeric(numeric: pd.DataFrame, profiles: List[ColumnProfile], known: Dict[str, Dict[str, Any]]) -> None:
+    # Columns with known bounds only need the moments computed
+    needs_bounds = [i for i, profile in enumerate(profiles) if not ("min" in known.get(profile.name, {}) and "max" in known.get(profile.name, {}))]
+    bounds = numeric.iloc[:, needs_bounds] if needs_bounds else None
+    minimums = bounds.min().to_numpy() if bounds is not None else []
+    maximums = bounds.max().to_numpy() if bounds is not None else []
+    means = numeric.mean().to_numpy()
+    stds = numeric.std().to_numpy()
+
+    computed = dict(zip(needs_bounds, zip(minimums, maximums)))
+    for i, profile in enumerate(profiles):
+        if i in computed:
+            profile.min, profile.max = float(computed[i][0]), float(computed[i][1])
+        else:
+            profile.min, profile.max = float(known[profile.name]["min"]), float(known[profile.name]["max"])
+        profile.mean = float(means[i])
+        # A single value has no spread; report 0 rather than NaN
+        profile.std = float(stds[i]) if pd.notna(stds[i]) else 0
+
+def _profile_categorical(series: pd.Series, profile: ColumnProfile) -> None:
+    # One hashing pass (none for categoricals) yields distinct count and mode
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, values = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, values = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(values))
+    profile.unique_count = int((counts > 0).sum())
+    if profile.unique_count == 0:
+        profile.most_common = "N/A"
+        return
+    # Match Series.mode(): the smallest of the most frequent values
+    top = values[counts == counts.max()]
+    try:
+        most_common = min(top)
+    except TypeError:
+        most_common = top[0]
+    profile.most_common = str(most_common)
@@ -0,0 +1,294 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ...services.dataset_store import DatasetStoreInterface
+
+class DatasetStoreImpl(DatasetStoreInterface):
+    """Content-addressed cache of parsed DataFrames.
+
+    Frames are keyed by a hash of the uploaded bytes. The most recently used
+    frames are kept in memory; every parsed frame is also persisted under
+    ``cache_dir`` so it survives restarts. The disk cache is capped at
+    ``max_disk_bytes`` and evicts the least recently used files first.
+
+    With the default ``arrow`` format frames are written as uncompressed
+    Arrow IPC files and read back through a memory map, so numeric columns
+    are zero-copy views over the OS page cache. All uvicorn workers pointing
+    at the same ``cache_dir`` share those pages instead of each holding a
+    private copy. Such frames are read-only; copy before mutating them.
+    ``parquet`` trades that for smaller files.
+
+    The memory tier holds at most ``max_memory_items`` frames and
+    ``max_memory_bytes`` as measured by ``memory_usage(deep=True)``;
+    evicted frames are reloaded from disk on the next hit. ``demote_idle``
+    also drops frames unused for ``memory_idle_seconds``, so memory goes
+    to the datasets of active sessions. A lookup with ``columns`` reads only
+    those columns from disk and leaves the frame cold.
+    """
+
+    FILE_SUFFIXES = {"arrow": ".arrow", "parquet": ".parquet"}
+
+    def __init__(self, cache_dir: str, max_disk_bytes: int = 512 * 1024 * 1024, max_memory_items: int = 8, file_format: str = "arrow", max_memory_bytes: int = 1024 * 1024 * 1024, memory_idle_seconds: float = 5 * 60):
+        if file_format not in self.FILE_SUFFIXES:
+            raise ValueError(f"Unsupported dataset cache format: {file_format}. Supported formats: {', '.join(self.FILE_SUFFIXES)}")
+        self.cache_dir = cache_dir
+        self.file_format = file_format
+        self.file_suffix = self.FILE_SUFFIXES[file_format]
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_idle_seconds = memory_idle_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._frame_bytes: Dict[str, int] = {}
+        self._last_access: Dict[str, float] = {}
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bytes_saved": 0,
+            "disk_writes": 0,
+            "disk_evictions": 0,
+            "memory_evictions": 0,
+            "idle_demotions": 0,
+            "projected_reads": 0,
+            "write_errors": 0
+        }
+
+    def fingerprint(self, content: bytes) -> str:
+        """Return the content hash used as cache key"""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, key: str, source_size: int = 0, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Return the cached frame for ``key`` or None.
+
+        ``source_size`` is the size of the upload that would otherwise have
+        been parsed, and is counted towards ``bytes_saved`` on a hit. With
+        ``columns`` only those of them the frame has are returned, and a
+        frame that is not in memory is read partially without being promoted.
+        """
+        with self._lock:
+            df = self._frames.get(key)
+            if df is not None:
+                self._frames.move_to_end(key)
+                self._last_access[key] = time.monotonic()
+                self._stats["memory_hits"] += 1
+                self._stats["bytes_saved"] += source_size
+                return df if columns is None else df[[c for c in columns if c in df.columns]]
+
+        path = self._path_for(key)
+        try:
+            df = self._read_file(path, columns)
+        except FileNotFoundError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        except Exception as e:
+            print(f"Error reading cached dataset {key}: {e}")
+            self._remove_file(path)
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        self._touch(path)
+        if columns is not None:
+            with self._lock:
+                self._stats["disk_hits"] += 1
+                self._stats["projected_reads"] += 1
+                self._stats["bytes_saved"] += source_size
+            return df
+
+        size = _frame_size(df)
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._stats["bytes_saved"] += source_size
+            self._remember(key, df, size)
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Cache a freshly parsed frame on disk and in memory.
+
+        Returns the frame that was kept, which callers should use in place
+        of ``df`` so the parsed copy can be freed.
+        """
+        path = self._path_for(key)
+        if os.path.exists(path):
+            self._touch(path)
+            return self._remember_from_disk(key, path, df)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self._write_file(df, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Caching is best effort: frames pyarrow cannot encode (e.g. mixed
+            # type object columns) are simply kept in memory only.
+            print(f"Error caching dataset {key}: {e}")
+            self._remove_file(tmp_path)
+            with self._lock:
+                self._stats["write_errors"] += 1
+                self._remember(key, df, _frame_size(df))
+            return df
+
+        with self._lock:
+            self._stats["disk_writes"] += 1
+        df = self._remember_from_disk(key, path, df)
+        self._enforce_disk_limit()
+        return df
+
+    def demote_idle(self) -> int:
+        """Drop frames unused for ``memory_idle_seconds`` from memory; they stay on disk"""
+        cutoff = time.monotonic() - self.memory_idle_seconds
+        with self._lock:
+            idle = [key for key, last_access in self._last_access.items() if last_access < cutoff]
+        demoted = 0
+        for key in idle:
+            # Frames that could not be persisted have nowhere to go
+            if not os.path.exists(self._path_for(key)):
+                continue
+            with self._lock:
+                if self._last_access.get(key, cutoff) < cutoff:
+                    self._forget(key)
+                    self._stats["idle_demotions"] += 1
+                    demoted += 1
+        return demoted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters, hit rate and current footprint"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._frames)
+            stats["memory_bytes"] = self._memory_bytes
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["disk_bytes"] = sum(size for _, size, _ in self._list_files())
+        return stats
+
+    def _remember_from_disk(self, key: str, path: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Keep the frame as mapped from ``path`` rather than the parsed copy.
+
+        The parsed frame is private to this worker; the mapped one shares
+        its pages with every worker using the file. Parquet files are read
+        into private memory anyway, so there the parsed frame is kept.
+        """
+        if self.file_format == "arrow":
+            try:
+                df = self._read_file(path)
+            except Exception as e:
+                print(f"Error reading cached dataset {key}: {e}")
+        size = _frame_size(df)
+        with self._lock:
+            self._remember(key, df, size)
+        return df
+
+    def _remember(self, key: str, df: pd.DataFrame, size: int) -> None:
+        self._forget(key)
+        if size > self.max_memory_bytes:
+            # Would evict everything else; serve it from disk instead
+            return
+        self._frames[key] = df
+        self._frame_bytes[key] = size
+        self._last_access[key] = time.monotonic()
+        self._memory_bytes += size
+        while len(self._frames) > self.max_memory_items or self._memory_bytes > self.max_memory_bytes:
+            self._forget(next(iter(self._frames)))
+            self._stats["memory_evictions"] += 1
+
+    def _forget(self, key: str) -> None:
+        if self._frames.pop(key, None) is not None:
+            self._memory_bytes -= self._frame_bytes.pop(key)
+            del self._last_access[key]
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.file_suffix)
+
+    def _read_file(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if self.file_format == "parquet":
+            if columns is None:
+                return pd.read_parquet(path)
+            # Through pyarrow so an empty projection keeps the row count
+            names = pq.read_schema(path).names
+            return pq.read_table(path, columns=[c for c in columns if c in names]).to_pandas()
+
+        # The table's buffers keep the mapping alive for as long as the
+        # frame references them, so the source is deliberately not closed.
+        source = pa.memory_map(path, "r")
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            # Unselected columns are never paged in
+            table = table.select([c for c in columns if c in table.column_names])
+        # One block per column lets pandas wrap the mapped buffers directly
+        # instead of consolidating them into freshly allocated 2D blocks.
+        return table.to_pandas(split_blocks=True)
+
+    def _write_file(self, df: pd.DataFrame, path: str) -> None:
+        if self.file_format == "parquet":
+            df.to_parquet(path, index=False)
+            return
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def _list_files(self):
+        """Return (path, size, mtime) for every cached dataset file"""
+        files = []
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return files
+        for entry in entries:
+            if not entry.name.endswith(self.file_suffix):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _enforce_disk_limit(self) -> None:
+        files = self._list_files()
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_disk_bytes:
+            return
+
+        # Oldest modification time first: hits bump mtime, so this is LRU order
+        for path, size, _ in sorted(files, key=lambda f: f[2]):
+            if total <= self.max_disk_bytes:
+                break
+            if self._remove_file(path):
+                total -= size
+                with self._lock:
+                    self._stats["disk_evictions"] += 1
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _remove_file(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+def _frame_size(df: pd.DataFrame) -> int:
+    # Memory-mapped Arrow frames are counted too, although the OS can
+    # reclaim those pages; the budget errs on the side of evicting
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,102 @@
+import gzip
+import io
+import zipfile
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+from ...enums.file_format import Compression
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for .zst uploads
+    zstandard = None
+
+class _CappedReader(io.RawIOBase):
+    """Raises once more than ``max_bytes`` have been read from ``raw``.
+
+    Guards against decompression bombs: a few kilobytes of gzip or zip can
+    expand to gigabytes, so the limit is enforced while streaming instead
+    of after the data has been materialised.
+    """
+
+    def __init__(self, raw: BinaryIO, max_bytes: int):
+        self._raw = raw
+        self._max_bytes = max_bytes
+        self._total = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        self._total += count
+        if self._total > self._max_bytes:
+            raise ValueError(f"Decompressed file exceeds the maximum size of {self._max_bytes / (1024*1024)}MB")
+        return count
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+def open_decompressed(content: bytes, compression: Optional[Compression], max_bytes: int) -> BinaryIO:
+    """Return a fresh stream over the decompressed upload, capped at ``max_bytes``"""
+    if compression is None:
+        if len(content) > max_bytes:
+            raise ValueError(f"File exceeds the maximum size of {max_bytes / (1024*1024)}MB")
+        return io.BytesIO(content)
+
+    if compression == Compression.GZIP:
+        raw = gzip.GzipFile(fileobj=io.BytesIO(content))
+    elif compression == Compression.ZSTD:
+        if zstandard is None:
+            raise ValueError("Zstandard uploads require the 'zstandard' package")
+        raw = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(content))
+    elif compression == Compression.ZIP:
+        raw = _open_zip_member(content, max_bytes)
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    return io.BufferedReader(_CappedReader(raw, max_bytes))
+
+def _open_zip_member(content: bytes, max_bytes: int) -> BinaryIO:
+    archive = zipfile.ZipFile(io.BytesIO(content))
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+    ]
+    if len(members) != 1 or not members[0].filename.lower().endswith(".csv"):
+        raise ValueError("Zip uploads must contain exactly one CSV file")
+
+    member = members[0]
+    # The declared size can be forged, so the stream is capped as well
+    if member.file_size > max_bytes:
+        raise ValueError(f"Decompressed file exceeds the maximum size of {max_bytes / (1024*1024)}MB")
+    return archive.open(member)
+
+def extract_archive(content: bytes, allowed_extensions: Sequence[str], max_bytes: int) -> List[Tuple[str, bytes]]:
+    """Return ``(name, content)`` for every supported file in a zip archive.
+
+    ``max_bytes`` caps the archive's total uncompressed size. Nested zips
+    are not expanded.
+    """
+    archive = zipfile.ZipFile(io.BytesIO(content))
+    extensions = tuple(ext for ext in allowed_extensions if ext != ".zip")
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and info.filename.lower().endswith(extensions)
+    ]
+    if not members:
+        raise ValueError("Archive contains no supported files")
+    if sum(info.file_size for info in members) > max_bytes:
+        raise ValueError(f"Decompressed file exceeds the maximum size of {max_bytes / (1024*1024)}MB")
+
+    files = []
+    remaining = max_bytes
+    for info in members:
+        # Declared sizes can be forged, so every read is capped as well
+        with io.BufferedReader(_CappedReader(archive.open(info), remaining)) as stream:
+            data = stream.read()
+        remaining -= len(data)
+        files.append((info.filename.rsplit("/", 1)[-1], data))
+    return files
@@ -0,0 +1,140 @@
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+
+# Currency symbols and padding stripped before parsing
+_NUMERIC_NOISE = r"[\s$€£¥]"
+# Commas are only dropped in this shape; "1,5" is a decimal comma, not 15
+_THOUSANDS = r"^[-+]?\d{1,3}(,\d{3})+(\.\d+)?%?$"
+# float64 holds 15 significant digits exactly; longer numbers are identifiers
+_MAX_DIGITS = 15
+# Whole floats outside this range do not fit int64
+_INT64_BOUND = float(2 ** 63)
+# Values such as "00123" are identifiers (zip codes, SKUs), not numbers
+_LEADING_ZERO = r"^[-+]?0\d"
+_DATE_HINT = r"\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}"
+_DATE_SAMPLE_SIZE = 100
+
+@dataclass
+class DtypeOptimizationReport:
+    memory_before: int
+    memory_after: int
+    conversions: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.memory_before - self.memory_after
+
+    @property
+    def reduction_ratio(self) -> float:
+        """How many times smaller the optimised frame is"""
+        return self.memory_before / self.memory_after if self.memory_after else 1.0
+
+def optimize_dtypes(df: pd.DataFrame, category_ratio: float = 0.5) -> Tuple[pd.DataFrame, DtypeOptimizationReport]:
+    """Shrink a freshly parsed frame and report its deep memory usage.
+
+    Runs, per column: numeric coercion of text such as "$1,200" or "12%"
+    (percentages keep their written value, 12.0), datetime detection,
+    conversion of strings with at most ``category_ratio`` unique values
+    to ``category``, and lossless integer/float downcasting.
+    """
+    memory_before = int(df.memory_usage(deep=True).sum())
+    optimized = df.copy(deep=False)
+    conversions = {}
+
+    for col in optimized.columns:
+        series = optimized[col]
+        before = str(series.dtype)
+
+        if series.dtype == 'object':
+            series = _coerce_numeric_text(series)
+            if series.dtype == 'object':
+                series = _coerce_datetime_text(series)
+            if series.dtype == 'object':
+                series = _to_category(series, category_ratio)
+
+        if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            series = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            series = _downcast_float(series)
+
+        if str(series.dtype) != before:
+            optimized[col] = series
+            conversions[str(col)] = f"{before} -> {series.dtype}"
+
+    memory_after = int(optimized.memory_usage(deep=True).sum())
+    return optimized, DtypeOptimizationReport(memory_before, memory_after, conversions)
+
+def _coerce_numeric_text(series: pd.Series) -> pd.Series:
+    non_null = series.dropna()
+    if not _is_text(non_null):
+        return series
+
+    cleaned = non_null.str.replace(_NUMERIC_NOISE, "", regex=True)
+    if cleaned.str.contains(_LEADING_ZERO, regex=True).any():
+        return series
+    with_commas = cleaned.str.contains(",", regex=False)
+    if with_commas.any():
+        if not cleaned[with_commas].str.match(_THOUSANDS).all():
+            return series
+        cleaned = cleaned.str.replace(",", "", regex=False)
+    if (cleaned.str.count(r"\d") > _MAX_DIGITS).any():
+        return series
+
+    numbers = pd.to_numeric(cleaned.str.rstrip("%"), errors='coerce')
+    if numbers.isna().any():
+        return series
+
+    result = pd.Series(np.nan, index=series.index, dtype='float64')
+    result[numbers.index] = numbers.astype('float64')
+    if _fits_int64(result):
+        return result.astype('int64')
+    return result
+
+def _coerce_datetime_text(series: pd.Series) -> pd.Series:
+    non_null = series.dropna()
+    if not _is_text(non_null):
+        return series
+
+    sample = non_null.iloc[:_DATE_SAMPLE_SIZE]
+    if not sample.str.contains(_DATE_HINT, regex=True).all():
+        return series
+
+    with warnings.catch_warnings():
+        # "Could not infer format" is expected for ambiguous columns
+        warnings.simplefilter("ignore")
+        parsed = pd.to_datetime(series, errors='coerce')
+    # Reject the conversion if any value failed to parse
+    if parsed.isna().sum() != series.isna().sum():
+        return series
+    return parsed
+
+def _to_category(series: pd.Series, category_ratio: float) -> pd.Series:
+    if len(series) == 0:
+        return series
+    if series.nunique(dropna=True) > category_ratio * len(series):
+        return series
+    return series.astype('category')
+
+def _downcast_float(series: pd.Series) -> pd.Series:
+    if _fits_int64(series):
+        return pd.to_numeric(series.astype('int64'), downcast='integer')
+
+    narrowed = series.astype('float32')
+    # Only keep float32 if no value loses precision
+    if ((narrowed.astype('float64') == series) | series.isna()).all():
+        return narrowed
+    return series
+
+def _fits_int64(series: pd.Series) -> bool:
+    """True if every value is a whole number int64 can hold"""
+    return bool(
+        series.notna().all() and (series % 1 == 0).all()
+        and (series >= -_INT64_BOUND).all() and (series < _INT64_BOUND).all()
+    )
+
+def _is_text(non_null: pd.Series) -> bool:
+    """True if every remaining value is a string"""
+    return not non_null.empty and pd.api.types.infer_dtype(non_null, skipna=True) == 'string'
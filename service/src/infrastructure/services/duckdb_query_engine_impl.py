@@ -0,0 +1,112 @@
+import threading
+import time
+from typing import Any, Dict
+import pandas as pd
+import pyarrow as pa
+
+try:
+    import duckdb
+except ImportError:  # optional, only needed for query mode chats
+    duckdb = None
+
+from ...services.query_engine import QueryEngineInterface
+
+# Name of the session dataset in model-written SQL
+TABLE_NAME = "data"
+
+# Result types whose values have no size bound, cut to max_cell_chars as text
+_UNBOUNDED_TYPES = {"varchar", "blob", "bit", "list", "array", "struct", "map", "union"}
+
+class DuckDBQueryEngineImpl(QueryEngineInterface):
+    """Runs model-written SQL against a session dataset in a sandbox.
+
+    Every query gets a fresh in-memory DuckDB database holding only the
+    dataset, registered from Arrow as the table ``data``. File, network and
+    extension access are disabled and the configuration is locked, so a
+    query can read nothing else and change nothing. Only a single SELECT
+    is accepted; it is interrupted after ``timeout_seconds`` and returns at
+    most ``max_rows`` rows. Text, binary and nested values are cut to
+    ``max_cell_chars``, as one aggregate such as ``string_agg`` can hold a
+    whole column.
+    """
+
+    def __init__(self, timeout_seconds: float = 10, max_rows: int = 50, memory_limit: str = "512MB", threads: int = 2, max_cell_chars: int = 500):
+        if duckdb is None:
+            raise ValueError("The duckdb package is required for query mode")
+        self.timeout_seconds = timeout_seconds
+        self.max_rows = max_rows
+        self.max_cell_chars = max_cell_chars
+        self.memory_limit = memory_limit
+        self.threads = threads
+        self._lock = threading.Lock()
+        self._stats = {
+            "queries": 0,
+            "rejected": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "total_seconds": 0.0
+        }
+
+    def execute(self, df: pd.DataFrame, sql: str) -> pd.DataFrame:
+        """Run ``sql`` over ``df`` and return up to ``max_rows`` result rows of bounded size"""
+        connection = duckdb.connect(":memory:", config={
+            "enable_external_access": False,
+            "autoload_known_extensions": False,
+            "memory_limit": self.memory_limit,
+            "threads": self.threads,
+            "lock_configuration": True
+        })
+        timer = threading.Timer(self.timeout_seconds, connection.interrupt)
+        start = time.perf_counter()
+        try:
+            sql = self._validate(connection, sql)
+            connection.register(TABLE_NAME, pa.Table.from_pandas(df, preserve_index=False))
+            timer.start()
+            # On lines of their own, so a trailing "-- comment" cannot swallow the limit
+            limited = f"SELECT * FROM (\n{sql}\n) LIMIT {self.max_rows}"
+            relation = connection.sql(limited)
+            cells = ", ".join(self._capped_cell(column, column_type.id) for column, column_type in zip(relation.columns, relation.types))
+            result = connection.execute(f"SELECT {cells} FROM ({limited})").fetch_df()
+        except duckdb.InterruptException:
+            self._count("timeouts")
+            raise ValueError(f"Query took longer than {self.timeout_seconds} seconds")
+        except duckdb.Error as e:
+            self._count("failed")
+            raise ValueError(f"Query failed: {e}")
+        finally:
+            timer.cancel()
+            connection.close()
+
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats["total_seconds"] += time.perf_counter() - start
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return query counters"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _validate(self, connection, sql: str) -> str:
+        sql = sql.strip().rstrip(";").strip()
+        try:
+            statements = connection.extract_statements(sql)
+        except duckdb.Error as e:
+            self._count("rejected")
+            raise ValueError(f"Query is not valid SQL: {e}")
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            self._count("rejected")
+            raise ValueError("Only a single SELECT query is allowed")
+        return sql
+
+    def _capped_cell(self, column: str, type_id: str) -> str:
+        name = '"' + column.replace('"', '""') + '"'
+        if type_id not in _UNBOUNDED_TYPES:
+            return name
+        text = name if type_id == "varchar" else f"CAST({name} AS VARCHAR)"
+        # The marker tells the model the value goes on
+        return f"CASE WHEN length({text}) > {self.max_cell_chars} THEN left({text}, {self.max_cell_chars}) || '...' ELSE {text} END AS {name}"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
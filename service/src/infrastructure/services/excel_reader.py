@@ -0,0 +1,119 @@
+import datetime
+from typing import Any, BinaryIO, Dict, List, Optional
+import pandas as pd
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # optional Rust-backed fast path
+    CalamineWorkbook = None
+
+ENGINE_CALAMINE = "calamine"
+ENGINE_OPENPYXL = "openpyxl"
+ENGINE_PANDAS = "pandas"
+
+def available_engine(filename: Optional[str] = None) -> str:
+    """Return the fastest engine able to read ``filename``"""
+    if CalamineWorkbook is not None:
+        return ENGINE_CALAMINE
+    if filename and filename.lower().endswith('.xls'):
+        # openpyxl only understands the OOXML formats
+        return ENGINE_PANDAS
+    return ENGINE_OPENPYXL
+
+def read_excel_sheets(file: BinaryIO, filename: Optional[str] = None, engine: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """Read every sheet of a workbook, in workbook order.
+
+    ``calamine`` parses the whole workbook natively and is several times
+    faster than openpyxl. Without it, ``openpyxl`` is used in read-only mode,
+    which streams rows from the archive instead of building the full cell
+    object model that ``pd.read_excel`` creates.
+    """
+    engine = engine or available_engine(filename)
+    file.seek(0)
+
+    if engine == ENGINE_CALAMINE:
+        return _read_with_calamine(file)
+    if engine == ENGINE_OPENPYXL:
+        return _read_with_openpyxl(file)
+    if engine == ENGINE_PANDAS:
+        return pd.read_excel(file, sheet_name=None)
+    raise ValueError(f"Unsupported Excel engine: {engine}")
+
+def _read_with_calamine(file: BinaryIO) -> Dict[str, pd.DataFrame]:
+    workbook = CalamineWorkbook.from_filelike(file)
+    return {
+        name: _rows_to_frame(workbook.get_sheet_by_name(name).to_python(skip_empty_area=False))
+        for name in workbook.sheet_names
+    }
+
+def _read_with_openpyxl(file: BinaryIO) -> Dict[str, pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        return {
+            sheet.title: _rows_to_frame(sheet.iter_rows(values_only=True))
+            for sheet in workbook.worksheets
+        }
+    finally:
+        workbook.close()
+
+def _rows_to_frame(rows) -> pd.DataFrame:
+    """Build a frame from raw cell rows, using the first row as header"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    headers = _make_headers(header)
+    width = len(headers)
+    data = [_fit_row(row, width) for row in rows]
+
+    # Drop trailing blank rows left behind by formatting
+    while data and all(value is None for value in data[-1]):
+        data.pop()
+
+    df = pd.DataFrame(data, columns=headers)
+    return _normalise_types(df)
+
+def _make_headers(header) -> List[str]:
+    headers = []
+    seen: Dict[str, int] = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or value == "" else str(value)
+        # Mangle duplicates the same way pd.read_excel does ("a", "a.1", ...)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        headers.append(name)
+    return headers
+
+def _fit_row(row, width: int) -> List[Any]:
+    values = [None if value == "" else value for value in row[:width]]
+    if len(values) < width:
+        values.extend([None] * (width - len(values)))
+    return values
+
+def _normalise_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Match the dtypes pd.read_excel would have produced"""
+    df = df.infer_objects()
+
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series):
+            # Excel stores every number as a double
+            if series.notna().all() and (series % 1 == 0).all():
+                df[col] = series.astype('int64')
+        elif series.dtype == 'object':
+            non_null = series.dropna()
+            if non_null.empty or not _is_date(non_null.iloc[0]):
+                continue
+            if non_null.map(_is_date).all():
+                df[col] = pd.to_datetime(series)
+
+    return df
+
+def _is_date(value: Any) -> bool:
+    return isinstance(value, (datetime.date, datetime.datetime))
@@ -0,0 +1,156 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+
+from ...entities.data_profile import ColumnProfile, DataProfile
+from ...entities.question_intent import QuestionIntent
+from ...enums.question_intent import IntentKind
+from ...services.fast_answer import FastAnswerInterface
+
+_DATA = r"(the |this )?(data|dataset|file|table|csv)"
+_COUNT_SUFFIX = rf"( are there| are in {_DATA}| in {_DATA}| does {_DATA} (have|contain))?"
+
+_AGGREGATES = {
+    "average": IntentKind.MEAN, "mean": IntentKind.MEAN, "avg": IntentKind.MEAN,
+    "median": IntentKind.MEDIAN,
+    "sum": IntentKind.SUM, "total": IntentKind.SUM,
+    "minimum": IntentKind.MIN, "min": IntentKind.MIN, "lowest": IntentKind.MIN, "smallest": IntentKind.MIN,
+    "maximum": IntentKind.MAX, "max": IntentKind.MAX, "highest": IntentKind.MAX, "largest": IntentKind.MAX
+}
+
+# Whole-question patterns only: anything beyond them ("by region", "where
+# ...", "in 2023") changes the question and goes to the model
+_PATTERNS: List[Tuple[Optional[IntentKind], re.Pattern]] = [
+    (IntentKind.ROW_COUNT, re.compile(rf"^(how many (rows|records|entries|lines)|(the )?(number|count) of (rows|records|entries)){_COUNT_SUFFIX}$")),
+    (IntentKind.COLUMN_COUNT, re.compile(rf"^(how many (columns|fields)|(the )?(number|count) of (columns|fields)){_COUNT_SUFFIX}$")),
+    (IntentKind.UNIQUE_COUNT, re.compile(r"^(how many|(the )?(number|count) of) (unique|distinct|different) (?P<column>.+?)( values)?( are there)?$")),
+    (IntentKind.MOST_COMMON, re.compile(r"^(the )?(most common|most frequent|most popular|commonest) (value (of|in|for) )?(the )?(?P<column>.+?)( column)?$")),
+    (IntentKind.MOST_COMMON, re.compile(r"^(which|what) (?P<column>.+?) (is|appears|occurs) (the )?most (common|frequent|often|popular)$")),
+    (None, re.compile(rf"^(the )?(?P<aggregate>{'|'.join(_AGGREGATES)}) (value )?((of|for|in) )?(the )?(?P<column>.+?)( column| values?)?$"))
+]
+
+_PREFIX = re.compile(r"^(please |can you |could you )?(tell me |show me |give me |calculate |compute )?(what is |what's |whats |what are )?")
+
+_LABELS = {
+    IntentKind.MEAN: "average",
+    IntentKind.MEDIAN: "median",
+    IntentKind.SUM: "total",
+    IntentKind.MIN: "lowest",
+    IntentKind.MAX: "highest",
+    IntentKind.MOST_COMMON: "most common"
+}
+
+class FastAnswerImpl(FastAnswerInterface):
+    """Answers simple lookup and aggregate questions without the model.
+
+    A question only qualifies when it matches one of a few whole-question
+    patterns and names a column of the dataset, so "average salary" is
+    answered here while "average salary by department" is not. Answers
+    come from the session's cached profile where it has them; medians,
+    sums and distinct counts of numbers are computed from the one column.
+    """
+
+    def __init__(self):
+        self._stats = {
+            "messages": 0,
+            "fast_answers": 0,
+            "column_reads": 0
+        }
+
+    def match(self, question: str, columns: List[str]) -> Optional[QuestionIntent]:
+        """Return what ``question`` asks for, or None when the model should answer it"""
+        text = _PREFIX.sub("", _normalize(question), count=1)
+        for kind, pattern in _PATTERNS:
+            found = pattern.match(text)
+            if not found:
+                continue
+            if kind is None:
+                kind = _AGGREGATES[found.group("aggregate")]
+            if not kind.needs_column:
+                return QuestionIntent(kind)
+            column = _resolve_column(found.group("column"), columns)
+            if column is not None:
+                return QuestionIntent(kind, column)
+        return None
+
+    def answer(self, intent: QuestionIntent, profile: Optional[DataProfile], df: Optional[pd.DataFrame]) -> Optional[str]:
+        """Answer ``intent`` from the profile, else from ``df``; None when neither can"""
+        if intent.kind == IntentKind.ROW_COUNT:
+            rows = profile.total_rows if profile is not None else len(df)
+            return f"The dataset has {rows:,} rows."
+        if intent.kind == IntentKind.COLUMN_COUNT:
+            names = [column.name for column in profile.columns] if profile is not None else [str(name) for name in df.columns]
+            return f"The dataset has {len(names)} columns: {', '.join(names)}."
+
+        value = None
+        if profile is not None:
+            value = _from_profile(intent, next((column for column in profile.columns if column.name == intent.column), None))
+        if value is None and df is not None and intent.column in df.columns:
+            value = _from_series(intent, df[intent.column])
+        if value is None:
+            return None
+
+        if intent.kind == IntentKind.UNIQUE_COUNT:
+            return f"The {intent.column} column has {value:,} distinct values."
+        return f"The {_LABELS[intent.kind]} {intent.column} is {value}."
+
+    def record(self, answered: bool, column_read: bool = False) -> None:
+        """Count a chat message and whether it took the fast path"""
+        self._stats["messages"] += 1
+        self._stats["fast_answers"] += answered
+        self._stats["column_reads"] += column_read
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return fast path counters and the fraction of messages it answered"""
+        stats = dict(self._stats)
+        stats["fast_path_fraction"] = stats["fast_answers"] / stats["messages"] if stats["messages"] else 0.0
+        return stats
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"[_\-]+", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip().rstrip("?.! ")
+
+def _resolve_column(text: str, columns: List[str]) -> Optional[str]:
+    """Return the column ``text`` names, trying its singular too; None when unknown or ambiguous"""
+    by_name: Dict[str, List[str]] = {}
+    for column in columns:
+        by_name.setdefault(_normalize(str(column)), []).append(column)
+    for candidate in (text, text[:-1] if text.endswith("s") else None, text[:-2] if text.endswith("es") else None):
+        matches = by_name.get(candidate) if candidate else None
+        if matches:
+            return matches[0] if len(matches) == 1 else None
+    return None
+
+def _from_profile(intent: QuestionIntent, column: Optional[ColumnProfile]) -> Optional[Any]:
+    if column is None:
+        return None
+    if intent.kind in (IntentKind.MEAN, IntentKind.MIN, IntentKind.MAX) and column.mean is not None:
+        return _format_number({IntentKind.MEAN: column.mean, IntentKind.MIN: column.min, IntentKind.MAX: column.max}[intent.kind])
+    if intent.kind == IntentKind.MOST_COMMON and column.unique_count:
+        return column.most_common
+    if intent.kind == IntentKind.UNIQUE_COUNT and column.unique_count is not None:
+        return column.unique_count
+    return None
+
+def _from_series(intent: QuestionIntent, series: pd.Series) -> Optional[Any]:
+    if intent.kind == IntentKind.UNIQUE_COUNT:
+        return int(series.nunique())
+    if intent.kind == IntentKind.MOST_COMMON:
+        # Series.mode() is sorted, matching the profile's pick among ties
+        modes = series.mode()
+        return str(modes.iloc[0]) if len(modes) else None
+
+    if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        return None
+    value = {
+        IntentKind.MEAN: series.mean,
+        IntentKind.MEDIAN: series.median,
+        IntentKind.SUM: series.sum,
+        IntentKind.MIN: series.min,
+        IntentKind.MAX: series.max
+    }[intent.kind]()
+    return _format_number(value) if pd.notna(value) else None
+
+def _format_number(value: float) -> str:
+    value = float(value)
+    return f"{int(value):,}" if value.is_integer() else f"{value:,.2f}"
@@ -1,21 +1,51 @@
+import asyncio
 import pandas as pd
 import io
-from typing import BinaryIO, List
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from ...services.file_service import FileServiceInterface
-from ...services.ai_service import AIServiceInterface
-from ...entities.file_analysis import FileAnalysis
+from ...services.ai_service import AIServiceInterface, FallbackOutput
+from ...services.dataset_store import DatasetStoreInterface
+from ...entities.file_analysis import FileAnalysis, SheetAnalysis
+from ...enums.file_format import Compression, FileFormat
+from ...enums.job_status import AnalysisStage
+from ..executor import DataFrameExecutor, offload
+from .decompression import open_decompressed
+from .excel_reader import read_excel_sheets
+from .columnar_reader import read_feather, read_ndjson, read_parquet
+from .dtype_optimizer import DtypeOptimizationReport, optimize_dtypes
+from .data_profiler import extract_sample_data, profile_dataframe
 
 class FileServiceImpl(FileServiceInterface):
-    def __init__(self, ai_service: AIServiceInterface):
+    def __init__(self, ai_service: AIServiceInterface, dataset_store: Optional[DatasetStoreInterface] = None, optimize_dtypes: bool = True, executor: Optional[DataFrameExecutor] = None, max_decompressed_size: int = 100 * 1024 * 1024):
         self.ai_service = ai_service
+        self.dataset_store = dataset_store
+        self.optimize_dtypes = optimize_dtypes
+        self.max_decompressed_size = max_decompressed_size
+        # Parsing and profiling run here so they never block the event loop
+        self.executor = executor
+        self.ingestion_stats = {
+            "frames_optimized": 0,
+            "memory_before_bytes": 0,
+            "memory_after_bytes": 0
+        }
     
-    async def process_file(self, file: BinaryIO, filename: str) -> FileAnalysis:
+    async def process_file(self, file: BinaryIO, filename: str, progress: Optional[Callable[[AnalysisStage], None]] = None) -> FileAnalysis:
+        report = progress or (lambda stage: None)
+        
         # Read the file based on extension
-        if filename.lower().endswith('.csv'):
-            df = self.read_csv(file)
-        elif filename.lower().endswith(('.xlsx', '.xls')):
-            df = self.read_excel(file)
+        report(AnalysisStage.PARSING)
+        sheets = None
+        file_format, compression = FileFormat.detect(filename)
+        if file_format == FileFormat.CSV:
+            df = await self._load_csv(self._read_content(file), compression)
+        elif file_format == FileFormat.EXCEL:
+            workbook = await self._load_excel(self._read_content(file), filename)
+            # The first sheet drives the AI insights; every sheet is profiled
+            df = next(iter(workbook.values()))
+            sheets = await self._analyse_sheets(workbook)
+        elif file_format in _COLUMNAR_FORMATS:
+            df = await self._load_columnar(self._read_content(file), file_format)
         else:
             raise ValueError("Unsupported file format")
         
@@ -29,18 +59,21 @@ class FileServiceImpl(FileServiceInterface):
         columns = len(df.columns)
         headers = df.columns.tolist()
         
-        # Get sample data (first 3 rows)
-        sample_data = []
-        for _, row in df.head(3).iterrows():
-            sample_data.append([str(value) for value in row.values])
+        # Profile once; the sample rows and both AI prompts reuse it
+        report(AnalysisStage.PROFILING)
+        profile = await offload(self.executor, profile_dataframe, df)
+        sample_data = profile.sample_data
         
         # Generate AI insights and questions
+        report(AnalysisStage.INSIGHTS)
         try:
-            insights = await self.ai_service.generate_insights(df, filename)
+            insights = await self.ai_service.generate_insights(df, filename, profile)
         except Exception as e:
             print(f"Error generating AI insights: {e}")
-            insights = []
-        sample_questions = await self.ai_service.generate_sample_questions(df, headers)
+            insights = FallbackOutput()
+        report(AnalysisStage.QUESTIONS)
+        sample_questions = await self.ai_service.generate_sample_questions(df, headers, profile)
+        ai_fallback = isinstance(insights, FallbackOutput) or isinstance(sample_questions, FallbackOutput)
         return FileAnalysis(
             file_name=filename,
             file_size=file_size,
@@ -48,34 +81,184 @@ class FileServiceImpl(FileServiceInterface):
             columns=columns,
             headers=headers,
             sample_data=sample_data,
-            insights=insights,
-            sample_questions=sample_questions,
-            upload_timestamp=datetime.now()
+            insights=list(insights),
+            sample_questions=list(sample_questions),
+            upload_timestamp=datetime.now(),
+            sheets=sheets,
+            ai_fallback=ai_fallback
         )
     
+    async def load_dataframe(self, file: BinaryIO, filename: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Parse an upload without blocking the event loop.
+        
+        ``columns`` restricts Parquet, Feather and JSON Lines uploads to the
+        named columns; the other formats are always read in full.
+        """
+        file_format, compression = FileFormat.detect(filename)
+        if file_format == FileFormat.CSV:
+            return await self._load_csv(self._read_content(file), compression)
+        if file_format == FileFormat.EXCEL:
+            workbook = await self._load_excel(self._read_content(file), filename)
+            return next(iter(workbook.values()))
+        if file_format in _COLUMNAR_FORMATS:
+            return await self._load_columnar(self._read_content(file), file_format, columns)
+        raise ValueError("Unsupported file format")
+    
     def read_csv(self, file: BinaryIO) -> pd.DataFrame:
         try:
-            # Reset file pointer
-            file.seek(0)
-            content = file.read()
+            content = self._read_content(file)
             
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(io.StringIO(content.decode(encoding)))
-                    return df
-                except UnicodeDecodeError:
-                    continue
+            # Reuse a previous parse of the same bytes when available
+            cache_key, cached = self._lookup(content)
+            if cached is not None:
+                return cached
             
-            raise ValueError("Unable to decode file with supported encodings")
+            df, report = _ingest_csv(content, self.optimize_dtypes, None, self.max_decompressed_size)
+            self._record_optimization(report)
+            if cache_key is not None:
+                df = self.dataset_store.put(cache_key, df)
+            return df
         except Exception as e:
             raise ValueError(f"Error reading CSV file: {str(e)}")
     
     def read_excel(self, file: BinaryIO) -> pd.DataFrame:
+        """Read the first sheet of a workbook"""
+        return next(iter(self.read_excel_sheets(file).values()))
+    
+    def read_excel_sheets(self, file: BinaryIO, filename: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """Read every sheet of a workbook, keyed by sheet name"""
         try:
-            file.seek(0)
-            df = pd.read_excel(file)
+            sheets, reports = _ingest_excel(self._read_content(file), filename, self.optimize_dtypes)
+        except Exception as e:
+            raise ValueError(f"Error reading Excel file: {str(e)}")
+        for report in reports:
+            self._record_optimization(report)
+        return sheets
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return ingestion counters, including dtype optimisation savings"""
+        stats = dict(self.ingestion_stats)
+        before = stats["memory_before_bytes"]
+        after = stats["memory_after_bytes"]
+        stats["memory_reduction_ratio"] = before / after if after else 1.0
+        return stats
+    
+    async def _load_csv(self, content: bytes, compression: Optional[Compression] = None) -> pd.DataFrame:
+        try:
+            cache_key, cached = await asyncio.to_thread(self._lookup, content)
+            if cached is not None:
+                return cached
+            
+            df, report = await offload(self.executor, _ingest_csv, content, self.optimize_dtypes, compression, self.max_decompressed_size)
+            self._record_optimization(report)
+            if cache_key is not None:
+                df = await asyncio.to_thread(self.dataset_store.put, cache_key, df)
             return df
+        except Exception as e:
+            raise ValueError(f"Error reading CSV file: {str(e)}")
+    
+    async def _load_excel(self, content: bytes, filename: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        try:
+            sheets, reports = await offload(self.executor, _ingest_excel, content, filename, self.optimize_dtypes)
         except Exception as e:
             raise ValueError(f"Error reading Excel file: {str(e)}")
+        for report in reports:
+            self._record_optimization(report)
+        return sheets
+    
+    async def _load_columnar(self, content: bytes, file_format: FileFormat, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        try:
+            df, report = await offload(self.executor, _ingest_columnar, content, file_format, columns, self.optimize_dtypes, self.max_decompressed_size)
+        except Exception as e:
+            raise ValueError(f"Error reading {_COLUMNAR_FORMATS[file_format]} file: {str(e)}")
+        self._record_optimization(report)
+        return df
+    
+    def _read_content(self, file: BinaryIO) -> bytes:
+        file.seek(0)
+        return file.read()
+    
+    def _lookup(self, content: bytes) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """Return the cache key for ``content`` and the cached frame, if any"""
+        if self.dataset_store is None:
+            return None, None
+        cache_key = self.dataset_store.fingerprint(content)
+        return cache_key, self.dataset_store.get(cache_key, source_size=len(content))
+    
+    def _record_optimization(self, report: Optional[DtypeOptimizationReport]) -> None:
+        if report is None:
+            return
+        self.ingestion_stats["frames_optimized"] += 1
+        self.ingestion_stats["memory_before_bytes"] += report.memory_before
+        self.ingestion_stats["memory_after_bytes"] += report.memory_after
+    
+    async def _analyse_sheets(self, sheets: Dict[str, pd.DataFrame]) -> List[SheetAnalysis]:
+        """Profile independent sheets concurrently on the worker pool"""
+        return await asyncio.gather(*[
+            offload(self.executor, _analyse_sheet, name, sheet_df)
+            for name, sheet_df in sheets.items()
+        ])
+
+# Typed formats that are decoded without any text parsing
+_COLUMNAR_FORMATS = {
+    FileFormat.PARQUET: "Parquet",
+    FileFormat.FEATHER: "Feather",
+    FileFormat.NDJSON: "JSON Lines"
+}
+
+# Module-level so they can be shipped to a process pool
+
+def _parse_csv(content: bytes, compression: Optional[Compression], max_bytes: int) -> pd.DataFrame:
+    # Try different encodings; the parser decodes straight from the
+    # (decompressing) byte stream, so no full text copy is ever built
+    encodings = ['utf-8', 'latin-1', 'cp1252']
+    for encoding in encodings:
+        try:
+            with open_decompressed(content, compression, max_bytes) as stream:
+                return pd.read_csv(stream, encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+    
+    raise ValueError("Unable to decode file with supported encodings")
+
+def _ingest_csv(content: bytes, optimize: bool, compression: Optional[Compression], max_bytes: int) -> Tuple[pd.DataFrame, Optional[DtypeOptimizationReport]]:
+    df = _parse_csv(content, compression, max_bytes)
+    if not optimize:
+        return df, None
+    return optimize_dtypes(df)
+
+def _ingest_excel(content: bytes, filename: Optional[str], optimize: bool) -> Tuple[Dict[str, pd.DataFrame], List[DtypeOptimizationReport]]:
+    sheets = read_excel_sheets(io.BytesIO(content), filename)
+    if not sheets:
+        raise ValueError("workbook contains no sheets")
+    if not optimize:
+        return sheets, []
+    
+    reports = []
+    for name, sheet_df in sheets.items():
+        sheets[name], report = optimize_dtypes(sheet_df)
+        reports.append(report)
+    return sheets, reports
+
+def _ingest_columnar(content: bytes, file_format: FileFormat, columns: Optional[List[str]], optimize: bool, max_bytes: int) -> Tuple[pd.DataFrame, Optional[DtypeOptimizationReport]]:
+    if file_format == FileFormat.PARQUET:
+        return read_parquet(content, columns, max_bytes), None
+    if file_format == FileFormat.FEATHER:
+        return read_feather(content, columns, max_bytes), None
+    
+    # JSON values carry no schema, so they get the same treatment as CSV text
+    df = read_ndjson(content, columns, max_bytes)
+    if not optimize:
+        return df, None
+    return optimize_dtypes(df)
+
+def _analyse_sheet(sheet_name: str, df: pd.DataFrame) -> SheetAnalysis:
+    return SheetAnalysis(
+        sheet_name=sheet_name,
+        rows=len(df),
+        columns=len(df.columns),
+        headers=[str(col) for col in df.columns],
+        sample_data=extract_sample_data(df),
+        column_types={str(col): str(dtype) for col, dtype in df.dtypes.items()},
+        missing_values=int(df.isnull().sum().sum())
+    )
\ No newline at end of file
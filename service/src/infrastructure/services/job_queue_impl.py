@@ -0,0 +1,166 @@
+import asyncio
+import dataclasses
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ...entities.analysis_job import AnalysisJob
+from ...enums.job_status import AnalysisStage, JobStatus
+from ...services.job_queue import JobQueueInterface, JobRunner
+
+# Fraction of the job done when each stage starts
+_STAGE_PROGRESS = {stage: i / len(AnalysisStage) for i, stage in enumerate(AnalysisStage)}
+
+class JobQueueImpl(JobQueueInterface):
+    """In-process queue of analysis jobs served by a fixed set of workers.
+
+    Jobs belong to the queue rather than to the HTTP request that created
+    them, so a client that disconnects can come back for the result.
+    ``max_concurrent`` caps how many analyses (and therefore LLM calls) run
+    at once regardless of how many requests the server accepts, and at most
+    ``max_queued`` jobs may wait. Finished jobs are kept for
+    ``result_ttl_seconds``.
+
+    Workers run on the event loop that submits the first job; progress
+    callbacks must be called from that loop.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queued: int = 100, result_ttl_seconds: int = 60 * 60):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.result_ttl_seconds = result_ttl_seconds
+
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._runners: Dict[str, JobRunner] = {}
+        # Replaced on every update; subscribers wait on the one they last saw
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0
+        }
+
+    async def submit(self, file_name: str, runner: JobRunner) -> AnalysisJob:
+        """Queue an analysis and return its job immediately"""
+        self._ensure_workers()
+        self._purge_expired()
+        if self._queue.qsize() >= self.max_queued:
+            self._stats["rejected"] += 1
+            raise ValueError(f"Too many queued analyses ({self.max_queued}); try again later")
+
+        now = datetime.now()
+        job = AnalysisJob(
+            job_id=uuid.uuid4().hex,
+            file_name=file_name,
+            status=JobStatus.QUEUED,
+            created_at=now,
+            updated_at=now
+        )
+        self._jobs[job.job_id] = job
+        self._runners[job.job_id] = runner
+        self._changed[job.job_id] = asyncio.Event()
+        self._stats["submitted"] += 1
+        self._queue.put_nowait(job.job_id)
+        return dataclasses.replace(job)
+
+    def get_job(self, job_id: str) -> Optional[AnalysisJob]:
+        """Return a snapshot of the job, or None if unknown or expired"""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        return dataclasses.replace(job) if job else None
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[AnalysisJob]:
+        """Yield a snapshot now and after every change until the job ends"""
+        while True:
+            changed = self._changed.get(job_id)
+            job = self._jobs.get(job_id)
+            if job is None or changed is None:
+                return
+            yield dataclasses.replace(job)
+            if job.status.is_finished:
+                return
+            await changed.wait()
+
+    async def shutdown(self) -> None:
+        """Stop the workers; queued and running jobs are abandoned"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return job counters and current queue depth"""
+        stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize() if self._queue else 0
+        stats["running"] = sum(1 for job in self._jobs.values() if job.status == JobStatus.RUNNING)
+        stats["retained"] = len(self._jobs)
+        stats["max_concurrent"] = self.max_concurrent
+        return stats
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._workers and self._workers[0].get_loop() is loop and not self._workers[0].done():
+            return
+        # First use, or the previous loop has gone away
+        self._queue = asyncio.Queue()
+        self._workers = [loop.create_task(self._worker()) for _ in range(self.max_concurrent)]
+        for job_id, job in self._jobs.items():
+            if job.status == JobStatus.QUEUED:
+                self._queue.put_nowait(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        runner = self._runners.pop(job_id, None)
+        if runner is None:
+            return
+        self._update(job_id, status=JobStatus.RUNNING)
+
+        def report(stage: AnalysisStage) -> None:
+            self._update(job_id, stage=stage, progress=_STAGE_PROGRESS[stage])
+
+        try:
+            analysis, chat_session = await runner(report)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Analysis job {job_id} failed: {e}")
+            self._stats["failed"] += 1
+            self._update(job_id, status=JobStatus.FAILED, error=str(e), finished_at=datetime.now())
+            return
+
+        self._stats["completed"] += 1
+        self._update(job_id, status=JobStatus.COMPLETED, progress=1.0, result=analysis, chat_session=chat_session, finished_at=datetime.now())
+
+    def _update(self, job_id: str, **changes) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.updated_at = datetime.now()
+
+        changed = self._changed.get(job_id)
+        self._changed[job_id] = asyncio.Event()
+        if changed is not None:
+            changed.set()
+
+    def _purge_expired(self) -> None:
+        cutoff = datetime.now() - timedelta(seconds=self.result_ttl_seconds)
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+            self._changed.pop(job_id, None)
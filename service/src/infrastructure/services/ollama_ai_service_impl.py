@@ -1,82 +1,83 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from typing import List
+from typing import List, Optional
 import json
 from ...clients.ollama_client import OllamaClient
-from ...services.ai_service import AIServiceInterface
+from ...services.ai_service import AIServiceInterface, FallbackOutput
+from ...entities.data_profile import DataProfile
+from ..executor import DataFrameExecutor, offload
+from .data_profiler import profile_dataframe, profile_summary
 
 class OllamaAIServiceImpl(AIServiceInterface):
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.1:8b"):
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.1:8b", executor: Optional[DataFrameExecutor] = None, max_concurrent_requests: int = 4):
         """
         Initialize Ollama AI Service
         
         Args:
             base_url: Ollama server URL (default: http://localhost:11434)
             model: Model to use (default: llama3.1:8b)
+            executor: Pool used to summarise DataFrames off the event loop
+            max_concurrent_requests: Requests allowed in flight to the provider at once
         """
         self.base_url = base_url
         self.model = model
+        self.executor = executor
+        self.max_concurrent_requests = max_concurrent_requests
+        # Shared by every caller, so a batch of uploads queues for the provider
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        # Requests wait for a slot on these threads, never on the default executor
+        # that file, cache and session store work shares
+        self.request_executor = ThreadPoolExecutor(max_workers=max_concurrent_requests, thread_name_prefix="ollama-request")
         
         # Initialize Ollama client
         self.client = OllamaClient(base_url=base_url, model=model)
     
-    def _make_api_request(self, messages: List[dict], max_tokens: int = 1000, stream: bool = False):
+    def _make_api_request(self, messages: List[dict], max_tokens: int = 1000):
         """Make synchronous request using Ollama"""
         try:
-            response = self.client.chat(
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=0.7,
-                stream=stream
-            )
+            with self._request_slots:
+                response = self.client.chat(
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.7
+                )
             return response
         except Exception as e:
             raise Exception(f"Ollama API error: {str(e)}")
     
+    def _stream_api_request(self, messages: List[dict], max_tokens: int = 1000):
+        """Yield streamed chunks; the request slot is held until the stream ends or is closed"""
+        with self._request_slots:
+            try:
+                chunks = self.client.chat(
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.7,
+                    stream=True
+                )
+            except Exception as e:
+                raise Exception(f"Ollama API error: {str(e)}")
+            yield from chunks
+    
     def make_api_request(self, messages: List[dict], max_tokens: int = 1000) -> str:
         """Public method to make API requests"""
         return self._make_api_request(messages, max_tokens)
     
     def make_streaming_api_request(self, messages: List[dict], max_tokens: int = 1000):
         """Public method to make streaming API requests"""
-        return self._make_api_request(messages, max_tokens, stream=True)
+        return self._stream_api_request(messages, max_tokens)
     
-    def _get_data_summary(self, df: pd.DataFrame) -> str:
+    @staticmethod
+    def _get_data_summary(df: pd.DataFrame, profile: Optional[DataProfile] = None) -> str:
         """Get a concise summary of the dataframe structure"""
-        summary = {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "columns": {}
-        }
-        
-        for col in df.columns:
-            col_info = {
-                "type": str(df[col].dtype),
-                "non_null_count": int(df[col].count()),
-                "null_count": int(df[col].isnull().sum())
-            }
-            
-            if df[col].dtype in ['int64', 'float64']:
-                if not df[col].empty and df[col].notna().any():
-                    col_info.update({
-                        "min": float(df[col].min()),
-                        "max": float(df[col].max()),
-                        "mean": float(df[col].mean()),
-                        "std": float(df[col].std()) if df[col].std() == df[col].std() else 0  # Handle NaN
-                    })
-            elif df[col].dtype == 'object':
-                col_info.update({
-                    "unique_count": int(df[col].nunique()),
-                    "most_common": str(df[col].mode().iloc[0]) if not df[col].mode().empty else "N/A"
-                })
-            
-            summary["columns"][col] = col_info
-        
-        return json.dumps(summary, indent=2)
+        return json.dumps(profile_summary(profile or profile_dataframe(df)), indent=2)
     
-    async def generate_insights(self, df: pd.DataFrame, file_name: str) -> List[str]:
+    async def generate_insights(self, df: pd.DataFrame, file_name: str, profile: Optional[DataProfile] = None) -> List[str]:
         """Generate AI-powered insights about the data using Ollama"""
         try:
-            data_summary = self._get_data_summary(df)
+            data_summary = await offload(self.executor, self._get_data_summary, df, profile)
             
             prompt = f"""
             Analyze the following dataset summary and provide 4 key insights about the data.
@@ -104,7 +105,7 @@ class OllamaAIServiceImpl(AIServiceInterface):
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, max_tokens=500)
+            response = await asyncio.get_running_loop().run_in_executor(self.request_executor, self._make_api_request, messages, 500)
             
             # Parse the response into individual insights
             insights = []
@@ -124,7 +125,7 @@ class OllamaAIServiceImpl(AIServiceInterface):
         except Exception as e:
             # Fallback to basic insights if AI service fails
             print(f"Ollama AI service failed, using fallback: {e}")
-            return self._generate_fallback_insights(df)
+            return FallbackOutput(self._generate_fallback_insights(df))
     
     def _generate_fallback_insights(self, df: pd.DataFrame) -> List[str]:
         """Fallback method that generates basic insights without AI"""
@@ -143,7 +144,7 @@ class OllamaAIServiceImpl(AIServiceInterface):
             insights.append("Data quality: No missing values detected - clean dataset ready for analysis")
         
         # Numeric analysis
-        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
+        numeric_cols = df.select_dtypes(include=['number']).columns
         if len(numeric_cols) > 0:
             col = numeric_cols[0]
             if df[col].notna().any():
@@ -154,7 +155,7 @@ class OllamaAIServiceImpl(AIServiceInterface):
                 insights.append(f"Numeric column {col} contains only missing values")
         
         # Categorical analysis
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
         if len(categorical_cols) > 0:
             col = categorical_cols[0]
             unique_count = df[col].nunique()
@@ -169,10 +170,10 @@ class OllamaAIServiceImpl(AIServiceInterface):
         
         return insights[:4]
     
-    async def generate_sample_questions(self, df: pd.DataFrame, headers: List[str]) -> List[str]:
+    async def generate_sample_questions(self, df: pd.DataFrame, headers: List[str], profile: Optional[DataProfile] = None) -> List[str]:
         """Generate AI-powered sample questions based on the data structure using Ollama"""
         try:
-            data_summary = self._get_data_summary(df)
+            data_summary = await offload(self.executor, self._get_data_summary, df, profile)
             
             prompt = f"""
             Based on the following dataset structure, generate 5 specific, actionable questions that would be valuable for data analysis.
@@ -200,7 +201,7 @@ class OllamaAIServiceImpl(AIServiceInterface):
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, max_tokens=400)
+            response = await asyncio.get_running_loop().run_in_executor(self.request_executor, self._make_api_request, messages, 400)
             
             # Parse the response into individual questions
             questions = []
@@ -225,15 +226,15 @@ class OllamaAIServiceImpl(AIServiceInterface):
         except Exception as e:
             # Fallback to basic questions if AI service fails
             print(f"Ollama AI service failed, using fallback: {e}")
-            return self._generate_fallback_questions(df, headers)
+            return FallbackOutput(self._generate_fallback_questions(df, headers))
     
     def _generate_fallback_questions(self, df: pd.DataFrame, headers: List[str]) -> List[str]:
         """Fallback method that generates basic questions without AI"""
         questions = []
         
         # Analyze column types
-        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
         date_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
         
         # Add potential date columns
@@ -274,4 +275,5 @@ class OllamaAIServiceImpl(AIServiceInterface):
     
     def close(self):
         """Close the client connection"""
+        self.request_executor.shutdown(wait=False, cancel_futures=True)
         self.client.close() 
\ No newline at end of file
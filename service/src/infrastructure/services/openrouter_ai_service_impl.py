@@ -1,11 +1,17 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from typing import List
+from typing import List, Optional
 import json
 from ...clients.openrouter_client import OpenRouterClient
-from ...services.ai_service import AIServiceInterface
+from ...services.ai_service import AIServiceInterface, FallbackOutput
+from ...entities.data_profile import DataProfile
+from ..executor import DataFrameExecutor, offload
+from .data_profiler import profile_dataframe, profile_summary
 
 class OpenRouterAIServiceImpl(AIServiceInterface):
-    def __init__(self, api_key: str, model: str = "deepseek/deepseek-chat-v3-0324:free"):
+    def __init__(self, api_key: str, model: str = "deepseek/deepseek-chat-v3-0324:free", executor: Optional[DataFrameExecutor] = None, max_concurrent_requests: int = 4):
         """
         Initialize OpenRouter AI Service using OpenAI SDK
         
@@ -14,9 +20,18 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
             model: Model to use (default: anthropic/claude-3.5-sonnet)
                    Other options: openai/gpt-4, openai/gpt-3.5-turbo, 
                    meta-llama/llama-2-70b-chat, etc.
+            executor: Pool used to summarise DataFrames off the event loop
+            max_concurrent_requests: Requests allowed in flight to the provider at once
         """
         self.api_key = api_key
         self.model = model
+        self.executor = executor
+        self.max_concurrent_requests = max_concurrent_requests
+        # Shared by every caller, so a batch of uploads queues for the provider
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        # Requests wait for a slot on these threads, never on the default executor
+        # that file, cache and session store work shares
+        self.request_executor = ThreadPoolExecutor(max_workers=max_concurrent_requests, thread_name_prefix="openrouter-request")
         
         # Initialize OpenAI client with OpenRouter base URL
         self.client = OpenRouterClient(api_key=api_key, model=model)
@@ -24,11 +39,12 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
     def _make_api_request(self, messages: List[dict], max_tokens: int = 1000) -> str:
         """Make synchronous request using OpenAI SDK"""
         try:
-            response = self.client.chat(
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
+            with self._request_slots:
+                response = self.client.chat(
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.7
+                )
             return response
         except Exception as e:
             raise Exception(f"OpenRouter API error: {str(e)}")
@@ -44,43 +60,15 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
         response = self._make_api_request(messages, max_tokens)
         yield response
     
-    def _get_data_summary(self, df: pd.DataFrame) -> str:
+    @staticmethod
+    def _get_data_summary(df: pd.DataFrame, profile: Optional[DataProfile] = None) -> str:
         """Get a concise summary of the dataframe structure"""
-        summary = {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "columns": {}
-        }
-        
-        for col in df.columns:
-            col_info = {
-                "type": str(df[col].dtype),
-                "non_null_count": int(df[col].count()),
-                "null_count": int(df[col].isnull().sum())
-            }
-            
-            if df[col].dtype in ['int64', 'float64']:
-                if not df[col].empty and df[col].notna().any():
-                    col_info.update({
-                        "min": float(df[col].min()),
-                        "max": float(df[col].max()),
-                        "mean": float(df[col].mean()),
-                        "std": float(df[col].std()) if df[col].std() == df[col].std() else 0  # Handle NaN
-                    })
-            elif df[col].dtype == 'object':
-                col_info.update({
-                    "unique_count": int(df[col].nunique()),
-                    "most_common": str(df[col].mode().iloc[0]) if not df[col].mode().empty else "N/A"
-                })
-            
-            summary["columns"][col] = col_info
-        
-        return json.dumps(summary, indent=2)
+        return json.dumps(profile_summary(profile or profile_dataframe(df)), indent=2)
     
-    async def generate_insights(self, df: pd.DataFrame, file_name: str) -> List[str]:
+    async def generate_insights(self, df: pd.DataFrame, file_name: str, profile: Optional[DataProfile] = None) -> List[str]:
         """Generate AI-powered insights about the data"""
         try:
-            data_summary = self._get_data_summary(df)
+            data_summary = await offload(self.executor, self._get_data_summary, df, profile)
             
             prompt = f"""
             Analyze the following dataset summary and provide 4 key insights about the data.
@@ -108,7 +96,7 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, max_tokens=500)
+            response = await asyncio.get_running_loop().run_in_executor(self.request_executor, self._make_api_request, messages, 500)
             
             # Parse the response into individual insights
             insights = []
@@ -128,7 +116,7 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
         except Exception as e:
             # Fallback to basic insights if AI service fails
             print(f"AI service failed, using fallback: {e}")
-            return self._generate_fallback_insights(df)
+            return FallbackOutput(self._generate_fallback_insights(df))
     
     def _generate_fallback_insights(self, df: pd.DataFrame) -> List[str]:
         """Fallback method that generates basic insights without AI"""
@@ -147,7 +135,7 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
             insights.append("Data quality: No missing values detected - clean dataset ready for analysis")
         
         # Numeric analysis
-        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
+        numeric_cols = df.select_dtypes(include=['number']).columns
         if len(numeric_cols) > 0:
             col = numeric_cols[0]
             if df[col].notna().any():
@@ -158,7 +146,7 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
                 insights.append(f"Numeric column {col} contains only missing values")
         
         # Categorical analysis
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
         if len(categorical_cols) > 0:
             col = categorical_cols[0]
             unique_count = df[col].nunique()
@@ -173,10 +161,10 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
         
         return insights[:4]
     
-    async def generate_sample_questions(self, df: pd.DataFrame, headers: List[str]) -> List[str]:
+    async def generate_sample_questions(self, df: pd.DataFrame, headers: List[str], profile: Optional[DataProfile] = None) -> List[str]:
         """Generate AI-powered sample questions based on the data structure"""
         try:
-            data_summary = self._get_data_summary(df)
+            data_summary = await offload(self.executor, self._get_data_summary, df, profile)
             
             prompt = f"""
             Based on the following dataset structure, generate 5 specific, actionable questions that would be valuable for data analysis.
@@ -204,7 +192,7 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
                 {"role": "user", "content": prompt}
             ]
             
-            response = self._make_api_request(messages, max_tokens=400)
+            response = await asyncio.get_running_loop().run_in_executor(self.request_executor, self._make_api_request, messages, 400)
             
             # Parse the response into individual questions
             questions = []
@@ -229,15 +217,15 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
         except Exception as e:
             # Fallback to basic questions if AI service fails
             print(f"AI service failed, using fallback: {e}")
-            return self._generate_fallback_questions(df, headers)
+            return FallbackOutput(self._generate_fallback_questions(df, headers))
     
     def _generate_fallback_questions(self, df: pd.DataFrame, headers: List[str]) -> List[str]:
         """Fallback method that generates basic questions without AI"""
         questions = []
         
         # Analyze column types
-        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
         date_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
         
         # Add potential date columns
@@ -278,4 +266,5 @@ class OpenRouterAIServiceImpl(AIServiceInterface):
     
     def close(self):
         """Close the client connection"""
+        self.request_executor.shutdown(wait=False, cancel_futures=True)
         self.client.close()
\ No newline at end of file
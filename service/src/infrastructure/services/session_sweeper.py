@@ -0,0 +1,18 @@
+import asyncio
+from typing import Optional
+from ...repositories.chat_session_repository import ChatSessionRepositoryInterface
+from ...services.dataset_store import DatasetStoreInterface
+
+async def sweep_sessions(repository: ChatSessionRepositoryInterface, interval_seconds: float, dataset_store: Optional[DatasetStoreInterface] = None) -> None:
+    """Evict idle chat sessions and demote idle datasets every ``interval_seconds`` until cancelled"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await repository.evict()
+        except Exception as e:
+            print(f"Error evicting chat sessions: {e}")
+        if dataset_store is not None:
+            try:
+                await asyncio.to_thread(dataset_store.demote_idle)
+            except Exception as e:
+                print(f"Error demoting idle datasets: {e}")
@@ -0,0 +1,279 @@
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ...entities.upload_session import UploadSession
+from ...services.upload_service import UploadServiceInterface
+
+# Upload ids become file names, so only accept what create_upload hands out
+_UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+class UploadServiceImpl(UploadServiceInterface):
+    """Resumable uploads assembled on disk from byte-range chunks.
+
+    Each upload is a preallocated ``<id>.part`` file plus a ``<id>.json``
+    manifest of the ranges received so far, so a client whose connection
+    dropped (or a restarted server) can tell what is missing and only that
+    is resent. Chunks may arrive out of order and in parallel; each is
+    written in place with ``os.pwrite``. The SHA-256 is advanced whenever
+    the contiguous prefix grows, so it is ready as soon as the last byte
+    lands instead of needing another pass over the file.
+    """
+
+    def __init__(self, upload_dir: str, max_upload_size: int = 1024 * 1024 * 1024, ttl_seconds: int = 24 * 60 * 60):
+        self.upload_dir = upload_dir
+        self.max_upload_size = max_upload_size
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(upload_dir, exist_ok=True)
+
+        self._sessions: Dict[str, UploadSession] = {}
+        # upload_id -> [sha256 of the hashed prefix, length of that prefix]
+        self._hashers: Dict[str, list] = {}
+        self._hash_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "uploads_created": 0,
+            "uploads_deleted": 0,
+            "uploads_expired": 0,
+            "chunks_received": 0,
+            "bytes_received": 0
+        }
+
+    def create_upload(self, file_name: str, total_size: int, checksum: Optional[str] = None) -> UploadSession:
+        """Reserve space for a new upload and return its session"""
+        if total_size <= 0:
+            raise ValueError("Upload size must be positive")
+        if total_size > self.max_upload_size:
+            raise ValueError(f"File too large. Maximum size: {self.max_upload_size / (1024*1024)}MB")
+        self._purge_expired()
+
+        now = datetime.now()
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            file_name=file_name,
+            total_size=total_size,
+            created_at=now,
+            last_updated=now,
+            checksum=checksum.lower() if checksum else None
+        )
+        # Sparse file of the final size, so chunks can land at any offset
+        with open(self._part_path(session.upload_id), "wb") as f:
+            f.truncate(total_size)
+
+        with self._lock:
+            self._sessions[session.upload_id] = session
+            self._stats["uploads_created"] += 1
+            self._save_manifest(session)
+        return _snapshot(session)
+
+    def write_chunk(self, upload_id: str, offset: int, data: bytes) -> UploadSession:
+        """Store ``data`` at ``offset``; resending a range is harmless"""
+        session = self.get_upload(upload_id)
+        if session is None:
+            raise ValueError(f"Upload not found: {upload_id}")
+        end = offset + len(data)
+        if offset < 0 or end > session.total_size:
+            raise ValueError(f"Chunk [{offset}, {end}) is outside the upload size of {session.total_size} bytes")
+
+        fd = os.open(self._part_path(upload_id), os.O_WRONLY)
+        try:
+            view = memoryview(data)
+            position = offset
+            while view:
+                written = os.pwrite(fd, view, position)
+                view = view[written:]
+                position += written
+        finally:
+            os.close(fd)
+
+        with self._lock:
+            session = self._sessions.get(upload_id)
+            if session is None:
+                raise ValueError(f"Upload not found: {upload_id}")
+            session.received_ranges = _merge_range(session.received_ranges, offset, end)
+            session.received_bytes = sum(stop - start for start, stop in session.received_ranges)
+            session.complete = session.received_bytes == session.total_size
+            session.last_updated = datetime.now()
+            self._stats["chunks_received"] += 1
+            self._stats["bytes_received"] += len(data)
+            self._save_manifest(session)
+            snapshot = _snapshot(session)
+
+        self._advance_hash(upload_id)
+        return snapshot
+
+    def get_upload(self, upload_id: str) -> Optional[UploadSession]:
+        """Return the upload's current state, or None if it does not exist"""
+        if not _UPLOAD_ID.fullmatch(upload_id or ""):
+            return None
+        with self._lock:
+            session = self._sessions.get(upload_id)
+            if session is None:
+                # Resume uploads started before a restart
+                session = self._load_manifest(upload_id)
+                if session is None:
+                    return None
+                self._sessions[upload_id] = session
+            return _snapshot(session)
+
+    def get_checksum(self, upload_id: str) -> str:
+        """Return the SHA-256 of a complete upload"""
+        session = self._require_complete(upload_id)
+        self._advance_hash(upload_id)
+        with self._hash_lock(upload_id):
+            hasher, hashed = self._hashers[upload_id]
+            if hashed != session.total_size:
+                raise ValueError("Upload changed while computing its checksum")
+            return hasher.hexdigest()
+
+    def read_upload(self, upload_id: str) -> bytes:
+        """Return the assembled bytes of a complete upload"""
+        self._require_complete(upload_id)
+        with open(self._part_path(upload_id), "rb") as f:
+            return f.read()
+
+    def delete_upload(self, upload_id: str) -> bool:
+        """Remove an upload and its files"""
+        if not _UPLOAD_ID.fullmatch(upload_id or ""):
+            return False
+        with self._lock:
+            self._sessions.pop(upload_id, None)
+            self._hashers.pop(upload_id, None)
+            self._hash_locks.pop(upload_id, None)
+            removed = self._remove_files(upload_id)
+            if removed:
+                self._stats["uploads_deleted"] += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return upload counters and the number of open uploads"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active_uploads"] = len(self._sessions)
+        return stats
+
+    def _require_complete(self, upload_id: str) -> UploadSession:
+        session = self.get_upload(upload_id)
+        if session is None:
+            raise ValueError(f"Upload not found: {upload_id}")
+        if not session.complete:
+            raise ValueError(f"Upload is incomplete: {session.received_bytes} of {session.total_size} bytes received")
+        return session
+
+    def _hash_lock(self, upload_id: str) -> threading.Lock:
+        with self._lock:
+            return self._hash_locks.setdefault(upload_id, threading.Lock())
+
+    def _advance_hash(self, upload_id: str) -> None:
+        """Feed newly contiguous bytes into the upload's running hash"""
+        with self._hash_lock(upload_id):
+            with self._lock:
+                session = self._sessions.get(upload_id)
+                if session is None:
+                    return
+                prefix = _contiguous_prefix(session.received_ranges)
+                state = self._hashers.setdefault(upload_id, [hashlib.sha256(), 0])
+            if prefix <= state[1]:
+                return
+
+            with open(self._part_path(upload_id), "rb") as f:
+                f.seek(state[1])
+                while state[1] < prefix:
+                    block = f.read(min(_HASH_BLOCK_SIZE, prefix - state[1]))
+                    if not block:
+                        break
+                    state[0].update(block)
+                    state[1] += len(block)
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, upload_id + ".part")
+
+    def _manifest_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, upload_id + ".json")
+
+    def _save_manifest(self, session: UploadSession) -> None:
+        path = self._manifest_path(session.upload_id)
+        manifest = dataclasses.asdict(session)
+        manifest["created_at"] = session.created_at.isoformat()
+        manifest["last_updated"] = session.last_updated.isoformat()
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def _load_manifest(self, upload_id: str) -> Optional[UploadSession]:
+        try:
+            with open(self._manifest_path(upload_id)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading upload manifest {upload_id}: {e}")
+            return None
+        if not os.path.exists(self._part_path(upload_id)):
+            return None
+        manifest["created_at"] = datetime.fromisoformat(manifest["created_at"])
+        manifest["last_updated"] = datetime.fromisoformat(manifest["last_updated"])
+        return UploadSession(**manifest)
+
+    def _remove_files(self, upload_id: str) -> bool:
+        removed = False
+        for path in (self._part_path(upload_id), self._manifest_path(upload_id)):
+            try:
+                os.remove(path)
+                removed = True
+            except OSError:
+                pass
+        return removed
+
+    def _purge_expired(self) -> None:
+        """Drop uploads that have not received a chunk within the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        try:
+            entries = list(os.scandir(self.upload_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            upload_id, suffix = os.path.splitext(entry.name)
+            if suffix != ".json" or not _UPLOAD_ID.fullmatch(upload_id):
+                continue
+            try:
+                expired = entry.stat().st_mtime < cutoff
+            except FileNotFoundError:
+                continue
+            if expired:
+                with self._lock:
+                    self._sessions.pop(upload_id, None)
+                    self._hashers.pop(upload_id, None)
+                    self._hash_locks.pop(upload_id, None)
+                    if self._remove_files(upload_id):
+                        self._stats["uploads_expired"] += 1
+
+def _merge_range(ranges: List[List[int]], start: int, end: int) -> List[List[int]]:
+    """Insert [start, end) into sorted, non-overlapping ranges"""
+    if start >= end:
+        return ranges
+    merged = []
+    for range_start, range_end in sorted(ranges + [[start, end]]):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    return merged
+
+def _contiguous_prefix(ranges: List[List[int]]) -> int:
+    """Number of bytes received without a gap from the start of the file"""
+    if ranges and ranges[0][0] == 0:
+        return ranges[0][1]
+    return 0
+
+def _snapshot(session: UploadSession) -> UploadSession:
+    return dataclasses.replace(session, received_ranges=[list(r) for r in session.received_ranges])
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# Chunks a stream may run ahead of its consumer before the provider thread waits
+DEFAULT_MAX_BUFFERED = 64
+
+class _Done:
+    pass
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+async def iterate_in_thread(make_iterator: Callable[[], Iterable[T]], max_buffered: int = DEFAULT_MAX_BUFFERED) -> AsyncIterator[T]:
+    """Iterate a blocking iterator without blocking the event loop.
+
+    ``make_iterator`` is called and iterated on a thread of its own (so
+    connecting to the provider does not block either), and each item is
+    handed over through a queue of ``max_buffered`` items. When the queue
+    is full the thread waits, so a slow client holds back the provider
+    instead of buffering its whole answer. Errors are raised here; closing
+    this generator early stops the thread and closes its iterator.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        if stopped.is_set():
+            return False
+        try:
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        except (RuntimeError, asyncio.CancelledError):
+            # The loop closed or the consumer went away
+            return False
+        return not stopped.is_set()
+
+    def pump() -> None:
+        iterator = None
+        try:
+            iterator = iter(make_iterator())
+            for item in iterator:
+                if not put(item):
+                    break
+            else:
+                put(_Done())
+        except BaseException as e:
+            put(_Failed(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    # Not the shared executor: a stream holds its thread for the whole answer
+    threading.Thread(target=pump, name="stream-pump", daemon=True).start()
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+        # Unblock a put waiting on a full queue so the thread sees the stop
+        while not queue.empty():
+            queue.get_nowait()
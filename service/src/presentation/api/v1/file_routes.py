@@ -1,47 +1,46 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
-from typing import Any, Dict
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ....application.use_cases.batch_analysis_use_case import BatchAnalysisUseCase
 from ....application.use_cases.file_upload_use_case import FileUploadUseCase
 from ....application.use_cases.chat_use_case import ChatUseCase
-from ....infrastructure.dependencies import get_file_service, get_ai_service, get_chat_service
+from ....infrastructure.dependencies import get_analysis_cache, get_dataset_store, get_file_service, get_ai_service, get_chat_service, get_fast_answer
 from ....infrastructure.config import get_settings
+from ....entities.chat_message import ChatSession
+from ....entities.file_analysis import FileAnalysis
+from ....enums.file_format import Compression, FileFormat
+from ....infrastructure.services.decompression import extract_archive
 
 router = APIRouter()
 
 def get_file_upload_use_case(
     file_service=Depends(get_file_service),
-    ai_service=Depends(get_ai_service)
+    ai_service=Depends(get_ai_service),
+    analysis_cache=Depends(get_analysis_cache)
 ):
-    return FileUploadUseCase(file_service, ai_service)
+    return FileUploadUseCase(file_service, ai_service, analysis_cache)
 
 def get_chat_use_case(
     chat_service=Depends(get_chat_service),
-    file_service=Depends(get_file_service)
+    file_service=Depends(get_file_service),
+    dataset_store=Depends(get_dataset_store),
+    fast_answer=Depends(get_fast_answer)
 ):
-    return ChatUseCase(chat_service, file_service)
+    return ChatUseCase(chat_service, file_service, dataset_store, fast_answer)
 
 @router.post("/analysis-upload-file", response_model=Dict[str, Any])
 async def upload_file(
     file: UploadFile = File(...),
+    force_refresh: bool = False,
     use_case: FileUploadUseCase = Depends(get_file_upload_use_case),
     chat_use_case: ChatUseCase = Depends(get_chat_use_case),
     settings = Depends(get_settings)
 ):
-    """Upload and analyze CSV or Excel files"""
-    
-    # Validate file extension
-    if not any(file.filename.lower().endswith(ext) for ext in settings.allowed_extensions):
-        raise HTTPException(
-            status_code=400,
-            detail=f"File type not supported. Allowed types: {', '.join(settings.allowed_extensions)}"
-        )
-    
-    # Validate file size
-    content = await file.read()
-    if len(content) > settings.max_file_size:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size: {settings.max_file_size / (1024*1024)}MB"
-        )
+    """Upload and analyze CSV or Excel files; force_refresh skips the cached analysis"""
+    content = await read_validated_upload(file, settings)
     
     try:
         # Create a file-like object from the content
@@ -49,42 +48,120 @@ async def upload_file(
         file_obj = io.BytesIO(content)
         
         # Process the file
-        analysis = await use_case.execute(file_obj, file.filename)
+        analysis = await use_case.execute(file_obj, file.filename, force_refresh)
         
-        # Create chat session if it's a CSV file
+        # Create chat session for single-table uploads
         chat_session = None
-        if file.filename.lower().endswith('.csv'):
+        if FileFormat.is_chat_supported(file.filename):
             try:
-                chat_session = await chat_use_case.create_session(file.filename)
+                chat_session = await chat_use_case.create_session(file.filename, content)
             except Exception as e:
                 print(f"Error creating chat session: {e}")
         
-        # Return the response in the requested format
-        response = {
-            "fileName": analysis.file_name,
-            "fileSize": analysis.file_size,
-            "rows": analysis.rows,
-            "columns": analysis.columns,
-            "headers": analysis.headers,
-            "sampleData": analysis.sample_data,
-            "insights": analysis.insights,
-            "sampleQuestions": analysis.sample_questions
-        }
-        
-        # Add chat session info if available
-        if chat_session:
-            response["chatSession"] = {
-                "sessionId": chat_session.session_id,
-                "fileName": chat_session.file_name,
-                "createdAt": chat_session.created_at.isoformat()
-            }
-        
-        return response
+        return build_analysis_response(analysis, chat_session)
         
     except Exception as e:
         print(f"Error processing file: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/analysis-upload-batch")
+async def upload_batch(
+    files: List[UploadFile] = File(...),
+    force_refresh: bool = False,
+    use_case: FileUploadUseCase = Depends(get_file_upload_use_case),
+    chat_use_case: ChatUseCase = Depends(get_chat_use_case),
+    settings = Depends(get_settings)
+):
+    """Analyze several files, or zips of them, streaming one JSON line per file as each finishes"""
+    batch = []
+    for file in files:
+        content = await read_validated_upload(file, settings)
+        if FileFormat.detect(file.filename)[1] == Compression.ZIP:
+            try:
+                batch.extend(extract_archive(content, settings.allowed_extensions, settings.max_decompressed_size))
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Error reading {file.filename}: {str(e)}")
+        else:
+            batch.append((file.filename, content))
+    
+    if len(batch) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many files. Maximum per batch: {settings.batch_max_files}"
+        )
+    
+    batch_use_case = BatchAnalysisUseCase(use_case, chat_use_case)
+    
+    async def generate_results():
+        async for result in batch_use_case.execute(batch, force_refresh):
+            line = {"index": result.index, "fileName": result.file_name}
+            if result.error is None:
+                line["status"] = "completed"
+                line["result"] = build_analysis_response(result.analysis, result.chat_session)
+            else:
+                line["status"] = "failed"
+                line["error"] = result.error
+            yield json.dumps(jsonable_encoder(line)) + "\n"
+    
+    return StreamingResponse(generate_results(), media_type="application/x-ndjson")
+
+async def read_validated_upload(file: UploadFile, settings) -> bytes:
+    """Check an upload's extension and size and return its content"""
+    
+    # Validate file extension
+    if not any(file.filename.lower().endswith(ext) for ext in settings.allowed_extensions):
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type not supported. Allowed types: {', '.join(settings.allowed_extensions)}"
+        )
+    
+    # Validate file size; reading one byte past the limit is enough to tell
+    content = await file.read(settings.max_file_size + 1)
+    if len(content) > settings.max_file_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size: {settings.max_file_size / (1024*1024)}MB"
+        )
+    return content
+
+def build_analysis_response(analysis: FileAnalysis, chat_session: Optional[ChatSession] = None) -> Dict[str, Any]:
+    """Shape a FileAnalysis into the upload endpoints' response"""
+    response = {
+        "fileName": analysis.file_name,
+        "fileSize": analysis.file_size,
+        "rows": analysis.rows,
+        "columns": analysis.columns,
+        "headers": analysis.headers,
+        "sampleData": analysis.sample_data,
+        "insights": analysis.insights,
+        "sampleQuestions": analysis.sample_questions
+    }
+    
+    # Add per-sheet results for workbooks
+    if analysis.sheets:
+        response["sheets"] = [
+            {
+                "sheetName": sheet.sheet_name,
+                "rows": sheet.rows,
+                "columns": sheet.columns,
+                "headers": sheet.headers,
+                "sampleData": sheet.sample_data,
+                "columnTypes": sheet.column_types,
+                "missingValues": sheet.missing_values
+            }
+            for sheet in analysis.sheets
+        ]
+    
+    # Add chat session info if available
+    if chat_session:
+        response["chatSession"] = {
+            "sessionId": chat_session.session_id,
+            "fileName": chat_session.file_name,
+            "createdAt": datetime.fromtimestamp(chat_session.created_at).isoformat()
+        }
+    
+    return response
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
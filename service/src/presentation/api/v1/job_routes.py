@@ -0,0 +1,89 @@
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+import json
+from typing import Any, Dict
+from ....application.use_cases.analysis_job_use_case import AnalysisJobUseCase
+from ....application.use_cases.chat_use_case import ChatUseCase
+from ....application.use_cases.file_upload_use_case import FileUploadUseCase
+from ....entities.analysis_job import AnalysisJob
+from ....infrastructure.dependencies import get_job_queue
+from ....infrastructure.config import get_settings
+from .file_routes import build_analysis_response, get_chat_use_case, get_file_upload_use_case, read_validated_upload
+
+router = APIRouter()
+
+def get_analysis_job_use_case(
+    job_queue=Depends(get_job_queue),
+    file_upload_use_case: FileUploadUseCase = Depends(get_file_upload_use_case),
+    chat_use_case: ChatUseCase = Depends(get_chat_use_case)
+):
+    return AnalysisJobUseCase(job_queue, file_upload_use_case, chat_use_case)
+
+def _job_response(job: AnalysisJob) -> Dict[str, Any]:
+    response = {
+        "jobId": job.job_id,
+        "fileName": job.file_name,
+        "status": job.status.value,
+        "stage": job.stage.value if job.stage else None,
+        "progress": job.progress,
+        "createdAt": job.created_at.isoformat(),
+        "updatedAt": job.updated_at.isoformat()
+    }
+    if job.finished_at:
+        response["finishedAt"] = job.finished_at.isoformat()
+    if job.result:
+        response["result"] = build_analysis_response(job.result, job.chat_session)
+    if job.error:
+        response["error"] = job.error
+    return response
+
+@router.post("/jobs", response_model=Dict[str, Any], status_code=202)
+async def create_analysis_job(
+    file: UploadFile = File(...),
+    force_refresh: bool = False,
+    use_case: AnalysisJobUseCase = Depends(get_analysis_job_use_case),
+    settings = Depends(get_settings)
+):
+    """Queue a file for analysis; poll /jobs/{job_id} or follow /jobs/{job_id}/events"""
+    content = await read_validated_upload(file, settings)
+    
+    try:
+        job = await use_case.submit(content, file.filename, force_refresh)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_analysis_job(
+    job_id: str,
+    use_case: AnalysisJobUseCase = Depends(get_analysis_job_use_case)
+):
+    """Get the status of a job, with its result once completed"""
+    job = use_case.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_analysis_job(
+    job_id: str,
+    use_case: AnalysisJobUseCase = Depends(get_analysis_job_use_case)
+):
+    """Server-sent events with the job state after every change"""
+    if use_case.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    async def generate_events():
+        # Disconnecting only ends this stream; the job keeps running
+        async for job in use_case.watch(job_id):
+            yield f"event: {job.status.value}\ndata: {json.dumps(jsonable_encoder(_job_response(job)))}\n\n"
+    
+    return StreamingResponse(
+        generate_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        }
+    )
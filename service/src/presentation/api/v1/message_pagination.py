@@ -0,0 +1,59 @@
+import math
+from datetime import datetime
+from typing import List, Optional
+from fastapi import HTTPException, Response
+from ....entities.chat_message import ChatMessage, MessageCursor
+
+# Browsers only let the client read these when CORS exposes them
+PAGINATION_HEADERS = ["X-Has-More", "X-Before-Cursor", "X-After-Cursor"]
+
+def parse_cursor(value: Optional[str], name: str) -> Optional[MessageCursor]:
+    """Parse a page cursor, or an ISO 8601 timestamp as sent in ``since``"""
+    if value is None:
+        return None
+    # Cursors are "<epoch timestamp>:<message id>"; older ones are just the timestamp
+    timestamp, _, message_id = value.partition(":")
+    try:
+        return MessageCursor(float(timestamp), message_id or None)
+    except ValueError:
+        pass
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: expected a page cursor or an ISO 8601 timestamp")
+    return MessageCursor(_last_time_at(moment))
+
+def _last_time_at(moment: datetime) -> float:
+    """The latest epoch timestamp that is shown as ``moment``.
+
+    Message times are sent at microsecond resolution, so a client passing
+    the last one back as ``since`` means every message shown at or before
+    it. The stored floats are finer than that; comparing them with the
+    parsed time alone would send the boundary message again.
+    """
+    # Naive timestamps are taken as server local time, like message times
+    shown = lambda timestamp: datetime.fromtimestamp(timestamp, moment.tzinfo)
+    timestamp = moment.timestamp() + 0.5e-6
+    while shown(timestamp) > moment:
+        timestamp = math.nextafter(timestamp, -math.inf)
+    while shown(math.nextafter(timestamp, math.inf)) <= moment:
+        timestamp = math.nextafter(timestamp, math.inf)
+    return timestamp
+
+def later_cursor(*cursors: Optional[MessageCursor]) -> Optional[MessageCursor]:
+    """The cursor furthest along of those given; a bare timestamp lies past every message at it"""
+    given = [cursor for cursor in cursors if cursor is not None]
+    return max(given, key=lambda cursor: (cursor.timestamp, cursor.message_id is None), default=None)
+
+def set_page_headers(response: Response, messages: List[ChatMessage], has_more: Optional[bool]) -> None:
+    """Return the cursors of the page's ends and, for limited pages, whether more follow"""
+    if has_more is not None:
+        response.headers["X-Has-More"] = "true" if has_more else "false"
+    if messages:
+        # Exact epoch timestamps (a rounded ISO string could re-include the boundary
+        # message) with the id that tells apart messages sharing a timestamp
+        response.headers["X-Before-Cursor"] = _format_cursor(messages[0])
+        response.headers["X-After-Cursor"] = _format_cursor(messages[-1])
+
+def _format_cursor(message: ChatMessage) -> str:
+    return f"{message.timestamp!r}:{message.id}"
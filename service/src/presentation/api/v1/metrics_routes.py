@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from typing import Any, Dict
+from ....infrastructure.dependencies import get_analysis_cache, get_chat_session_repository, get_dataset_store, get_executor, get_fast_answer, get_file_service, get_job_queue, get_query_engine, get_upload_service
+
+router = APIRouter()
+
+@router.get("/metrics", response_model=Dict[str, Any])
+async def get_metrics(
+    dataset_store=Depends(get_dataset_store),
+    file_service=Depends(get_file_service),
+    executor=Depends(get_executor),
+    upload_service=Depends(get_upload_service),
+    analysis_cache=Depends(get_analysis_cache),
+    job_queue=Depends(get_job_queue),
+    chat_sessions=Depends(get_chat_session_repository),
+    query_engine=Depends(get_query_engine),
+    fast_answer=Depends(get_fast_answer)
+):
+    """Cache and pipeline counters for monitoring"""
+    return {
+        "dataset_store": dataset_store.get_stats(),
+        "ingestion": file_service.get_stats(),
+        "executor": executor.get_stats(),
+        "uploads": upload_service.get_stats(),
+        "analysis_cache": analysis_cache.get_stats(),
+        "jobs": job_queue.get_stats(),
+        "chat_sessions": chat_sessions.get_stats(),
+        "query_engine": query_engine.get_stats() if query_engine is not None else {},
+        "fast_answers": fast_answer.get_stats()
+    }
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
-from typing import Any, Dict, List, Generator, Union
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
+from datetime import datetime
 from ....application.use_cases.chat_use_case import ChatUseCase
-from ....infrastructure.dependencies import get_ollama_chat_service, get_file_service
-from ....entities.chat_message import ChatMessage, ChatSession
+from ....infrastructure.dependencies import get_ollama_chat_service, get_dataset_store, get_file_service, get_fast_answer
+from ....enums.chat_mode import ChatMode
+from ....enums.file_format import FileFormat
+from ....infrastructure.config import get_settings
+from .file_routes import read_validated_upload
+from .message_pagination import later_cursor, parse_cursor, set_page_headers
 
 router = APIRouter()
 
@@ -27,9 +32,11 @@ class ChatSessionResponse(BaseModel):
 
 def get_ollama_chat_use_case(
     chat_service=Depends(get_ollama_chat_service),
-    file_service=Depends(get_file_service)
+    file_service=Depends(get_file_service),
+    dataset_store=Depends(get_dataset_store),
+    fast_answer=Depends(get_fast_answer)
 ):
-    return ChatUseCase(chat_service, file_service)
+    return ChatUseCase(chat_service, file_service, dataset_store, fast_answer)
 
 @router.post("/ollama-chat/create-session", response_model=ChatSessionResponse)
 async def create_ollama_chat_session(
@@ -39,21 +46,23 @@ async def create_ollama_chat_session(
     """Create a new chat session for a CSV file using Ollama AI"""
     
     # Validate file extension
-    if not file.filename.lower().endswith('.csv'):
+    if not FileFormat.is_chat_supported(file.filename):
         raise HTTPException(
             status_code=400,
-            detail="Only CSV files are supported for chat functionality"
+            detail="Only CSV, Parquet, Feather and JSON Lines files are supported for chat functionality"
         )
     
+    content = await read_validated_upload(file, get_settings())
+    
     try:
-        # Create chat session
-        session = await use_case.create_session(file.filename)
+        # Create chat session; the parsed file stays with it for later messages
+        session = await use_case.create_session(file.filename, content)
         
         return ChatSessionResponse(
             session_id=session.session_id,
             file_name=session.file_name,
-            created_at=session.created_at.isoformat(),
-            last_updated=session.last_updated.isoformat()
+            created_at=datetime.fromtimestamp(session.created_at).isoformat(),
+            last_updated=datetime.fromtimestamp(session.last_updated).isoformat()
         )
         
     except Exception as e:
@@ -63,24 +72,26 @@ async def create_ollama_chat_session(
 async def send_ollama_chat_message(
     session_id: str = Form(...),
     message: str = Form(...),
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    mode: ChatMode = Form(ChatMode.CHAT),
     use_case: ChatUseCase = Depends(get_ollama_chat_use_case)
 ):
     """Send a message to the chat and get Ollama AI response"""
     
-    # Validate file extension
-    if not file.filename.lower().endswith('.csv'):
+    # The file is optional once the session holds its data
+    if file is not None and not FileFormat.is_chat_supported(file.filename):
         raise HTTPException(
             status_code=400,
-            detail="Only CSV files are supported for chat functionality"
+            detail="Only CSV, Parquet, Feather and JSON Lines files are supported for chat functionality"
         )
     
+    content = await read_validated_upload(file, get_settings()) if file is not None else None
+    
     try:
-        # Read file content
-        content = await file.read()
+        filename = file.filename if file is not None else None
         
         # Send message and get response
-        response = await use_case.send_message(session_id, message, content, file.filename)
+        response = await use_case.send_message(session_id, message, content, filename, mode)
         
         return {
             "session_id": session_id,
@@ -97,24 +108,25 @@ async def send_ollama_chat_message(
 async def send_ollama_streaming_chat_message(
     session_id: str = Form(...),
     message: str = Form(...),
-    file: Union[UploadFile, None] = File(...),
+    file: Optional[UploadFile] = File(None),
     use_case: ChatUseCase = Depends(get_ollama_chat_use_case)
 ):
     """Send a message to the chat and get streaming Ollama AI response"""
     
-    # Validate file extension
-    if not file.filename.lower().endswith('.csv'):
+    # The file is optional once the session holds its data
+    if file is not None and not FileFormat.is_chat_supported(file.filename):
         raise HTTPException(
             status_code=400,
-            detail="Only CSV files are supported for chat functionality"
+            detail="Only CSV, Parquet, Feather and JSON Lines files are supported for chat functionality"
         )
     
+    content = await read_validated_upload(file, get_settings()) if file is not None else None
+    
     try:
-        # Read file content
-        content = await file.read()
+        filename = file.filename if file is not None else None
         
         # Send message and get streaming response
-        response_stream = use_case.send_streaming_message(session_id, message, content, file.filename)
+        response_stream = use_case.send_streaming_message(session_id, message, content, filename)
         
         async def generate_stream():
             async for chunk in response_stream:
@@ -138,19 +150,30 @@ async def send_ollama_streaming_chat_message(
 @router.get("/ollama-chat/session/{session_id}/messages", response_model=List[ChatMessageResponse])
 async def get_ollama_session_messages(
     session_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all messages when omitted"),
+    before: Optional[str] = Query(None, description="X-Before-Cursor of a page, to page back"),
+    after: Optional[str] = Query(None, description="X-After-Cursor of a page, to page forward"),
+    since: Optional[str] = Query(None, description="Only messages newer than this ISO 8601 timestamp"),
     use_case: ChatUseCase = Depends(get_ollama_chat_use_case)
 ):
-    """Get all messages for an Ollama chat session"""
+    """Get messages for an Ollama chat session, oldest first; page cursors are returned in headers"""
+    before_cursor = parse_cursor(before, "before")
+    after_cursor = later_cursor(parse_cursor(after, "after"), parse_cursor(since, "since"))
     
     try:
-        messages = await use_case.get_session_messages(session_id)
+        if limit is None:
+            messages, has_more = await use_case.get_session_messages(session_id, before=before_cursor, after=after_cursor), None
+        else:
+            messages, has_more = await use_case.get_message_page(session_id, limit, before_cursor, after_cursor)
+        set_page_headers(response, messages, has_more)
         
         return [
             ChatMessageResponse(
                 id=msg.id,
                 content=msg.content,
                 role=msg.role,
-                timestamp=msg.timestamp.isoformat(),
+                timestamp=datetime.fromtimestamp(msg.timestamp).isoformat(),
                 file_name=msg.file_name or ""
             )
             for msg in messages
@@ -175,8 +198,8 @@ async def get_ollama_session(
         return ChatSessionResponse(
             session_id=session.session_id,
             file_name=session.file_name,
-            created_at=session.created_at.isoformat(),
-            last_updated=session.last_updated.isoformat()
+            created_at=datetime.fromtimestamp(session.created_at).isoformat(),
+            last_updated=datetime.fromtimestamp(session.last_updated).isoformat()
         )
         
     except HTTPException:
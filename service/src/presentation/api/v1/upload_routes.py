@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from ....application.use_cases.chunked_upload_use_case import ChunkedUploadUseCase
+from ....entities.upload_session import UploadSession
+from ....infrastructure.dependencies import get_chunked_upload_use_case
+from ....infrastructure.config import get_settings
+from .file_routes import build_analysis_response
+
+router = APIRouter()
+
+class CreateUploadRequest(BaseModel):
+    file_name: str
+    total_size: int
+    sha256: Optional[str] = None
+
+class CompleteUploadRequest(BaseModel):
+    sha256: Optional[str] = None
+
+def _upload_response(session: UploadSession) -> Dict[str, Any]:
+    return {
+        "uploadId": session.upload_id,
+        "fileName": session.file_name,
+        "totalSize": session.total_size,
+        "receivedBytes": session.received_bytes,
+        "receivedRanges": session.received_ranges,
+        "missingRanges": _missing_ranges(session),
+        "complete": session.complete,
+        "lastUpdated": session.last_updated.isoformat()
+    }
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """Read the request body, rejecting it with 413 once it exceeds ``max_bytes``"""
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Chunk exceeds the remaining {max_bytes} bytes of the upload")
+    
+    body = bytearray()
+    async for part in request.stream():
+        body += part
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Chunk exceeds the remaining {max_bytes} bytes of the upload")
+    return bytes(body)
+
+def _missing_ranges(session: UploadSession) -> List[List[int]]:
+    missing = []
+    position = 0
+    for start, end in session.received_ranges:
+        if start > position:
+            missing.append([position, start])
+        position = end
+    if position < session.total_size:
+        missing.append([position, session.total_size])
+    return missing
+
+@router.post("/uploads", response_model=Dict[str, Any])
+async def create_upload(
+    request: CreateUploadRequest,
+    use_case: ChunkedUploadUseCase = Depends(get_chunked_upload_use_case),
+    settings = Depends(get_settings)
+):
+    """Start a resumable upload; send the file with PUT /uploads/{upload_id}"""
+    
+    # Validate file extension
+    if not any(request.file_name.lower().endswith(ext) for ext in settings.allowed_extensions):
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type not supported. Allowed types: {', '.join(settings.allowed_extensions)}"
+        )
+    
+    try:
+        session = await use_case.start(request.file_name, request.total_size, request.sha256)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    response = _upload_response(session)
+    response["chunkSize"] = settings.upload_chunk_size
+    return response
+
+@router.put("/uploads/{upload_id}", response_model=Dict[str, Any])
+async def upload_chunk(
+    upload_id: str,
+    offset: int,
+    request: Request,
+    use_case: ChunkedUploadUseCase = Depends(get_chunked_upload_use_case)
+):
+    """Store the request body at ``offset``; chunks may be sent in parallel"""
+    session = await use_case.get_status(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    
+    # Never buffer more than what is left of the declared size after offset
+    data = await read_body(request, max(session.total_size - offset, 0))
+    try:
+        session = await use_case.upload_chunk(upload_id, offset, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _upload_response(session)
+
+@router.get("/uploads/{upload_id}", response_model=Dict[str, Any])
+async def get_upload_status(
+    upload_id: str,
+    use_case: ChunkedUploadUseCase = Depends(get_chunked_upload_use_case)
+):
+    """Report the received and missing byte ranges of an upload"""
+    session = await use_case.get_status(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return _upload_response(session)
+
+@router.post("/uploads/{upload_id}/complete", response_model=Dict[str, Any])
+async def complete_upload(
+    upload_id: str,
+    request: Optional[CompleteUploadRequest] = None,
+    use_case: ChunkedUploadUseCase = Depends(get_chunked_upload_use_case)
+):
+    """Verify the assembled file and return the same analysis as /analysis-upload-file"""
+    session = await use_case.get_status(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if not session.complete:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Upload is incomplete", "missingRanges": _missing_ranges(session)}
+        )
+    
+    try:
+        analysis, chat_session = await use_case.complete(upload_id, request.sha256 if request else None)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        print(f"Error processing file: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return build_analysis_response(analysis, chat_session)
+
+@router.delete("/uploads/{upload_id}", response_model=Dict[str, Any])
+async def abort_upload(
+    upload_id: str,
+    use_case: ChunkedUploadUseCase = Depends(get_chunked_upload_use_case)
+):
+    """Abandon an upload and delete what was received"""
+    if not await use_case.abort(upload_id):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return {"uploadId": upload_id, "deleted": True}
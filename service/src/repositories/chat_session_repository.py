@@ -0,0 +1,104 @@
+import dataclasses
+import json
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+from ..entities.chat_message import ChatMessage, ChatSession, Cursor, MessageCursor
+from ..entities.data_profile import ColumnProfile, DataProfile
+
+class ChatSessionRepositoryInterface(ABC):
+    @abstractmethod
+    async def create_session(self, session: ChatSession) -> None:
+        pass
+
+    @abstractmethod
+    async def get_session(self, session_id: str, message_limit: Optional[int] = None) -> Optional[ChatSession]:
+        pass
+
+    @abstractmethod
+    async def update_session(self, session: ChatSession) -> None:
+        pass
+
+    @abstractmethod
+    async def add_message(self, session_id: str, message: ChatMessage) -> None:
+        pass
+
+    @abstractmethod
+    async def get_messages(self, session_id: str, limit: Optional[int] = None, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+        pass
+
+    @abstractmethod
+    async def evict(self) -> int:
+        pass
+
+    @abstractmethod
+    async def flush(self) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        pass
+
+def page_messages(messages: List[ChatMessage], limit: Optional[int] = None, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
+    """Select a page from messages sorted by timestamp, oldest first.
+
+    Only messages strictly between ``after`` and ``before`` qualify. With
+    just ``after`` the page is the ``limit`` oldest of them (paging forward),
+    otherwise the ``limit`` newest (paging back from the end or ``before``).
+    """
+    start = cursor_start(messages, after) if after is not None else 0
+    end = cursor_end(messages, before) if before is not None else len(messages)
+    if limit is None:
+        return messages[start:end]
+    if after is not None and before is None:
+        return messages[start:min(end, start + limit)]
+    return messages[max(start, end - limit):end]
+
+def as_cursor(value: Optional[Cursor]) -> Optional[MessageCursor]:
+    if value is None or isinstance(value, MessageCursor):
+        return value
+    return MessageCursor(value)
+
+def cursor_start(messages: List[ChatMessage], after: Cursor) -> int:
+    """Index of the first message past ``after`` in timestamp-sorted messages"""
+    after = as_cursor(after)
+    low = bisect_left(messages, after.timestamp, key=_timestamp)
+    high = bisect_right(messages, after.timestamp, key=_timestamp, lo=low)
+    position = _find(messages, after.message_id, low, high)
+    return high if position is None else position + 1
+
+def cursor_end(messages: List[ChatMessage], before: Cursor) -> int:
+    """Index just past the last message before ``before`` in timestamp-sorted messages"""
+    before = as_cursor(before)
+    low = bisect_left(messages, before.timestamp, key=_timestamp)
+    high = bisect_right(messages, before.timestamp, key=_timestamp, lo=low)
+    position = _find(messages, before.message_id, low, high)
+    return low if position is None else position
+
+def _find(messages: List[ChatMessage], message_id: Optional[str], low: int, high: int) -> Optional[int]:
+    # Ties on the timestamp are few, so a scan of them is enough
+    if message_id is not None:
+        for position in range(low, high):
+            if messages[position].id == message_id:
+                return position
+    return None
+
+def encode_profile(profile: Optional[DataProfile]) -> Optional[str]:
+    """Serialise a session's cached data profile for stores outside the process"""
+    if profile is None:
+        return None
+    return json.dumps(dataclasses.asdict(profile), separators=(",", ":"))
+
+def decode_profile(raw: Optional[str]) -> Optional[DataProfile]:
+    if raw is None:
+        return None
+    fields = json.loads(raw)
+    fields["columns"] = [ColumnProfile(**column) for column in fields["columns"]]
+    return DataProfile(**fields)
+
+def _timestamp(message: ChatMessage) -> float:
+    return message.timestamp
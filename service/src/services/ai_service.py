@@ -1,14 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, List
+from typing import AsyncGenerator, List, Optional
 import pandas as pd
+from ..entities.data_profile import DataProfile
+
+class FallbackOutput(list):
+    """Canned insights or questions returned when the model could not be reached"""
 
 class AIServiceInterface(ABC):
     @abstractmethod
-    async def generate_insights(self, df: pd.DataFrame, file_name: str) -> List[str]:
+    async def generate_insights(self, df: pd.DataFrame, file_name: str, profile: Optional[DataProfile] = None) -> List[str]:
         pass
     
     @abstractmethod
-    async def generate_sample_questions(self, df: pd.DataFrame, headers: List[str]) -> List[str]:
+    async def generate_sample_questions(self, df: pd.DataFrame, headers: List[str], profile: Optional[DataProfile] = None) -> List[str]:
         pass
     
     @abstractmethod
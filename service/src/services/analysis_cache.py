@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from ..entities.file_analysis import FileAnalysis
+
+class AnalysisCacheInterface(ABC):
+    @abstractmethod
+    def fingerprint(self, content: bytes, namespace: str = "") -> str:
+        pass
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[FileAnalysis]:
+        pass
+    
+    @abstractmethod
+    def put(self, key: str, analysis: FileAnalysis) -> None:
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        pass
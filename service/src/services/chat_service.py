@@ -1,15 +1,19 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional, Generator
 import pandas as pd
-from ..entities.chat_message import ChatMessage, ChatSession
+from ..entities.chat_message import ChatMessage, ChatSession, Cursor
 
 class ChatServiceInterface(ABC):
     @abstractmethod
-    async def create_chat_session(self, file_name: str) -> ChatSession:
+    async def create_chat_session(self, file_name: str, dataset_key: Optional[str] = None) -> ChatSession:
         pass
     
     @abstractmethod
-    async def get_chat_session(self, session_id: str) -> Optional[ChatSession]:
+    async def attach_dataset(self, session_id: str, dataset_key: str) -> None:
+        pass
+    
+    @abstractmethod
+    async def get_chat_session(self, session_id: str, message_limit: Optional[int] = None) -> Optional[ChatSession]:
         pass
     
     @abstractmethod
@@ -20,10 +24,14 @@ class ChatServiceInterface(ABC):
     async def get_chat_response(self, session_id: str, user_message: str, df: pd.DataFrame) -> str:
         pass
     
+    @abstractmethod
+    async def get_query_response(self, session_id: str, user_message: str, df: pd.DataFrame) -> str:
+        pass
+    
     @abstractmethod
     async def get_streaming_chat_response(self, session_id: str, user_message: str, df: pd.DataFrame) -> Generator:
         pass
     
     @abstractmethod
-    async def get_session_messages(self, session_id: str) -> List[ChatMessage]:
+    async def get_session_messages(self, session_id: str, limit: Optional[int] = None, before: Optional[Cursor] = None, after: Optional[Cursor] = None) -> List[ChatMessage]:
         pass 
\ No newline at end of file
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+class DatasetStoreInterface(ABC):
+    @abstractmethod
+    def fingerprint(self, content: bytes) -> str:
+        pass
+
+    @abstractmethod
+    def get(self, key: str, source_size: int = 0, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        pass
+
+    @abstractmethod
+    def put(self, key: str, df: pd.DataFrame) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def demote_idle(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        pass
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from ..entities.data_profile import DataProfile
+from ..entities.question_intent import QuestionIntent
+
+class FastAnswerInterface(ABC):
+    @abstractmethod
+    def match(self, question: str, columns: List[str]) -> Optional[QuestionIntent]:
+        pass
+
+    @abstractmethod
+    def answer(self, intent: QuestionIntent, profile: Optional[DataProfile], df: Optional[pd.DataFrame]) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def record(self, answered: bool, column_read: bool = False) -> None:
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        pass
@@ -1,11 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import BinaryIO, Callable, List, Optional
 import pandas as pd
 from ..entities.file_analysis import FileAnalysis
+from ..enums.job_status import AnalysisStage
 
 class FileServiceInterface(ABC):
     @abstractmethod
-    async def process_file(self, file: BinaryIO, filename: str) -> FileAnalysis:
+    async def process_file(self, file: BinaryIO, filename: str, progress: Optional[Callable[[AnalysisStage], None]] = None) -> FileAnalysis:
+        pass
+    
+    @abstractmethod
+    async def load_dataframe(self, file: BinaryIO, filename: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
         pass
     
     @abstractmethod
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from ..entities.analysis_job import AnalysisJob
+from ..entities.chat_message import ChatSession
+from ..entities.file_analysis import FileAnalysis
+from ..enums.job_status import AnalysisStage
+
+ProgressCallback = Callable[[AnalysisStage], None]
+# Runs one analysis, reporting each stage as it starts
+JobRunner = Callable[[ProgressCallback], Awaitable[Tuple[FileAnalysis, Optional[ChatSession]]]]
+
+class JobQueueInterface(ABC):
+    @abstractmethod
+    async def submit(self, file_name: str, runner: JobRunner) -> AnalysisJob:
+        pass
+    
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[AnalysisJob]:
+        pass
+    
+    @abstractmethod
+    def subscribe(self, job_id: str) -> AsyncIterator[AnalysisJob]:
+        pass
+    
+    @abstractmethod
+    async def shutdown(self) -> None:
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+import pandas as pd
+
+class QueryEngineInterface(ABC):
+    @abstractmethod
+    def execute(self, df: pd.DataFrame, sql: str) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        pass
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from ..entities.upload_session import UploadSession
+
+class UploadServiceInterface(ABC):
+    @abstractmethod
+    def create_upload(self, file_name: str, total_size: int, checksum: Optional[str] = None) -> UploadSession:
+        pass
+    
+    @abstractmethod
+    def write_chunk(self, upload_id: str, offset: int, data: bytes) -> UploadSession:
+        pass
+    
+    @abstractmethod
+    def get_upload(self, upload_id: str) -> Optional[UploadSession]:
+        pass
+    
+    @abstractmethod
+    def get_checksum(self, upload_id: str) -> str:
+        pass
+    
+    @abstractmethod
+    def read_upload(self, upload_id: str) -> bytes:
+        pass
+    
+    @abstractmethod
+    def delete_upload(self, upload_id: str) -> bool:
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        pass
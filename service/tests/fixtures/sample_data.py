@@ -97,6 +97,68 @@ def create_csv_with_special_characters() -> Tuple[bytes, int]:
     
     return csv_bytes, len(csv_bytes)
 
+def create_multi_sheet_excel_data() -> Tuple[bytes, int]:
+    """Create an Excel workbook with several sheets for testing"""
+    products = pd.DataFrame({
+        'product': ['Laptop', 'Phone', 'Tablet', 'Monitor'],
+        'price': [1200, 800, 500, 300],
+        'category': ['Electronics', 'Electronics', 'Electronics', 'Electronics'],
+        'stock': [50, 100, 75, 25]
+    })
+    orders = pd.DataFrame({
+        'order_id': [1, 2, 3],
+        'product': ['Laptop', 'Phone', None],
+        'amount': [1200.5, 800.0, 499.99],
+        'ordered_at': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'])
+    })
+    
+    excel_buffer = io.BytesIO()
+    with pd.ExcelWriter(excel_buffer) as writer:
+        products.to_excel(writer, index=False, sheet_name='Products')
+        orders.to_excel(writer, index=False, sheet_name='Orders')
+    excel_bytes = excel_buffer.getvalue()
+    
+    return excel_bytes, len(excel_bytes)
+
+def create_compressed_csv_data(compression: str) -> Tuple[bytes, int]:
+    """Create the sample CSV compressed as gzip, zstd or a single-file zip"""
+    import gzip
+    import zipfile
+    csv_bytes, _ = create_sample_csv_data()
+    
+    if compression == "gzip":
+        compressed = gzip.compress(csv_bytes)
+    elif compression == "zstd":
+        import zstandard
+        compressed = zstandard.ZstdCompressor().compress(csv_bytes)
+    elif compression == "zip":
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("employees.csv", csv_bytes)
+        compressed = zip_buffer.getvalue()
+    else:
+        raise ValueError(f"Unknown compression: {compression}")
+    
+    return compressed, len(compressed)
+
+def create_columnar_data(file_format: str) -> Tuple[bytes, int]:
+    """Create the sample dataset as Parquet, Feather or JSON Lines"""
+    df = get_sample_dataframe()
+    buffer = io.BytesIO()
+    
+    if file_format == "parquet":
+        # Two row groups so statistics have to be merged
+        df.to_parquet(buffer, index=False, row_group_size=3)
+    elif file_format == "feather":
+        df.to_feather(buffer)
+    elif file_format == "ndjson":
+        df.to_json(buffer, orient="records", lines=True)
+    else:
+        raise ValueError(f"Unknown format: {file_format}")
+    
+    data = buffer.getvalue()
+    return data, len(data)
+
 def get_sample_messages() -> list:
     """Get sample chat messages for testing"""
     return [
@@ -254,7 +254,7 @@ class TestChatIntegration:
         # Try with non-CSV file
         non_csv_bytes = b"some content"
         
-        with pytest.raises(ValueError, match="Only CSV files are supported for chat"):
+        with pytest.raises(ValueError, match="Only CSV, Parquet, Feather and JSON Lines files are supported for chat"):
             await use_case.send_message(
                 session.session_id, 
                 "Hello", 
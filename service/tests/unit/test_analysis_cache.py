@@ -0,0 +1,176 @@
+"""
+Unit tests for upload deduplication
+"""
+import pytest
+import io
+import os
+from datetime import datetime
+from unittest.mock import Mock, AsyncMock
+from src.application.use_cases.file_upload_use_case import FileUploadUseCase
+from src.entities.file_analysis import FileAnalysis, SheetAnalysis
+from src.infrastructure.services.analysis_cache_impl import AnalysisCacheImpl
+from src.infrastructure.services.file_service_impl import FileServiceImpl
+from src.infrastructure.services.ollama_ai_service_impl import OllamaAIServiceImpl
+from tests.fixtures.sample_data import create_sample_csv_data
+
+def _analysis(insights=None, ai_fallback=False) -> FileAnalysis:
+    return FileAnalysis(
+        file_name="test.csv",
+        rows=5,
+        columns=4,
+        headers=["name", "age", "salary", "department"],
+        sample_data=[["Alice", "25", "50000", "Engineering"]],
+        insights=["Insight 1"] if insights is None else insights,
+        sample_questions=["Question 1"],
+        upload_timestamp=datetime(2024, 1, 1, 12, 0),
+        file_size=143,
+        sheets=[SheetAnalysis("Sheet1", 5, 4, ["a"], [["1"]], {"a": "int64"}, 0)],
+        ai_fallback=ai_fallback
+    )
+
+@pytest.mark.unit
+class TestAnalysisCacheImpl:
+    """Unit tests for AnalysisCacheImpl"""
+    
+    def test_round_trip_survives_restart(self, tmp_path):
+        """Test that analyses are persisted and read back intact"""
+        cache = AnalysisCacheImpl(str(tmp_path))
+        key = cache.fingerprint(b"a,b\n1,2\n", "OllamaAIServiceImpl")
+        cache.put(key, _analysis())
+        
+        restored = AnalysisCacheImpl(str(tmp_path)).get(key)
+        
+        assert restored == _analysis()
+    
+    def test_namespace_changes_the_key(self, tmp_path):
+        """Test that the same bytes analysed by another provider miss"""
+        cache = AnalysisCacheImpl(str(tmp_path))
+        
+        assert cache.fingerprint(b"data", "ollama") != cache.fingerprint(b"data", "openrouter")
+        assert cache.fingerprint(b"data", "ollama") == cache.fingerprint(b"data", "ollama")
+    
+    def test_bounded_lru(self, tmp_path):
+        """Test that the oldest entries are evicted from memory and disk"""
+        cache = AnalysisCacheImpl(str(tmp_path), max_entries=2)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.put(key, _analysis())
+            # Distinct mtimes make the disk LRU order deterministic
+            os.utime(tmp_path / f"{key}.json", (i, i))
+        cache.put("c", _analysis())
+        
+        assert sorted(os.listdir(tmp_path)) == ["b.json", "c.json"]
+        assert cache.get_stats()["memory_entries"] == 2
+        assert cache.get_stats()["evictions"] == 1
+    
+    def test_hit_rate(self, tmp_path):
+        """Test hit and miss accounting"""
+        cache = AnalysisCacheImpl(str(tmp_path))
+        cache.put("a", _analysis())
+        
+        cache.get("a")
+        cache.get("missing")
+        
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+    
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test that unreadable entries are dropped"""
+        (tmp_path / "bad.json").write_text("{not json")
+        cache = AnalysisCacheImpl(str(tmp_path))
+        
+        assert cache.get("bad") is None
+        assert not (tmp_path / "bad.json").exists()
+
+@pytest.mark.unit
+class TestFileUploadUseCaseDeduplication:
+    """Unit tests for cached analyses in FileUploadUseCase"""
+    
+    @pytest.fixture
+    def file_service(self):
+        """Create a mock file service"""
+        mock_service = Mock()
+        mock_service.process_file = AsyncMock(return_value=_analysis())
+        return mock_service
+    
+    @pytest.fixture
+    def use_case(self, file_service, tmp_path):
+        """Create FileUploadUseCase with a real analysis cache"""
+        return FileUploadUseCase(file_service, Mock(), AnalysisCacheImpl(str(tmp_path)))
+    
+    @pytest.mark.asyncio
+    async def test_repeat_upload_is_served_from_cache(self, use_case, file_service):
+        """Test that identical bytes are analysed once"""
+        csv_bytes, _ = create_sample_csv_data()
+        
+        first = await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        second = await use_case.execute(io.BytesIO(csv_bytes), "renamed.csv")
+        
+        assert file_service.process_file.await_count == 1
+        assert second.insights == first.insights
+        assert second.file_name == "renamed.csv"
+        assert second.upload_timestamp > first.upload_timestamp
+    
+    @pytest.mark.asyncio
+    async def test_force_refresh(self, use_case, file_service):
+        """Test that force_refresh reanalyses and updates the cache"""
+        csv_bytes, _ = create_sample_csv_data()
+        await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        file_service.process_file.return_value = _analysis(insights=["Fresh insight"])
+        
+        refreshed = await use_case.execute(io.BytesIO(csv_bytes), "test.csv", force_refresh=True)
+        cached = await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        
+        assert file_service.process_file.await_count == 2
+        assert refreshed.insights == ["Fresh insight"]
+        assert cached.insights == ["Fresh insight"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_insights_are_not_cached(self, use_case, file_service):
+        """Test that analyses without insights are retried"""
+        file_service.process_file.return_value = _analysis(insights=[])
+        csv_bytes, _ = create_sample_csv_data()
+        
+        await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        
+        assert file_service.process_file.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_fallback_analyses_are_not_cached(self, tmp_path):
+        """Test that canned insights from a model outage are not served to later uploads"""
+        ai_service = OllamaAIServiceImpl(model="model-a")
+        ai_service.client = Mock()
+        ai_service.client.chat = Mock(side_effect=ConnectionError("model unavailable"))
+        use_case = FileUploadUseCase(FileServiceImpl(ai_service), ai_service, AnalysisCacheImpl(str(tmp_path)))
+        csv_bytes, _ = create_sample_csv_data()
+        
+        analysis = await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        assert analysis.ai_fallback and len(analysis.insights) == 4
+        
+        ai_service.client.chat = Mock(return_value="\n".join(f"Insight number {i} about the data" for i in range(5)))
+        analysis = await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        assert not analysis.ai_fallback
+        assert analysis.insights[0] == "Insight number 0 about the data"
+    
+    @pytest.mark.asyncio
+    async def test_model_is_part_of_the_key(self, file_service, tmp_path):
+        """Test that switching models reanalyses instead of serving the old model's insights"""
+        cache = AnalysisCacheImpl(str(tmp_path))
+        csv_bytes, _ = create_sample_csv_data()
+        
+        for model in ["model-a", "model-b", "model-a"]:
+            await FileUploadUseCase(file_service, Mock(model=model), cache).execute(io.BytesIO(csv_bytes), "test.csv")
+        
+        assert file_service.process_file.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_file_is_rewound_for_processing(self, use_case, file_service):
+        """Test that fingerprinting leaves the upload readable"""
+        csv_bytes, _ = create_sample_csv_data()
+        
+        await use_case.execute(io.BytesIO(csv_bytes), "test.csv")
+        
+        uploaded_file = file_service.process_file.await_args.args[0]
+        assert uploaded_file.read() == csv_bytes
@@ -0,0 +1,164 @@
+"""
+Unit tests for batch uploads and the provider request limit
+"""
+import asyncio
+import threading
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, AsyncMock
+from src.application.use_cases.batch_analysis_use_case import BatchAnalysisUseCase
+from src.entities.file_analysis import FileAnalysis
+from src.infrastructure.services.ollama_ai_service_impl import OllamaAIServiceImpl
+from tests.fixtures.sample_data import get_sample_dataframe
+
+def _analysis(filename: str) -> FileAnalysis:
+    return FileAnalysis(
+        file_name=filename,
+        rows=5,
+        columns=4,
+        headers=["name", "age", "salary", "department"],
+        sample_data=[["Alice", "25", "50000", "Engineering"]],
+        insights=["Insight 1"],
+        sample_questions=["Question 1"],
+        upload_timestamp=datetime(2024, 1, 1, 12, 0),
+        file_size=143
+    )
+
+@pytest.mark.unit
+class TestBatchAnalysisUseCase:
+    """Unit tests for BatchAnalysisUseCase"""
+    
+    @pytest.fixture
+    def file_upload_use_case(self):
+        """Create a mock upload use case where each file takes 50ms"""
+        async def execute(file, filename, force_refresh=False):
+            await asyncio.sleep(0.05)
+            if filename.startswith("bad"):
+                raise Exception("Failed to process file: Error reading CSV file: bad data")
+            return _analysis(filename)
+        
+        use_case = Mock()
+        use_case.execute = AsyncMock(side_effect=execute)
+        return use_case
+    
+    @pytest.mark.asyncio
+    async def test_files_are_analysed_concurrently(self, file_upload_use_case):
+        """Test that a batch takes about as long as one file"""
+        use_case = BatchAnalysisUseCase(file_upload_use_case)
+        files = [(f"month{i}.csv", b"a\n1\n") for i in range(8)]
+        
+        start = time.perf_counter()
+        results = [result async for result in use_case.execute(files)]
+        elapsed = time.perf_counter() - start
+        
+        assert sorted(result.index for result in results) == list(range(8))
+        assert all(result.analysis.file_name == result.file_name for result in results)
+        assert elapsed < 0.05 * 4
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_file(self, file_upload_use_case):
+        """Test that one bad file does not fail the batch"""
+        chat_use_case = Mock()
+        chat_use_case.create_session = AsyncMock(return_value=Mock())
+        use_case = BatchAnalysisUseCase(file_upload_use_case, chat_use_case)
+        
+        results = [r async for r in use_case.execute([("good.csv", b""), ("bad.csv", b""), ("book.xlsx", b"")])]
+        by_name = {result.file_name: result for result in results}
+        
+        assert by_name["good.csv"].analysis is not None
+        assert by_name["good.csv"].chat_session is not None
+        assert "bad data" in by_name["bad.csv"].error
+        assert by_name["book.xlsx"].chat_session is None
+        chat_use_case.create_session.assert_called_once_with("good.csv", b"")
+    
+    @pytest.mark.asyncio
+    async def test_stopping_early_cancels_remaining_files(self):
+        """Test that abandoning the stream cancels outstanding analyses"""
+        cancelled = []
+        
+        async def execute(file, filename, force_refresh=False):
+            try:
+                await asyncio.sleep(0 if filename == "fast.csv" else 10)
+            except asyncio.CancelledError:
+                cancelled.append(filename)
+                raise
+            return _analysis(filename)
+        
+        file_upload_use_case = Mock()
+        file_upload_use_case.execute = AsyncMock(side_effect=execute)
+        use_case = BatchAnalysisUseCase(file_upload_use_case)
+        
+        results = use_case.execute([("fast.csv", b""), ("slow.csv", b"")])
+        first = await results.__anext__()
+        await results.aclose()
+        await asyncio.sleep(0)
+        
+        assert first.file_name == "fast.csv"
+        assert cancelled == ["slow.csv"]
+
+@pytest.mark.unit
+class TestProviderRequestLimit:
+    """Unit tests for the AI services' concurrent request cap"""
+    
+    @pytest.mark.asyncio
+    async def test_requests_are_capped_and_off_the_event_loop(self):
+        """Test that insight calls run in threads, at most N at a time"""
+        service = OllamaAIServiceImpl(max_concurrent_requests=2)
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+        
+        def chat(**kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return "\n".join(f"Insight number {i} about the data" for i in range(4))
+        
+        service.client = Mock()
+        service.client.chat = Mock(side_effect=chat)
+        df = get_sample_dataframe()
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*[service.generate_insights(df, "test.csv") for _ in range(6)])
+        elapsed = time.perf_counter() - start
+        
+        assert all(len(insights) == 4 for insights in results)
+        assert peak == 2
+        # Three rounds of two, rather than six calls back to back
+        assert elapsed < 0.05 * 5
+    
+    @pytest.mark.asyncio
+    async def test_queued_requests_leave_the_default_executor_free(self):
+        """Test that calls waiting for a provider slot do not hold shared worker threads"""
+        service = OllamaAIServiceImpl(max_concurrent_requests=2)
+        service.client = Mock()
+        service.client.chat = Mock(side_effect=lambda **kwargs: time.sleep(0.2) or "Insight about the data")
+        df = get_sample_dataframe()
+        
+        batch = asyncio.gather(*[service.generate_insights(df, "test.csv") for _ in range(40)])
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await asyncio.to_thread(lambda: None)
+        assert time.perf_counter() - start < 0.1
+        
+        batch.cancel()
+        service.close()
+    
+    def test_stream_holds_its_slot_until_closed(self):
+        """Test that a streamed answer counts against the cap while it is read"""
+        service = OllamaAIServiceImpl(max_concurrent_requests=1)
+        service.client = Mock()
+        service.client.chat = Mock(return_value=iter(["first", "second"]))
+        
+        stream = service.make_streaming_api_request([{"role": "user", "content": "hi"}])
+        assert next(stream) == "first"
+        assert not service._request_slots.acquire(blocking=False)
+        
+        stream.close()
+        assert service._request_slots.acquire(blocking=False)
+        service._request_slots.release()
@@ -2,10 +2,10 @@
 Unit tests for chat service implementation
 """
 import pytest
-import pandas as pd
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, patch
 from src.infrastructure.services.chat_service_impl import ChatServiceImpl
 from src.entities.chat_message import ChatMessage, ChatSession
+from src.infrastructure.services.data_profiler import profile_dataframe
 from tests.fixtures.sample_data import get_sample_dataframe
 
 @pytest.mark.unit
@@ -225,4 +225,39 @@ class TestChatServiceImpl:
         
         assert message1.id != message2.id
         assert len(message1.id) > 0
-        assert len(message2.id) > 0 
\ No newline at end of file
+        assert len(message2.id) > 0
+    
+    @pytest.mark.asyncio
+    async def test_data_prompt_is_cached_per_dataset(self, chat_service, mock_ai_service, sample_df):
+        """Test that the data summary is computed once until the dataset changes"""
+        session = await chat_service.create_chat_session("test.csv", dataset_key="dataset-1")
+        
+        with patch("src.infrastructure.services.chat_service_impl.profile_dataframe", wraps=profile_dataframe) as profiler:
+            for question in ["First?", "Second?", "Third?"]:
+                await chat_service.add_message(session.session_id, question, "user")
+                await chat_service.get_chat_response(session.session_id, question, sample_df)
+            assert profiler.call_count == 1
+            
+            await chat_service.attach_dataset(session.session_id, "dataset-2")
+            assert (await chat_service.get_chat_session(session.session_id)).prompt_prefix is None
+            await chat_service.get_chat_response(session.session_id, "Fourth?", sample_df)
+            assert profiler.call_count == 2
+        
+        session = await chat_service.get_chat_session(session.session_id)
+        prompt = mock_ai_service.make_api_request.call_args.args[0][1]["content"]
+        assert prompt.startswith(session.prompt_prefix)
+        assert ChatServiceImpl._get_data_summary(sample_df) in prompt
+        assert "User's current question: Fourth?" in prompt
+        assert session.data_profile.total_rows == len(sample_df)
+    
+    @pytest.mark.asyncio
+    async def test_data_prompt_not_cached_without_dataset_key(self, chat_service, sample_df):
+        """Test that frames not bound to the session are profiled every turn"""
+        session = await chat_service.create_chat_session("test.csv")
+        
+        with patch("src.infrastructure.services.chat_service_impl.profile_dataframe", wraps=profile_dataframe) as profiler:
+            await chat_service.get_chat_response(session.session_id, "First?", sample_df)
+            await chat_service.get_chat_response(session.session_id, "Second?", sample_df)
+        
+        assert profiler.call_count == 2
+        assert (await chat_service.get_chat_session(session.session_id)).prompt_prefix is None
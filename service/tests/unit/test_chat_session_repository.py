@@ -0,0 +1,335 @@
+"""
+Unit tests for chat session repositories
+"""
+import asyncio
+import pytest
+import time
+from datetime import datetime
+from unittest.mock import Mock
+from src.entities.chat_message import ChatMessage, ChatSession, MessageCursor
+from src.infrastructure.repositories.in_memory_chat_session_repository import InMemoryChatSessionRepository
+from src.infrastructure.repositories.redis_chat_session_repository import RedisChatSessionRepository
+from src.infrastructure.repositories.sqlite_chat_session_repository import SqliteChatSessionRepository
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.services.data_profiler import profile_dataframe
+from tests.fixtures.sample_data import get_sample_dataframe
+
+START = datetime(2024, 1, 1, 12, 0).timestamp()
+
+def _session(session_id: str = "session-1") -> ChatSession:
+    return ChatSession(session_id=session_id, file_name="test.csv", messages=[], created_at=START, last_updated=START)
+
+def _message(i: int) -> ChatMessage:
+    return ChatMessage(
+        id=f"message-{i}",
+        content=f"Message {i}",
+        role="user" if i % 2 == 0 else "assistant",
+        timestamp=START + i,
+        file_name="test.csv"
+    )
+
+def _redis_repository(**kwargs) -> RedisChatSessionRepository:
+    fakeredis = pytest.importorskip("fakeredis")
+    # Each client gets its own in-process server unless one is shared
+    return RedisChatSessionRepository(client=fakeredis.FakeAsyncRedis(**kwargs))
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def repository(request, tmp_path):
+    """Create each repository implementation"""
+    if request.param == "memory":
+        repo = InMemoryChatSessionRepository()
+    elif request.param == "redis":
+        repo = _redis_repository()
+    else:
+        repo = SqliteChatSessionRepository(str(tmp_path / "sessions.db"), flush_interval=0.01)
+    yield repo
+    asyncio.run(repo.close())
+
+@pytest.mark.unit
+class TestChatSessionRepository:
+    """Behaviour shared by every repository"""
+    
+    @pytest.mark.asyncio
+    async def test_messages_in_order_and_limited(self, repository):
+        """Test that sessions return their latest messages, oldest first"""
+        await repository.create_session(_session())
+        for i in range(15):
+            await repository.add_message("session-1", _message(i))
+        
+        session = await repository.get_session("session-1", message_limit=10)
+        
+        assert [m.id for m in session.messages] == [f"message-{i}" for i in range(5, 15)]
+        assert session.last_updated == _message(14).timestamp
+        assert (await repository.get_session("session-1", message_limit=0)).messages == []
+        assert len(await repository.get_messages("session-1")) == 15
+    
+    @pytest.mark.asyncio
+    async def test_update_session(self, repository):
+        """Test that session fields are saved without touching messages"""
+        await repository.create_session(_session())
+        await repository.add_message("session-1", _message(0))
+        
+        session = await repository.get_session("session-1", message_limit=0)
+        session.dataset_key = "dataset-1"
+        session.prompt_prefix = "prefix"
+        session.data_profile = profile_dataframe(get_sample_dataframe())
+        await repository.update_session(session)
+        
+        stored = await repository.get_session("session-1")
+        assert stored.dataset_key == "dataset-1"
+        assert stored.prompt_prefix == "prefix"
+        assert stored.data_profile == session.data_profile
+        assert [m.id for m in stored.messages] == ["message-0"]
+    
+    @pytest.mark.asyncio
+    async def test_message_pages(self, repository):
+        """Test paging back and forward through messages by timestamp cursor"""
+        await repository.create_session(_session())
+        for i in range(250):
+            await repository.add_message("session-1", _message(i))
+        ids = lambda messages: [int(m.id.split("-")[1]) for m in messages]
+        
+        assert ids(await repository.get_messages("session-1", limit=3)) == [247, 248, 249]
+        assert ids(await repository.get_messages("session-1", limit=3, before=_message(10).timestamp)) == [7, 8, 9]
+        assert ids(await repository.get_messages("session-1", limit=3, after=_message(10).timestamp)) == [11, 12, 13]
+        assert ids(await repository.get_messages("session-1", after=_message(246).timestamp)) == [247, 248, 249]
+        assert ids(await repository.get_messages("session-1", before=_message(2).timestamp)) == [0, 1]
+        assert ids(await repository.get_messages(
+            "session-1", limit=5, before=_message(20).timestamp, after=_message(2).timestamp
+        )) == [15, 16, 17, 18, 19]
+        assert await repository.get_messages("session-1", limit=3, after=_message(249).timestamp) == []
+    
+    @pytest.mark.asyncio
+    async def test_message_pages_with_shared_timestamps(self, repository):
+        """Test that messages sharing a timestamp are not lost at page boundaries"""
+        await repository.create_session(_session())
+        for i, offset in enumerate([1, 2, 2, 3]):
+            await repository.add_message("session-1", ChatMessage(id=f"m{i}", content="", role="user", timestamp=START + offset))
+        ids = lambda messages: [m.id for m in messages]
+        cursor = lambda message: MessageCursor(message.timestamp, message.id)
+        
+        for _ in range(2):
+            last = await repository.get_messages("session-1", limit=2)
+            assert ids(last) == ["m2", "m3"]
+            assert ids(await repository.get_messages("session-1", limit=2, before=cursor(last[0]))) == ["m0", "m1"]
+            first = await repository.get_messages("session-1", limit=2, after=START + 1)
+            assert ids(first) == ["m1", "m2"]
+            assert ids(await repository.get_messages("session-1", limit=2, after=cursor(first[0]))) == ["m2", "m3"]
+            # A bare timestamp still stands for everything at it
+            assert ids(await repository.get_messages("session-1", after=START + 2)) == ["m3"]
+            # Again once buffered writes are committed
+            await repository.flush()
+    
+    @pytest.mark.asyncio
+    async def test_unknown_session(self, repository):
+        """Test lookups and updates of sessions that do not exist"""
+        assert await repository.get_session("missing") is None
+        assert await repository.get_messages("missing") == []
+        with pytest.raises(ValueError, match="not found"):
+            await repository.update_session(_session("missing"))
+
+@pytest.mark.unit
+class TestInMemoryChatSessionRepository:
+    """Eviction in the in-memory repository"""
+    
+    @pytest.mark.asyncio
+    async def test_idle_sessions_expire(self):
+        """Test that evict drops sessions untouched for longer than the TTL"""
+        repo = InMemoryChatSessionRepository(idle_ttl_seconds=60)
+        await repo.create_session(_session("old"))
+        await repo.create_session(_session("new"))
+        repo._last_access["old"] -= 120
+        
+        assert await repo.evict() == 1
+        assert await repo.get_session("old") is None
+        assert await repo.get_session("new") is not None
+        assert repo.get_stats()["evicted_idle"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_least_recently_used_session_is_evicted(self):
+        """Test that the session cap evicts the session used longest ago"""
+        repo = InMemoryChatSessionRepository(max_sessions=2)
+        await repo.create_session(_session("a"))
+        await repo.create_session(_session("b"))
+        await repo.get_session("a")
+        await repo.create_session(_session("c"))
+        
+        assert await repo.get_session("b") is None
+        assert await repo.get_session("a") is not None
+        assert repo.get_stats()["evicted_lru"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_memory_budget(self):
+        """Test that resident bytes stay within the budget as messages grow"""
+        repo = InMemoryChatSessionRepository(max_memory_bytes=64 * 1024)
+        for i in range(10):
+            await repo.create_session(_session(f"session-{i}"))
+            for j in range(10):
+                await repo.add_message(f"session-{i}", ChatMessage(
+                    id=f"{i}-{j}", content="x" * 1000, role="user", timestamp=START, file_name="test.csv"
+                ))
+        
+        stats = repo.get_stats()
+        assert 0 < stats["resident_bytes"] <= 64 * 1024
+        assert stats["evicted_lru"] > 0
+        assert await repo.get_session("session-9") is not None
+        assert await repo.get_session("session-0") is None
+
+@pytest.mark.unit
+class TestSqliteChatSessionRepository:
+    """Unit tests for SqliteChatSessionRepository"""
+    
+    @pytest.mark.asyncio
+    async def test_messages_are_batched(self, tmp_path):
+        """Test that concurrent chats are committed in a few transactions"""
+        repo = SqliteChatSessionRepository(str(tmp_path / "sessions.db"), flush_interval=10)
+        for s in range(5):
+            await repo.create_session(_session(f"session-{s}"))
+        
+        await asyncio.gather(*[
+            repo.add_message(f"session-{s}", _message(s * 100 + i))
+            for s in range(5) for i in range(20)
+        ])
+        # Buffered messages are already visible to this process
+        assert repo.get_stats()["pending_messages"] == 100
+        assert len(await repo.get_messages("session-3")) == 20
+        
+        await repo.flush()
+        stats = repo.get_stats()
+        assert stats["messages_written"] == 100
+        assert stats["batches_written"] == 1
+        assert stats["pending_messages"] == 0
+        await repo.close()
+    
+    @pytest.mark.asyncio
+    async def test_flush_latency_is_bounded(self, tmp_path):
+        """Test that another worker sees a message within the flush interval"""
+        path = str(tmp_path / "sessions.db")
+        writer = SqliteChatSessionRepository(path, flush_interval=0.02)
+        reader = SqliteChatSessionRepository(path, flush_interval=0.02)
+        await writer.create_session(_session())
+        
+        await writer.add_message("session-1", _message(0))
+        for _ in range(100):
+            if await reader.get_messages("session-1"):
+                break
+            await asyncio.sleep(0.01)
+        
+        assert [m.id for m in await reader.get_messages("session-1")] == ["message-0"]
+        await writer.close()
+        await reader.close()
+    
+    @pytest.mark.asyncio
+    async def test_sessions_survive_restart(self, tmp_path):
+        """Test that closing commits buffered messages for the next process"""
+        path = str(tmp_path / "sessions.db")
+        repo = SqliteChatSessionRepository(path, flush_interval=10)
+        await repo.create_session(_session())
+        await repo.add_message("session-1", _message(0))
+        await repo.close()
+        
+        reopened = SqliteChatSessionRepository(path)
+        session = await reopened.get_session("session-1")
+        
+        assert session.file_name == "test.csv"
+        assert session.created_at == START
+        assert [m.content for m in session.messages] == ["Message 0"]
+        await reopened.close()
+    
+    @pytest.mark.asyncio
+    async def test_write_through(self, tmp_path):
+        """Test that a zero flush interval commits each message immediately"""
+        repo = SqliteChatSessionRepository(str(tmp_path / "sessions.db"), flush_interval=0)
+        await repo.create_session(_session())
+        await repo.add_message("session-1", _message(0))
+        
+        assert repo.get_stats()["messages_written"] == 1
+        await repo.close()
+    
+    @pytest.mark.asyncio
+    async def test_chat_service_over_sqlite(self, tmp_path):
+        """Test a conversation through ChatServiceImpl backed by SQLite"""
+        mock_ai_service = Mock()
+        mock_ai_service.make_api_request = Mock(return_value="AI response")
+        repo = SqliteChatSessionRepository(str(tmp_path / "sessions.db"))
+        chat_service = ChatServiceImpl(mock_ai_service, repository=repo)
+        
+        session = await chat_service.create_chat_session("test.csv")
+        await chat_service.add_message(session.session_id, "What is the average age?", "user")
+        await chat_service.add_message(session.session_id, "AI response", "assistant")
+        
+        messages = await chat_service.get_session_messages(session.session_id)
+        assert [m.role for m in messages] == ["user", "assistant"]
+        with pytest.raises(ValueError, match="not found"):
+            await chat_service.add_message("missing", "Hello", "user")
+        await repo.close()
+
+    
+    @pytest.mark.asyncio
+    async def test_evict_idle_and_overflow(self, tmp_path):
+        """Test that evict deletes idle sessions and the oldest past the cap"""
+        repo = SqliteChatSessionRepository(str(tmp_path / "sessions.db"), idle_ttl_seconds=60, max_sessions=2)
+        now = time.time()
+        await repo.create_session(_session("idle"))
+        for i, session_id in enumerate(["a", "b", "c"]):
+            session = _session(session_id)
+            session.last_updated = now + i
+            await repo.create_session(session)
+            await repo.add_message(session_id, _message(i))
+        
+        assert await repo.evict() == 2
+        assert await repo.get_session("idle") is None
+        assert await repo.get_session("a") is None
+        assert await repo.get_messages("a") == []
+        assert await repo.get_session("c") is not None
+        stats = repo.get_stats()
+        assert (stats["evicted_idle"], stats["evicted_lru"]) == (1, 1)
+        await repo.close()
+
+@pytest.mark.unit
+class TestRedisChatSessionRepository:
+    """Redis specifics, against an in-process Redis stand-in"""
+    
+    @pytest.mark.asyncio
+    async def test_sessions_are_shared_between_workers(self):
+        """Test that a session created through one client is visible through another"""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        worker_a = _redis_repository(server=server)
+        worker_b = _redis_repository(server=server)
+        
+        await worker_a.create_session(_session())
+        await worker_b.add_message("session-1", _message(0))
+        
+        session = await worker_a.get_session("session-1")
+        assert [m.id for m in session.messages] == ["message-0"]
+        await worker_a.close()
+        await worker_b.close()
+    
+    @pytest.mark.asyncio
+    async def test_messages_are_capped_and_pipelined(self):
+        """Test that message lists keep the latest entries, one round trip per write"""
+        repo = _redis_repository()
+        repo.max_messages = 5
+        await repo.create_session(_session())
+        for i in range(8):
+            await repo.add_message("session-1", _message(i))
+        
+        assert [m.id for m in await repo.get_messages("session-1")] == [f"message-{i}" for i in range(3, 8)]
+        assert repo.get_stats()["round_trips"] == 1 + 8 + 1
+        await repo.close()
+    
+    @pytest.mark.asyncio
+    async def test_sessions_expire_when_idle(self):
+        """Test that both keys carry the idle TTL and missing sessions leave nothing behind"""
+        repo = _redis_repository()
+        repo.idle_ttl_seconds = 60
+        await repo.create_session(_session())
+        await repo.add_message("session-1", _message(0))
+        
+        assert 0 < await repo._client.ttl("chat:session:session-1") <= 60
+        assert 0 < await repo._client.ttl("chat:messages:session-1") <= 60
+        with pytest.raises(ValueError, match="not found"):
+            await repo.add_message("missing", _message(1))
+        assert not await repo._client.exists("chat:session:missing", "chat:messages:missing")
+        await repo.close()
@@ -0,0 +1,88 @@
+"""
+Unit tests for question-relevant column selection on wide datasets
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.services.column_index import ColumnIndex
+from src.infrastructure.services.data_profiler import profile_dataframe
+from tests.fixtures.sample_data import get_sample_dataframe
+
+def _wide_dataframe(filler_columns: int = 200) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "customerName": ["Ann", "Ben", "Cleo"],
+        "total_revenue": [100.0, 250.5, 80.0],
+        "ship_city": ["Berlin", "Paris", "Berlin"],
+        "order_date": ["2024-01-01", "2024-01-02", "2024-01-03"]
+    })
+    filler = pd.DataFrame(np.zeros((3, filler_columns)), columns=[f"metric_{i}" for i in range(filler_columns)])
+    return pd.concat([df, filler], axis=1)
+
+@pytest.mark.unit
+class TestColumnIndex:
+    """Unit tests for ColumnIndex"""
+    
+    @pytest.fixture
+    def index(self):
+        return ColumnIndex(profile_dataframe(_wide_dataframe()))
+    
+    @pytest.mark.parametrize("question,column", [
+        ("What is the total revenue?", "total_revenue"),
+        ("How much did we make in sales?", "total_revenue"),
+        ("Which client ordered most?", "customerName"),
+        ("How many orders went to Paris?", "ship_city"),
+        ("When was the first order placed?", "order_date")
+    ])
+    def test_ranks_by_name_synonym_and_value(self, index, question, column):
+        """Test that columns are found by their name, a synonym or a value"""
+        assert column in index.rank(question, 2)
+    
+    def test_unmatched_questions_get_the_leading_columns(self, index):
+        """Test that a question naming no column still gets some statistics"""
+        assert index.rank("Summarise this for me", 2) == ["customerName", "total_revenue"]
+    
+@pytest.mark.unit
+class TestWideDatasetPrompts:
+    """Unit tests for prompts over datasets with many columns"""
+    
+    @pytest.fixture
+    def mock_ai_service(self):
+        mock_service = Mock()
+        mock_service.make_api_request = Mock(return_value="Chat response")
+        return mock_service
+    
+    @pytest.mark.asyncio
+    async def test_prompt_has_schema_and_relevant_statistics(self, mock_ai_service):
+        """Test that wide datasets send every name but statistics only for relevant columns"""
+        chat_service = ChatServiceImpl(mock_ai_service, prompt_max_columns=3)
+        session = await chat_service.create_chat_session("wide.csv", dataset_key="dataset-1")
+        df = _wide_dataframe()
+    
+        await chat_service.get_chat_response(session.session_id, "What is the total revenue?", df)
+        prompt = mock_ai_service.make_api_request.call_args.args[0][1]["content"]
+    
+        assert "204 columns (name: type): customerName: text, total_revenue: float" in prompt
+        assert "metric_199: float" in prompt
+        relevant = prompt.split("Statistics for the columns most relevant to the question:")[1]
+        assert "'total_revenue': {" in relevant
+        assert "'metric_0': {" not in relevant
+    
+        full_prompt_size = len(str(ChatServiceImpl._get_data_summary(df)))
+        assert len(prompt) < full_prompt_size / 2
+        await chat_service.history.drain()
+    
+    @pytest.mark.asyncio
+    async def test_narrow_datasets_keep_full_statistics(self, mock_ai_service):
+        """Test that datasets within the column limit are described in full as before"""
+        chat_service = ChatServiceImpl(mock_ai_service)
+        session = await chat_service.create_chat_session("test.csv")
+        df = get_sample_dataframe()
+    
+        await chat_service.get_chat_response(session.session_id, "What is the average age?", df)
+        prompt = mock_ai_service.make_api_request.call_args.args[0][1]["content"]
+    
+        assert ChatServiceImpl._get_data_summary(df) in prompt
+        assert "most relevant" not in prompt
+        await chat_service.history.drain()
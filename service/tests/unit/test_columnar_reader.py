@@ -0,0 +1,183 @@
+"""
+Unit tests for Parquet, Feather and JSON Lines uploads
+"""
+import pytest
+import io
+import pandas as pd
+from unittest.mock import Mock, AsyncMock
+from src.enums.file_format import FileFormat
+from src.infrastructure.services.columnar_reader import (
+    known_column_stats, read_feather, read_ndjson, read_parquet
+)
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.services.file_service_impl import FileServiceImpl
+from tests.fixtures.sample_data import create_columnar_data, get_sample_dataframe
+
+@pytest.mark.unit
+class TestColumnarReader:
+    """Unit tests for the columnar readers"""
+    
+    @pytest.mark.parametrize("file_format, reader", [
+        ("parquet", read_parquet),
+        ("feather", read_feather),
+        ("ndjson", read_ndjson),
+    ])
+    def test_round_trip(self, file_format, reader):
+        """Test that every format yields the original frame"""
+        content, _ = create_columnar_data(file_format)
+        
+        df = reader(content)
+        
+        pd.testing.assert_frame_equal(df, get_sample_dataframe())
+    
+    @pytest.mark.parametrize("file_format, reader", [
+        ("parquet", read_parquet),
+        ("feather", read_feather),
+        ("ndjson", read_ndjson),
+    ])
+    def test_column_projection(self, file_format, reader):
+        """Test that only the requested columns are returned"""
+        content, _ = create_columnar_data(file_format)
+        
+        df = reader(content, columns=["salary", "name"])
+        
+        assert df.columns.tolist() == ["salary", "name"]
+        assert len(df) == 5
+    
+    def test_arrow_ipc_stream(self):
+        """Test that the streaming IPC layout is accepted as well as Feather"""
+        import pyarrow as pa
+        table = pa.Table.from_pandas(get_sample_dataframe(), preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        
+        df = read_feather(sink.getvalue().to_pybytes(), columns=["age"])
+        
+        assert df["age"].tolist() == [25, 30, 35, 28, 32]
+    
+    @pytest.mark.parametrize("file_format, reader", [
+        ("parquet", read_parquet),
+        ("feather", read_feather),
+        ("ndjson", read_ndjson),
+    ])
+    def test_size_cap(self, file_format, reader):
+        """Test that files decoding past max_bytes are refused, however well they compress"""
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        df = pd.DataFrame({"text": ["x" * 1000] * 1000, "n": range(1000)})
+        if file_format == "parquet":
+            buffer = io.BytesIO()
+            df.to_parquet(buffer, index=False, compression="zstd")
+            content = buffer.getvalue()
+        elif file_format == "feather":
+            sink = pa.BufferOutputStream()
+            feather.write_feather(df, sink, compression="zstd")
+            content = sink.getvalue().to_pybytes()
+        else:
+            content = df.to_json(orient="records", lines=True).encode()
+        
+        with pytest.raises(ValueError, match="exceeds the maximum size"):
+            reader(content, max_bytes=100 * 1024)
+        
+        capped = reader(content, columns=["n"], max_bytes=100 * 1024 if file_format != "ndjson" else 10 * 1024 * 1024)
+        assert capped["n"].tolist() == list(range(1000))
+    
+    def test_capped_stream_read(self):
+        """Test that the batch-wise read keeps the stream layout and projection"""
+        import pyarrow as pa
+        table = pa.Table.from_pandas(get_sample_dataframe(), preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        
+        df = read_feather(sink.getvalue().to_pybytes(), columns=["salary", "name"], max_bytes=1024 * 1024)
+        
+        pd.testing.assert_frame_equal(df, get_sample_dataframe()[["salary", "name"]])
+    
+    def test_parquet_statistics_are_merged_across_row_groups(self):
+        """Test that footer statistics describe the whole file"""
+        df = pd.DataFrame({"value": [5.0, None, 1.0, 9.0, None], "label": list("abcde")})
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False, row_group_size=2)
+        
+        stats = known_column_stats(read_parquet(buffer.getvalue()))
+        
+        assert stats["value"] == {"null_count": 2, "min": 1.0, "max": 9.0}
+        assert stats["label"]["null_count"] == 0
+    
+    def test_statistics_are_dropped_after_filtering(self):
+        """Test that stats for the file are not applied to a subset of rows"""
+        content, _ = create_columnar_data("parquet")
+        df = read_parquet(content)
+        
+        assert known_column_stats(df)
+        assert known_column_stats(df[df["age"] > 30]) == {}
+    
+    def test_data_summary_uses_parquet_statistics(self):
+        """Test that the summary takes min, max and nulls from the footer"""
+        content, _ = create_columnar_data("parquet")
+        df = read_parquet(content)
+        # Fake statistics prove the values were not recomputed from the data
+        df.attrs["column_stats"]["columns"]["age"].update({"min": -1, "max": 99})
+        
+        summary = ChatServiceImpl._get_data_summary(df)
+        
+        assert "'min': -1.0" in summary
+        assert "'max': 99.0" in summary
+
+@pytest.mark.unit
+class TestColumnarUploads:
+    """Unit tests for columnar uploads through FileServiceImpl"""
+    
+    @pytest.fixture
+    def file_service(self):
+        """Create FileServiceImpl with a mock AI service"""
+        mock_service = Mock()
+        mock_service.generate_insights = AsyncMock(return_value=["Insight 1"])
+        mock_service.generate_sample_questions = AsyncMock(return_value=["Question 1"])
+        return FileServiceImpl(mock_service)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("file_format, filename", [
+        ("parquet", "employees.parquet"),
+        ("feather", "employees.feather"),
+        ("feather", "employees.arrow"),
+        ("ndjson", "employees.jsonl"),
+        ("ndjson", "employees.ndjson"),
+    ])
+    async def test_process_columnar_file(self, file_service, file_format, filename):
+        """Test that columnar uploads are analysed like the equivalent CSV"""
+        content, size = create_columnar_data(file_format)
+        
+        analysis = await file_service.process_file(io.BytesIO(content), filename)
+        
+        assert analysis.rows == 5
+        assert analysis.headers == ["name", "age", "salary", "department"]
+        assert analysis.file_size == size
+        assert analysis.sheets is None
+        assert FileFormat.is_chat_supported(filename)
+    
+    @pytest.mark.asyncio
+    async def test_load_dataframe_with_projection(self, file_service):
+        """Test that load_dataframe forwards the column projection"""
+        content, _ = create_columnar_data("parquet")
+        
+        df = await file_service.load_dataframe(io.BytesIO(content), "employees.parquet", columns=["age"])
+        
+        assert df.columns.tolist() == ["age"]
+    
+    @pytest.mark.asyncio
+    async def test_decompressed_size_is_capped(self):
+        """Test that columnar uploads honour max_decompressed_size"""
+        content, _ = create_columnar_data("parquet")
+        file_service = FileServiceImpl(Mock(), max_decompressed_size=16)
+        
+        with pytest.raises(ValueError, match="exceeds the maximum size"):
+            await file_service.load_dataframe(io.BytesIO(content), "employees.parquet")
+    
+    @pytest.mark.asyncio
+    async def test_corrupt_parquet_file(self, file_service):
+        """Test that unreadable files raise a format specific error"""
+        with pytest.raises(ValueError, match="Error reading Parquet file"):
+            await file_service.load_dataframe(io.BytesIO(b"not parquet"), "broken.parquet")
@@ -0,0 +1,135 @@
+"""
+Unit tests for rolling conversation summaries
+"""
+import pytest
+from unittest.mock import Mock
+from src.entities.chat_message import ChatMessage, ChatSession
+from src.infrastructure.repositories.in_memory_chat_session_repository import InMemoryChatSessionRepository
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.services.conversation_history import ConversationHistory
+from tests.fixtures.sample_data import get_sample_dataframe
+
+def _session(messages, summary=None, summarized_until=None) -> ChatSession:
+    return ChatSession(
+        session_id="session-1", file_name="test.csv", messages=messages, created_at=0.0, last_updated=0.0,
+        summary=summary, summarized_until=summarized_until
+    )
+
+def _message(i: int, content: str = None) -> ChatMessage:
+    return ChatMessage(id=f"message-{i}", content=content or f"Message {i}", role="user", timestamp=float(i))
+
+@pytest.mark.unit
+class TestConversationHistory:
+    """Unit tests for ConversationHistory"""
+    
+    @pytest.fixture
+    def mock_ai_service(self):
+        """Create a mock AI service answering every request"""
+        mock_service = Mock()
+        mock_service.make_api_request = Mock(return_value="Chat response")
+        return mock_service
+    
+    @pytest.fixture
+    def chat_service(self, mock_ai_service):
+        """Create a chat service keeping two messages verbatim"""
+        repository = InMemoryChatSessionRepository()
+        history = ConversationHistory(mock_ai_service, repository, verbatim_messages=2, summary_max_tokens=50, summary_batch_size=3)
+        return ChatServiceImpl(mock_ai_service, repository=repository, history=history)
+    
+    @pytest.mark.asyncio
+    async def test_older_turns_are_summarised_in_background(self, chat_service, mock_ai_service):
+        """Test that messages leaving the verbatim window end up in the summary"""
+        session = await chat_service.create_chat_session("test.csv")
+        for i in range(5):
+            await chat_service.add_message(session.session_id, f"Message {i}", "user")
+    
+        mock_ai_service.make_api_request.return_value = "The user asked about messages 0 to 2."
+        await chat_service.get_chat_response(session.session_id, "Message 4", get_sample_dataframe())
+        await chat_service.history.drain()
+    
+        # The first request answered the user; the summary followed in the background
+        summary_call = mock_ai_service.make_api_request.call_args_list[1]
+        assert summary_call.kwargs["max_tokens"] == 50
+        assert "Message 2" in summary_call.args[0][1]["content"]
+        assert "Message 3" not in summary_call.args[0][1]["content"]
+    
+        session = await chat_service.get_chat_session(session.session_id)
+        assert session.summary == "The user asked about messages 0 to 2."
+        assert session.summarized_until == session.messages[2].timestamp
+    
+        mock_ai_service.make_api_request.return_value = "Chat response"
+        await chat_service.get_chat_response(session.session_id, "Message 4", get_sample_dataframe())
+        prompt = mock_ai_service.make_api_request.call_args.args[0][1]["content"]
+        assert "Summary of the earlier conversation: The user asked about messages 0 to 2." in prompt
+        assert "user: Message 3" in prompt
+        assert "user: Message 2" not in prompt
+    
+    def test_verbatim_messages_fit_the_token_budget(self, mock_ai_service):
+        """Test that older verbatim messages are dropped once the budget is used up"""
+        history = ConversationHistory(mock_ai_service, Mock(), verbatim_messages=3, verbatim_token_budget=10)
+        session = _session([_message(0, "a" * 20), _message(1, "b" * 20), _message(2, "c" * 100)])
+    
+        assert history.format_history(session) == ("user: " + "c" * 100)[:40]
+    
+        session = _session([_message(0, "a" * 10), _message(1, "b" * 10)], summary="Earlier", summarized_until=0.0)
+        assert history.format_history(session) == "Summary of the earlier conversation: Earlier\nuser: " + "b" * 10
+    
+    @pytest.mark.asyncio
+    async def test_summary_is_capped_and_failures_are_contained(self, mock_ai_service):
+        """Test that long summaries are cut to budget and model errors leave the session intact"""
+        repository = InMemoryChatSessionRepository()
+        history = ConversationHistory(mock_ai_service, repository, verbatim_messages=1, summary_max_tokens=5, summary_batch_size=2)
+        await repository.create_session(_session([]))
+        for i in range(3):
+            await repository.add_message("session-1", _message(i))
+    
+        mock_ai_service.make_api_request.side_effect = Exception("model unavailable")
+        history.schedule_summary("session-1")
+        await history.drain()
+        assert (await repository.get_session("session-1")).summary is None
+    
+        mock_ai_service.make_api_request.side_effect = None
+        mock_ai_service.make_api_request.return_value = "x" * 100
+        history.schedule_summary("session-1")
+        await history.drain()
+        session = await repository.get_session("session-1")
+        assert session.summary == "x" * 20
+        assert session.summarized_until == 1.0
+    
+    @pytest.mark.asyncio
+    async def test_first_summary_starts_at_the_oldest_messages(self, mock_ai_service):
+        """Test that a backlog larger than one batch is folded oldest first"""
+        repository = InMemoryChatSessionRepository()
+        history = ConversationHistory(mock_ai_service, repository, verbatim_messages=1, summary_batch_size=2)
+        await repository.create_session(_session([]))
+        for i in range(6):
+            await repository.add_message("session-1", _message(i))
+        
+        history.schedule_summary("session-1")
+        await history.drain()
+        
+        conversation = mock_ai_service.make_api_request.call_args.args[0][1]["content"]
+        assert "Message 0" in conversation and "Message 1" in conversation
+        assert "Message 3" not in conversation
+        assert (await repository.get_session("session-1")).summarized_until == 1.0
+    
+    @pytest.mark.asyncio
+    async def test_summaries_are_requested_once_per_batch(self, mock_ai_service):
+        """Test that folding waits for a full batch instead of running every turn"""
+        repository = InMemoryChatSessionRepository()
+        history = ConversationHistory(mock_ai_service, repository, verbatim_messages=2, summary_batch_size=3)
+        await repository.create_session(_session([]))
+        
+        for i in range(20):
+            await repository.add_message("session-1", _message(i))
+            history.schedule_summary("session-1")
+            await history.drain()
+        
+        # Batches leave the window after messages 5, 8, 11, 14, 17 and 20
+        assert mock_ai_service.make_api_request.call_count == 6
+        assert (await repository.get_session("session-1")).summarized_until == 17.0
+        
+        await repository.add_message("session-1", _message(20))
+        history.schedule_summary("session-1")
+        await history.drain()
+        assert mock_ai_service.make_api_request.call_count == 6
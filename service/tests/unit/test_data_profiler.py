@@ -0,0 +1,111 @@
+"""
+Unit tests for the shared data profiler
+"""
+import pytest
+import io
+import json
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock, AsyncMock
+from src.entities.data_profile import DataProfile
+from src.infrastructure.services.data_profiler import extract_sample_data, profile_dataframe, profile_summary
+from src.infrastructure.services.file_service_impl import FileServiceImpl
+from src.infrastructure.services.ollama_ai_service_impl import OllamaAIServiceImpl
+from tests.fixtures.sample_data import create_sample_csv_data, get_sample_dataframe
+
+@pytest.mark.unit
+class TestDataProfiler:
+    """Unit tests for profile_dataframe"""
+    
+    def test_numeric_and_text_columns(self):
+        """Test statistics for numeric and text columns"""
+        profile = profile_dataframe(get_sample_dataframe())
+        columns = {column.name: column for column in profile.columns}
+        
+        assert profile.total_rows == 5
+        assert profile.total_columns == 4
+        assert columns["age"].min == 25.0
+        assert columns["age"].max == 35.0
+        assert columns["age"].mean == 30.0
+        assert columns["age"].std == pytest.approx(get_sample_dataframe()["age"].std())
+        assert columns["department"].unique_count == 4
+        assert columns["department"].most_common == "Engineering"
+        assert columns["age"].unique_count is None
+    
+    def test_matches_per_column_statistics(self):
+        """Test the vectorised passes against the per-column pandas calls"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            "ints": rng.integers(0, 100, 200),
+            "floats": np.where(rng.random(200) < 0.2, np.nan, rng.random(200)),
+            "small": rng.integers(0, 5, 200).astype("int8"),
+            "nullable": pd.array([1, None] * 100, dtype="Int64"),
+            "text": rng.choice(["a", "b", "c", None], 200),
+            "category": pd.Categorical(rng.choice(["x", "y", "z"], 200)),
+            "flag": rng.random(200) < 0.5,
+            "when": pd.date_range("2024-01-01", periods=200)
+        })
+        
+        summary = profile_summary(profile_dataframe(df))["columns"]
+        
+        for col in ["ints", "floats", "small", "nullable"]:
+            assert summary[col]["null_count"] == int(df[col].isnull().sum())
+            assert summary[col]["min"] == float(df[col].min())
+            assert summary[col]["max"] == float(df[col].max())
+            assert summary[col]["mean"] == pytest.approx(float(df[col].mean()))
+            assert summary[col]["std"] == pytest.approx(float(df[col].std()))
+        for col in ["text", "category"]:
+            assert summary[col]["unique_count"] == df[col].nunique()
+            assert summary[col]["most_common"] == str(df[col].mode().iloc[0])
+        assert set(summary["flag"]) == {"type", "non_null_count", "null_count"}
+        assert set(summary["when"]) == {"type", "non_null_count", "null_count"}
+    
+    def test_edge_cases(self):
+        """Test empty, all-null and single-value columns"""
+        df = pd.DataFrame({"empty": [np.nan] * 3, "single": [1.0, np.nan, np.nan], "blank": [None] * 3})
+        
+        summary = profile_summary(profile_dataframe(df))["columns"]
+        
+        assert "mean" not in summary["empty"]
+        assert summary["single"]["std"] == 0
+        assert summary["blank"]["most_common"] == "N/A"
+        assert profile_dataframe(pd.DataFrame()).total_rows == 0
+    
+    def test_mode_ties_pick_the_smallest_value(self):
+        """Test that ties resolve like Series.mode()"""
+        profile = profile_dataframe(pd.DataFrame({"city": ["Paris", "Berlin", "Paris", "Berlin", "Rome"]}))
+        
+        assert profile.columns[0].most_common == "Berlin"
+    
+    def test_sample_data(self):
+        """Test that sample rows keep each value's own formatting"""
+        df = pd.DataFrame({"id": [1, 2, 3, 4], "score": [1.5, 2.0, np.nan, 4.0], "when": pd.to_datetime(["2024-01-01"] * 4)})
+        
+        assert extract_sample_data(df) == [
+            ["1", "1.5", "2024-01-01 00:00:00"],
+            ["2", "2.0", "2024-01-01 00:00:00"],
+            ["3", "nan", "2024-01-01 00:00:00"]
+        ]
+    
+    def test_summary_is_json_serialisable(self):
+        """Test that the prompt summary can be dumped as JSON"""
+        summary = OllamaAIServiceImpl._get_data_summary(get_sample_dataframe())
+        
+        assert json.loads(summary)["columns"]["salary"]["max"] == 70000.0
+    
+    @pytest.mark.asyncio
+    async def test_process_file_profiles_once(self):
+        """Test that both AI prompts receive the profile built during upload"""
+        ai_service = Mock()
+        ai_service.generate_insights = AsyncMock(return_value=["Insight"])
+        ai_service.generate_sample_questions = AsyncMock(return_value=["Question?"])
+        file_service = FileServiceImpl(ai_service)
+        csv_bytes, _ = create_sample_csv_data()
+        
+        analysis = await file_service.process_file(io.BytesIO(csv_bytes), "test.csv")
+        
+        profile = ai_service.generate_insights.await_args.args[2]
+        assert isinstance(profile, DataProfile)
+        assert ai_service.generate_sample_questions.await_args.args[2] is profile
+        assert analysis.sample_data == profile.sample_data
+        assert analysis.sample_data[0][0] == "Alice"
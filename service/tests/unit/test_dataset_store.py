@@ -0,0 +1,185 @@
+"""
+Unit tests for the content-addressed dataset store
+"""
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from src.infrastructure.services.dataset_store_impl import DatasetStoreImpl
+from tests.fixtures.sample_data import create_sample_csv_data, get_sample_dataframe
+
+@pytest.mark.unit
+class TestDatasetStoreImpl:
+    """Unit tests for DatasetStoreImpl"""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store backed by a temporary directory"""
+        return DatasetStoreImpl(str(tmp_path), max_disk_bytes=10 * 1024 * 1024, max_memory_items=2)
+    
+    def test_fingerprint_is_content_based(self, store):
+        """Test that equal bytes share a key and different bytes do not"""
+        csv_bytes, _ = create_sample_csv_data()
+        
+        assert store.fingerprint(csv_bytes) == store.fingerprint(bytes(csv_bytes))
+        assert store.fingerprint(csv_bytes) != store.fingerprint(csv_bytes + b"\n")
+    
+    def test_miss_then_memory_hit(self, store):
+        """Test that a stored frame is served from memory"""
+        df = get_sample_dataframe()
+        
+        assert store.get("abc", source_size=100) is None
+        store.put("abc", df)
+        cached = store.get("abc", source_size=100)
+        
+        pd.testing.assert_frame_equal(cached, df)
+        stats = store.get_stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["bytes_saved"] == 100
+        assert stats["hit_rate"] == 0.5
+    
+    def test_disk_hit_after_restart(self, store, tmp_path):
+        """Test that a new store instance loads the persisted columnar file"""
+        df = get_sample_dataframe()
+        store.put("abc", df)
+        
+        restarted = DatasetStoreImpl(str(tmp_path))
+        cached = restarted.get("abc", source_size=50)
+        
+        pd.testing.assert_frame_equal(cached, df)
+        assert restarted.get_stats()["disk_hits"] == 1
+        assert restarted.get_stats()["bytes_saved"] == 50
+    
+    def test_memory_cache_is_bounded(self, store):
+        """Test that only max_memory_items frames stay in memory"""
+        df = get_sample_dataframe()
+        for key in ["a", "b", "c"]:
+            store.put(key, df)
+        
+        assert store.get_stats()["memory_items"] == 2
+        # The oldest frame is still available from disk
+        assert store.get("a") is not None
+        assert store.get_stats()["disk_hits"] == 1
+    
+    def test_memory_budget_evicts_frames(self, tmp_path):
+        """Test that frames are evicted once their deep size passes the byte budget"""
+        df = get_sample_dataframe()
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        store = DatasetStoreImpl(str(tmp_path), max_memory_items=10, max_memory_bytes=int(size * 2.5))
+        for key in ["a", "b", "c"]:
+            store.put(key, df)
+        
+        stats = store.get_stats()
+        assert stats["memory_items"] == 2
+        assert stats["memory_bytes"] == size * 2
+        assert stats["memory_evictions"] == 1
+    
+    def test_idle_frames_are_demoted_to_disk(self, store):
+        """Test that frames unused past the idle time leave memory and reload on the next hit"""
+        df = get_sample_dataframe()
+        store.put("a", df)
+        store.put("b", df)
+        store.memory_idle_seconds = 60
+        store._last_access["a"] -= 120
+        
+        assert store.demote_idle() == 1
+        assert store.get_stats()["memory_items"] == 1
+        pd.testing.assert_frame_equal(store.get("a"), df)
+        stats = store.get_stats()
+        assert (stats["idle_demotions"], stats["disk_hits"], stats["memory_items"]) == (1, 1, 2)
+    
+    def test_unpersisted_frames_are_not_demoted(self, store):
+        """Test that frames missing from disk stay in memory"""
+        store.put("mixed", pd.DataFrame({"value": [1, "two", 3.0]}))
+        store.memory_idle_seconds = 0
+        
+        assert store.demote_idle() == 0
+        assert store.get("mixed") is not None
+    
+    @pytest.mark.parametrize("file_format", ["arrow", "parquet"])
+    def test_column_projection(self, tmp_path, file_format):
+        """Test that projected disk reads return only the asked columns and stay cold"""
+        df = get_sample_dataframe()
+        store = DatasetStoreImpl(str(tmp_path), file_format=file_format, memory_idle_seconds=0)
+        store.put("a", df)
+        store.demote_idle()
+        
+        projected = store.get("a", columns=["age", "missing"])
+        assert list(projected.columns) == ["age"]
+        assert store.get("a", columns=[]).shape == (len(df), 0)
+        stats = store.get_stats()
+        assert (stats["projected_reads"], stats["memory_items"]) == (2, 0)
+        
+        store.get("a")
+        assert list(store.get("a", columns=["name"]).columns) == ["name"]
+        assert store.get_stats()["memory_hits"] == 1
+    
+    def test_disk_cache_evicts_least_recently_used(self, tmp_path):
+        """Test that the disk cache stays under its size cap"""
+        df = get_sample_dataframe()
+        probe = DatasetStoreImpl(str(tmp_path / "probe"))
+        probe.put("probe", df)
+        file_size = probe.get_stats()["disk_bytes"]
+        
+        store = DatasetStoreImpl(str(tmp_path / "capped"), max_disk_bytes=file_size * 2, max_memory_items=0)
+        store.put("a", df)
+        store.put("b", df)
+        os.utime(store._path_for("a"), (0, 0))
+        store.put("c", df)
+        
+        stats = store.get_stats()
+        assert stats["disk_bytes"] <= file_size * 2
+        assert stats["disk_evictions"] == 1
+        assert store.get("a") is None
+        assert store.get("c") is not None
+    
+    def test_unencodable_frame_is_not_persisted(self, store):
+        """Test that frames pyarrow cannot write are kept in memory only"""
+        df = pd.DataFrame({"mixed": [1, "two", 3.0]})
+        
+        store.put("mixed", df)
+        
+        assert store.get_stats()["write_errors"] == 1
+        assert store.get("mixed") is df
+    
+    def test_arrow_frames_are_memory_mapped(self, tmp_path):
+        """Test that numeric columns loaded from disk are zero-copy views"""
+        df = pd.DataFrame({"id": np.arange(1000), "value": np.linspace(0, 1, 1000)})
+        DatasetStoreImpl(str(tmp_path)).put("numeric", df)
+        
+        cached = DatasetStoreImpl(str(tmp_path)).get("numeric")
+        
+        pd.testing.assert_frame_equal(cached, df)
+        assert os.path.exists(os.path.join(str(tmp_path), "numeric.arrow"))
+        # Views over the mapped file neither own nor may modify their data
+        assert not cached["id"].values.flags.owndata
+        assert not cached["value"].values.flags.writeable
+    
+    def test_stored_frames_are_kept_memory_mapped(self, tmp_path):
+        """Test that the memory tier holds the mapped file rather than the parsed copy"""
+        df = pd.DataFrame({"id": np.arange(1000), "value": np.linspace(0, 1, 1000)})
+        store = DatasetStoreImpl(str(tmp_path))
+        kept = store.put("numeric", df)
+        
+        cached = store.get("numeric")
+        
+        pd.testing.assert_frame_equal(cached, df)
+        assert cached is kept and cached is not df
+        assert not cached["value"].values.flags.writeable
+        assert store.get_stats()["memory_hits"] == 1
+    
+    def test_parquet_format(self, tmp_path):
+        """Test the Parquet on-disk format"""
+        df = get_sample_dataframe()
+        DatasetStoreImpl(str(tmp_path), file_format="parquet").put("abc", df)
+        
+        cached = DatasetStoreImpl(str(tmp_path), file_format="parquet").get("abc")
+        
+        pd.testing.assert_frame_equal(cached, df)
+        assert os.path.exists(os.path.join(str(tmp_path), "abc.parquet"))
+    
+    def test_unsupported_format(self, tmp_path):
+        """Test that unknown formats are rejected"""
+        with pytest.raises(ValueError, match="Unsupported dataset cache format"):
+            DatasetStoreImpl(str(tmp_path), file_format="csv")
@@ -0,0 +1,155 @@
+"""
+Unit tests for compressed upload handling
+"""
+import pytest
+import gzip
+import io
+import zipfile
+from unittest.mock import Mock, AsyncMock
+from src.enums.file_format import Compression, FileFormat
+from src.infrastructure.services.decompression import extract_archive, open_decompressed
+from src.infrastructure.services.file_service_impl import FileServiceImpl
+from tests.fixtures.sample_data import create_sample_csv_data, create_compressed_csv_data
+
+@pytest.mark.unit
+class TestFileFormatDetection:
+    """Unit tests for FileFormat.detect"""
+    
+    @pytest.mark.parametrize("filename, expected", [
+        ("data.csv", (FileFormat.CSV, None)),
+        ("DATA.CSV.GZ", (FileFormat.CSV, Compression.GZIP)),
+        ("data.csv.zst", (FileFormat.CSV, Compression.ZSTD)),
+        ("export.zip", (FileFormat.CSV, Compression.ZIP)),
+        ("report.xlsx", (FileFormat.EXCEL, None)),
+        ("report.xls", (FileFormat.EXCEL, None)),
+        ("export.parquet", (FileFormat.PARQUET, None)),
+        ("export.arrow", (FileFormat.FEATHER, None)),
+        ("events.jsonl", (FileFormat.NDJSON, None)),
+        ("notes.txt", (None, None)),
+        ("archive.gz", (None, None)),
+    ])
+    def test_detect(self, filename, expected):
+        """Test format and compression detection from file names"""
+        assert FileFormat.detect(filename) == expected
+    
+    def test_is_csv(self):
+        """Test that compressed CSVs count as CSV uploads"""
+        assert FileFormat.is_csv("data.csv.gz")
+        assert not FileFormat.is_csv("report.xlsx")
+
+@pytest.mark.unit
+class TestOpenDecompressed:
+    """Unit tests for open_decompressed"""
+    
+    @pytest.mark.parametrize("compression", ["gzip", "zstd", "zip"])
+    def test_round_trip(self, compression):
+        """Test that every codec yields the original CSV bytes"""
+        csv_bytes, _ = create_sample_csv_data()
+        compressed, _ = create_compressed_csv_data(compression)
+        
+        with open_decompressed(compressed, Compression(compression), 1024 * 1024) as stream:
+            assert stream.read() == csv_bytes
+    
+    def test_decompression_bomb_is_rejected(self):
+        """Test that the cap applies to decompressed bytes while streaming"""
+        bomb = gzip.compress(b"0" * (5 * 1024 * 1024))
+        assert len(bomb) < 10 * 1024
+        
+        with pytest.raises(ValueError, match="Decompressed file exceeds the maximum size"):
+            with open_decompressed(bomb, Compression.GZIP, 1024 * 1024) as stream:
+                stream.read()
+    
+    def test_zip_declared_size_is_checked_up_front(self):
+        """Test that oversized zip members are rejected before reading"""
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("big.csv", b"0" * (2 * 1024 * 1024))
+        
+        with pytest.raises(ValueError, match="Decompressed file exceeds the maximum size"):
+            open_decompressed(zip_buffer.getvalue(), Compression.ZIP, 1024 * 1024)
+    
+    def test_zip_must_hold_a_single_csv(self):
+        """Test that multi-file and non-CSV archives are rejected"""
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as archive:
+            archive.writestr("a.csv", b"a\n1\n")
+            archive.writestr("b.csv", b"b\n2\n")
+        
+        with pytest.raises(ValueError, match="exactly one CSV file"):
+            open_decompressed(zip_buffer.getvalue(), Compression.ZIP, 1024 * 1024)
+
+@pytest.mark.unit
+class TestExtractArchive:
+    """Unit tests for extract_archive"""
+    
+    EXTENSIONS = [".csv", ".zip", ".xlsx", ".parquet"]
+    
+    def test_supported_members_are_returned(self):
+        """Test that batch archives yield each supported file by base name"""
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as archive:
+            archive.writestr("2024/jan.csv", b"a\n1\n")
+            archive.writestr("2024/feb.csv", b"a\n2\n")
+            archive.writestr("readme.txt", b"ignored")
+            archive.writestr("__MACOSX/2024/._jan.csv", b"ignored")
+        
+        files = extract_archive(zip_buffer.getvalue(), self.EXTENSIONS, 1024 * 1024)
+        
+        assert files == [("jan.csv", b"a\n1\n"), ("feb.csv", b"a\n2\n")]
+    
+    def test_total_size_is_capped(self):
+        """Test that the cap covers all members together"""
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("a.csv", b"0" * (600 * 1024))
+            archive.writestr("b.csv", b"0" * (600 * 1024))
+        
+        with pytest.raises(ValueError, match="Decompressed file exceeds the maximum size"):
+            extract_archive(zip_buffer.getvalue(), self.EXTENSIONS, 1024 * 1024)
+    
+    def test_archive_without_supported_files(self):
+        """Test that an archive of unsupported files is rejected"""
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as archive:
+            archive.writestr("notes.txt", b"hello")
+        
+        with pytest.raises(ValueError, match="no supported files"):
+            extract_archive(zip_buffer.getvalue(), self.EXTENSIONS, 1024 * 1024)
+
+@pytest.mark.unit
+class TestCompressedUploads:
+    """Unit tests for compressed uploads through FileServiceImpl"""
+    
+    @pytest.fixture
+    def file_service(self):
+        """Create FileServiceImpl with a mock AI service and a small cap"""
+        mock_service = Mock()
+        mock_service.generate_insights = AsyncMock(return_value=["Insight 1"])
+        mock_service.generate_sample_questions = AsyncMock(return_value=["Question 1"])
+        return FileServiceImpl(mock_service, max_decompressed_size=64 * 1024)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compression, filename", [
+        ("gzip", "test.csv.gz"),
+        ("zstd", "test.csv.zst"),
+        ("zip", "test.zip"),
+    ])
+    async def test_process_compressed_csv(self, file_service, compression, filename):
+        """Test that compressed uploads are analysed like the plain CSV"""
+        compressed, compressed_size = create_compressed_csv_data(compression)
+        
+        analysis = await file_service.process_file(io.BytesIO(compressed), filename)
+        
+        assert analysis.rows == 5
+        assert analysis.headers == ["name", "age", "salary", "department"]
+        # The reported size is what was uploaded
+        assert analysis.file_size == compressed_size
+    
+    @pytest.mark.asyncio
+    async def test_oversized_decompressed_upload(self, file_service):
+        """Test that the decompressed cap is enforced on parse"""
+        rows = "".join(f"{i},{i * 2}\n" for i in range(20000))
+        compressed = gzip.compress(("a,b\n" + rows).encode("utf-8"))
+        
+        with pytest.raises(ValueError, match="Decompressed file exceeds the maximum size"):
+            await file_service.load_dataframe(io.BytesIO(compressed), "big.csv.gz")
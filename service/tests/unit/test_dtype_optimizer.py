@@ -0,0 +1,122 @@
+"""
+Unit tests for the dtype optimisation ingestion stage
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from src.infrastructure.services.dtype_optimizer import optimize_dtypes
+from tests.fixtures.sample_data import get_sample_dataframe
+
+@pytest.mark.unit
+class TestOptimizeDtypes:
+    """Unit tests for optimize_dtypes"""
+    
+    def test_numeric_text_is_coerced(self):
+        """Test currency, thousands separators and percentages"""
+        df = pd.DataFrame({
+            "price": ["$1,200", "$950", None, "$12.50"],
+            "growth": ["12%", " 3.5% ", "-1%", "0%"],
+            "units": ["1,000", "2,000", "3,000", "4,000"]
+        })
+        
+        optimized, report = optimize_dtypes(df)
+        
+        assert optimized["price"].tolist()[:2] == [1200.0, 950.0]
+        assert np.isnan(optimized["price"].iloc[2])
+        assert optimized["growth"].tolist() == [12.0, 3.5, -1.0, 0.0]
+        assert pd.api.types.is_integer_dtype(optimized["units"])
+        assert optimized["units"].tolist() == [1000, 2000, 3000, 4000]
+        assert set(report.conversions) == {"price", "growth", "units"}
+    
+    def test_identifiers_and_free_text_are_left_alone(self):
+        """Test that zero-padded codes and words are not treated as numbers"""
+        df = pd.DataFrame({
+            "zip": ["00123", "04567", "10001", "02134"],
+            "note": ["ok", "late", "1", "n/a"]
+        })
+        
+        optimized, _ = optimize_dtypes(df, category_ratio=0)
+        
+        assert optimized["zip"].tolist() == ["00123", "04567", "10001", "02134"]
+        assert optimized["note"].dtype == "object"
+    
+    def test_decimal_commas_and_long_numbers_are_not_corrupted(self):
+        """Test that values without a thousands shape or beyond int64 keep their meaning"""
+        df = pd.DataFrame({
+            "ratio": ["1,5", "2,25", "3,0", "4,75"],
+            "account": ["12345678901234567890", "12345678901234567891", "9", "10"],
+            "big": [1e20, 2e20, 3.0, 4.0],
+            "mixed": ["1,000", "12,5", "7", "8"]
+        })
+        
+        optimized, _ = optimize_dtypes(df, category_ratio=0)
+        
+        assert optimized["ratio"].tolist() == ["1,5", "2,25", "3,0", "4,75"]
+        assert optimized["account"].tolist() == ["12345678901234567890", "12345678901234567891", "9", "10"]
+        assert optimized["big"].dtype == "float64"
+        assert optimized["big"].tolist() == [1e20, 2e20, 3.0, 4.0]
+        assert optimized["mixed"].dtype == "object"
+    
+    def test_integer_and_float_downcasting(self):
+        """Test lossless numeric downcasting"""
+        df = pd.DataFrame({
+            "small": np.array([1, 2, 3], dtype="int64"),
+            "whole": [1.0, 2.0, 3.0],
+            "half": [0.5, 1.5, np.nan],
+            "precise": [0.1, 0.2, 0.3]
+        })
+        
+        optimized, _ = optimize_dtypes(df)
+        
+        assert optimized["small"].dtype == "int8"
+        assert optimized["whole"].dtype == "int8"
+        assert optimized["half"].dtype == "float32"
+        # float32 cannot represent 0.1 exactly, so the column is kept
+        assert optimized["precise"].dtype == "float64"
+        pd.testing.assert_series_equal(optimized["precise"], df["precise"])
+    
+    def test_low_cardinality_strings_become_categories(self):
+        """Test conversion of repeated labels to category"""
+        df = pd.DataFrame({
+            "region": ["north", "south"] * 50,
+            "customer": [f"customer-{i}" for i in range(100)]
+        })
+        
+        optimized, report = optimize_dtypes(df)
+        
+        assert isinstance(optimized["region"].dtype, pd.CategoricalDtype)
+        assert optimized["customer"].dtype == "object"
+        assert report.memory_after < report.memory_before
+    
+    def test_datetime_detection(self):
+        """Test that date strings are parsed and ambiguous columns are not"""
+        df = pd.DataFrame({
+            "ordered_at": ["2024-01-05", "2024-02-03", None, "2024-03-01"],
+            "mixed": ["2024-01-05", "yesterday", "2024-02-01", "2024-03-01"]
+        })
+        
+        optimized, _ = optimize_dtypes(df, category_ratio=0)
+        
+        assert pd.api.types.is_datetime64_any_dtype(optimized["ordered_at"])
+        assert optimized["ordered_at"].isna().sum() == 1
+        assert optimized["mixed"].dtype == "object"
+    
+    def test_report_memory_usage(self):
+        """Test that the report measures deep memory usage"""
+        df = pd.DataFrame({"label": ["a", "b"] * 1000, "value": np.arange(2000)})
+        
+        optimized, report = optimize_dtypes(df)
+        
+        assert report.memory_before == df.memory_usage(deep=True).sum()
+        assert report.memory_after == optimized.memory_usage(deep=True).sum()
+        assert report.bytes_saved > 0
+        assert report.reduction_ratio > 5
+    
+    def test_input_frame_is_not_modified(self):
+        """Test that the caller's frame keeps its dtypes"""
+        df = get_sample_dataframe()
+        dtypes = df.dtypes.copy()
+        
+        optimize_dtypes(df)
+        
+        pd.testing.assert_series_equal(df.dtypes, dtypes)
@@ -2,6 +2,7 @@
 Unit tests for entities
 """
 import pytest
+import time
 from datetime import datetime
 from src.entities.file_analysis import FileAnalysis
 from src.entities.chat_message import ChatMessage, ChatSession
@@ -72,7 +73,7 @@ class TestChatMessage:
     
     def test_chat_message_creation(self):
         """Test creating a ChatMessage instance"""
-        now = datetime.now()
+        now = time.time()
         message = ChatMessage(
             id="msg-123",
             content="Hello, how are you?",
@@ -89,7 +90,7 @@ class TestChatMessage:
     
     def test_chat_message_without_filename(self):
         """Test ChatMessage without file_name"""
-        now = datetime.now()
+        now = time.time()
         message = ChatMessage(
             id="msg-123",
             content="Hello",
@@ -101,7 +102,7 @@ class TestChatMessage:
     
     def test_chat_message_role_validation(self):
         """Test ChatMessage with different roles"""
-        now = datetime.now()
+        now = time.time()
         
         user_message = ChatMessage(
             id="msg-1",
@@ -119,6 +120,15 @@ class TestChatMessage:
         
         assert user_message.role == "user"
         assert assistant_message.role == "assistant"
+    
+    def test_chat_message_is_compact(self):
+        """Test that messages have no per-instance dict and share role and file name strings"""
+        first = ChatMessage(id="a", content="Hi", role="".join(["us", "er"]), timestamp=1.0, file_name="".join(["data", ".csv"]))
+        second = ChatMessage(id="b", content="Hi", role="".join(["us", "er"]), timestamp=2.0, file_name="".join(["data", ".csv"]))
+        
+        assert not hasattr(first, "__dict__")
+        assert first.role is second.role
+        assert first.file_name is second.file_name
 
 @pytest.mark.unit
 class TestChatSession:
@@ -126,7 +136,7 @@ class TestChatSession:
     
     def test_chat_session_creation(self):
         """Test creating a ChatSession instance"""
-        now = datetime.now()
+        now = time.time()
         session = ChatSession(
             session_id="session-123",
             file_name="test.csv",
@@ -143,7 +153,7 @@ class TestChatSession:
     
     def test_chat_session_with_messages(self):
         """Test ChatSession with messages"""
-        now = datetime.now()
+        now = time.time()
         messages = [
             ChatMessage(
                 id="msg-1",
@@ -173,8 +183,8 @@ class TestChatSession:
     
     def test_chat_session_timestamps(self):
         """Test ChatSession timestamp handling"""
-        created = datetime(2024, 1, 1, 12, 0, 0)
-        updated = datetime(2024, 1, 1, 12, 30, 0)
+        created = datetime(2024, 1, 1, 12, 0, 0).timestamp()
+        updated = datetime(2024, 1, 1, 12, 30, 0).timestamp()
         
         session = ChatSession(
             session_id="session-123",
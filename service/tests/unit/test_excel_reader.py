@@ -0,0 +1,56 @@
+"""
+Unit tests for the Excel ingestion engines
+"""
+import pytest
+import io
+import pandas as pd
+from src.infrastructure.services import excel_reader
+from src.infrastructure.services.excel_reader import read_excel_sheets, available_engine
+from tests.fixtures.sample_data import create_sample_excel_data, create_multi_sheet_excel_data
+
+ENGINES = [excel_reader.ENGINE_OPENPYXL]
+if excel_reader.CalamineWorkbook is not None:
+    ENGINES.append(excel_reader.ENGINE_CALAMINE)
+
+@pytest.mark.unit
+class TestExcelReader:
+    """Unit tests for read_excel_sheets"""
+    
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_matches_pandas_read_excel(self, engine):
+        """Test that every engine produces the frames pd.read_excel would"""
+        excel_bytes, _ = create_multi_sheet_excel_data()
+        expected = pd.read_excel(io.BytesIO(excel_bytes), sheet_name=None)
+        
+        sheets = read_excel_sheets(io.BytesIO(excel_bytes), engine=engine)
+        
+        assert list(sheets) == ["Products", "Orders"]
+        for name, df in expected.items():
+            pd.testing.assert_frame_equal(sheets[name], df, check_dtype=False)
+        assert sheets["Products"]["price"].dtype == "int64"
+        assert pd.api.types.is_datetime64_any_dtype(sheets["Orders"]["ordered_at"])
+    
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_duplicate_and_missing_headers(self, engine):
+        """Test header naming for blank and repeated header cells"""
+        df = pd.DataFrame([[1, 2, 3]], columns=["a", "a", None])
+        buffer = io.BytesIO()
+        df.to_excel(buffer, index=False)
+        
+        sheets = read_excel_sheets(io.BytesIO(buffer.getvalue()), engine=engine)
+        
+        assert list(sheets["Sheet1"].columns) == ["a", "a.1", "Unnamed: 2"]
+    
+    def test_available_engine_for_legacy_xls(self, monkeypatch):
+        """Test that .xls falls back to pandas when calamine is missing"""
+        monkeypatch.setattr(excel_reader, "CalamineWorkbook", None)
+        
+        assert available_engine("report.xls") == excel_reader.ENGINE_PANDAS
+        assert available_engine("report.xlsx") == excel_reader.ENGINE_OPENPYXL
+    
+    def test_unknown_engine(self):
+        """Test that unknown engines are rejected"""
+        excel_bytes, _ = create_sample_excel_data()
+        
+        with pytest.raises(ValueError, match="Unsupported Excel engine"):
+            read_excel_sheets(io.BytesIO(excel_bytes), engine="xlrd2")
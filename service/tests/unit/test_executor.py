@@ -0,0 +1,148 @@
+"""
+Unit tests for the DataFrame executor subsystem
+"""
+import asyncio
+import io
+import time
+import pytest
+import pandas as pd
+from unittest.mock import Mock, AsyncMock
+from src.infrastructure.executor import DataFrameExecutor, offload
+from src.infrastructure.services.file_service_impl import FileServiceImpl
+from src.infrastructure.services.columnar_reader import known_column_stats
+from tests.fixtures.sample_data import create_sample_csv_data, create_multi_sheet_excel_data, create_columnar_data, get_sample_dataframe
+
+def _build_frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(rows), "label": ["x"] * rows})
+
+def _build_mixed_frame() -> pd.DataFrame:
+    # Arrow cannot encode mixed-type object columns
+    return pd.DataFrame({"mixed": [1, "two", 3.0]})
+
+def _block(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+def _fail():
+    raise ValueError("boom")
+
+@pytest.mark.unit
+class TestDataFrameExecutor:
+    """Unit tests for DataFrameExecutor"""
+    
+    @pytest.fixture
+    def process_executor(self):
+        executor = DataFrameExecutor(kind="process", max_workers=2)
+        yield executor
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_thread_mode_returns_result_and_records_stats(self):
+        """Test a thread pool call and its queue metrics"""
+        executor = DataFrameExecutor(kind="thread", max_workers=2)
+        
+        df = await executor.run(_build_frame, 10)
+        
+        assert len(df) == 10
+        stats = executor.get_stats()
+        assert stats["kind"] == "thread"
+        assert stats["submitted"] == 1
+        assert stats["completed"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["avg_run_ms"] >= 0
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_process_mode_ships_frames_back(self, process_executor):
+        """Test DataFrames returned from worker processes, nested in containers"""
+        df = await process_executor.run(_build_frame, 1000)
+        nested = await process_executor.run(dict, {"a": get_sample_dataframe()})
+        mixed = await process_executor.run(_build_mixed_frame)
+        
+        pd.testing.assert_frame_equal(df, _build_frame(1000))
+        pd.testing.assert_frame_equal(nested["a"], get_sample_dataframe())
+        assert mixed["mixed"].tolist() == [1, "two", 3.0]
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_raised(self):
+        """Test that worker exceptions propagate"""
+        executor = DataFrameExecutor(kind="thread", max_workers=1)
+        
+        with pytest.raises(ValueError, match="boom"):
+            await executor.run(_fail)
+        
+        assert executor.get_stats()["failed"] == 1
+        assert executor.get_stats()["in_flight"] == 0
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Test that blocking work does not stall other coroutines"""
+        executor = DataFrameExecutor(kind="thread", max_workers=1)
+        ticks = []
+        
+        async def heartbeat():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+        
+        await asyncio.gather(executor.run(_block, 0.2), heartbeat())
+        
+        # All heartbeats fire while the blocking call is still running
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.2
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_queue_depth_and_wait_time(self):
+        """Test that work beyond the pool size is reported as queued"""
+        executor = DataFrameExecutor(kind="thread", max_workers=1)
+        
+        tasks = [asyncio.ensure_future(executor.run(_block, 0.05)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert executor.get_stats()["queue_depth"] == 2
+        await asyncio.gather(*tasks)
+        
+        assert executor.get_stats()["max_wait_ms"] >= 50
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_offload_without_executor_runs_inline(self):
+        """Test that offload falls back to a direct call"""
+        assert await offload(None, _block, 0) == "done"
+    
+    def test_unsupported_kind(self):
+        """Test that unknown executor kinds are rejected"""
+        with pytest.raises(ValueError, match="Unsupported executor kind"):
+            DataFrameExecutor(kind="gpu")
+    
+    @pytest.mark.asyncio
+    async def test_file_service_on_process_pool(self, process_executor):
+        """Test CSV and Excel processing with parsing in worker processes"""
+        ai_service = Mock()
+        ai_service.generate_insights = AsyncMock(return_value=["Insight"])
+        ai_service.generate_sample_questions = AsyncMock(return_value=["Question?"])
+        file_service = FileServiceImpl(ai_service, executor=process_executor)
+        csv_bytes, _ = create_sample_csv_data()
+        excel_bytes, _ = create_multi_sheet_excel_data()
+        
+        csv_analysis = await file_service.process_file(io.BytesIO(csv_bytes), "test.csv")
+        excel_analysis = await file_service.process_file(io.BytesIO(excel_bytes), "test.xlsx")
+        
+        assert csv_analysis.rows == 5
+        assert csv_analysis.sample_data[0][0] == "Alice"
+        assert [sheet.sheet_name for sheet in excel_analysis.sheets] == ["Products", "Orders"]
+        assert file_service.get_stats()["frames_optimized"] == 3
+        # Per upload one parse and one profile, plus two sheet analyses
+        assert process_executor.get_stats()["completed"] == 6
+    
+    @pytest.mark.asyncio
+    async def test_parquet_statistics_survive_process_pool(self, process_executor):
+        """Test that DataFrame.attrs are shipped back with the frame"""
+        ai_service = Mock()
+        file_service = FileServiceImpl(ai_service, executor=process_executor)
+        content, _ = create_columnar_data("parquet")
+        
+        df = await file_service.load_dataframe(io.BytesIO(content), "test.parquet")
+        
+        assert known_column_stats(df)["age"]["max"] == 35
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Unit tests for answering simple chat questions without the model
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.application.use_cases.chat_use_case import ChatUseCase
+from src.enums.question_intent import IntentKind
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.services.data_profiler import profile_dataframe
+from src.infrastructure.services.dataset_store_impl import DatasetStoreImpl
+from src.infrastructure.services.fast_answer_impl import FastAnswerImpl
+from tests.fixtures.sample_data import create_sample_csv_data, get_sample_dataframe
+
+COLUMNS = ["name", "age", "salary", "department"]
+
+@pytest.mark.unit
+class TestFastAnswerImpl:
+    """Unit tests for FastAnswerImpl"""
+    
+    @pytest.fixture
+    def fast_answer(self):
+        return FastAnswerImpl()
+    
+    @pytest.mark.parametrize("question,kind,column", [
+        ("How many rows are there?", IntentKind.ROW_COUNT, None),
+        ("how many records does the dataset have", IntentKind.ROW_COUNT, None),
+        ("Number of columns", IntentKind.COLUMN_COUNT, None),
+        ("What is the average salary?", IntentKind.MEAN, "salary"),
+        ("Can you tell me the median age", IntentKind.MEDIAN, "age"),
+        ("total Salary", IntentKind.SUM, "salary"),
+        ("What's the highest age?", IntentKind.MAX, "age"),
+        ("Which department is most common?", IntentKind.MOST_COMMON, "department"),
+        ("most frequent department", IntentKind.MOST_COMMON, "department"),
+        ("How many unique departments are there?", IntentKind.UNIQUE_COUNT, "department")
+    ])
+    def test_matches_simple_questions(self, fast_answer, question, kind, column):
+        """Test that lookups and aggregates over a known column are recognised"""
+        intent = fast_answer.match(question, COLUMNS)
+        assert (intent.kind, intent.column) == (kind, column)
+    
+    @pytest.mark.parametrize("question", [
+        "What is the average salary by department?",
+        "average bonus",
+        "How many rows have a salary above 60000?",
+        "Summarise the data",
+        "Which department is most common among engineers?"
+    ])
+    def test_other_questions_go_to_the_model(self, fast_answer, question):
+        """Test that anything beyond the simple patterns is not matched"""
+        assert fast_answer.match(question, COLUMNS) is None
+    
+    def test_answers_from_the_profile_or_the_frame(self, fast_answer):
+        """Test that answers agree whether they come from the profile or the data"""
+        df = get_sample_dataframe()
+        profile = profile_dataframe(df)
+    
+        for question in ["How many rows?", "average salary", "most common department", "lowest age"]:
+            intent = fast_answer.match(question, COLUMNS)
+            assert fast_answer.answer(intent, profile, None) == fast_answer.answer(intent, None, df)
+    
+        assert fast_answer.answer(fast_answer.match("average salary", COLUMNS), profile, None) == "The average salary is 60,000."
+        # Not in the profile and no data to compute it from
+        assert fast_answer.answer(fast_answer.match("median age", COLUMNS), profile, None) is None
+        assert fast_answer.answer(fast_answer.match("median age", COLUMNS), None, df) == "The median age is 30."
+        # Averages of text are left to the model
+        assert fast_answer.answer(fast_answer.match("average name", COLUMNS), None, df) is None
+    
+@pytest.mark.unit
+class TestChatFastPath:
+    """Unit tests for the fast path in ChatUseCase"""
+    
+    @pytest.fixture
+    def mock_ai_service(self):
+        mock_service = Mock()
+        mock_service.make_api_request = Mock(return_value="AI response")
+        return mock_service
+    
+    @pytest.fixture
+    def use_case(self, mock_ai_service, tmp_path):
+        mock_file_service = Mock()
+        mock_file_service.load_dataframe = AsyncMock(return_value=get_sample_dataframe())
+        return ChatUseCase(ChatServiceImpl(mock_ai_service), mock_file_service, DatasetStoreImpl(str(tmp_path)), FastAnswerImpl())
+    
+    @pytest.mark.asyncio
+    async def test_simple_questions_skip_the_model(self, use_case, mock_ai_service):
+        """Test that lookups and aggregates are answered without calling the model"""
+        csv_bytes, _ = create_sample_csv_data()
+        session = await use_case.create_session("test.csv", csv_bytes)
+    
+        # The first turn profiles the data; the fast path answers it from the frame
+        assert await use_case.send_message(session.session_id, "How many rows?") == "The dataset has 5 rows."
+        assert await use_case.send_message(session.session_id, "Tell me about the data") == "AI response"
+        await use_case.chat_service.history.drain()
+        calls = mock_ai_service.make_api_request.call_count
+    
+        assert await use_case.send_message(session.session_id, "What is the average age?") == "The average age is 30."
+        assert await use_case.send_message(session.session_id, "What is the total salary?") == "The total salary is 300,000."
+        assert mock_ai_service.make_api_request.call_count == calls
+    
+        stats = use_case.fast_answer.get_stats()
+        assert (stats["messages"], stats["fast_answers"], stats["column_reads"]) == (4, 3, 1)
+        assert stats["fast_path_fraction"] == 0.75
+    
+        messages = await use_case.get_session_messages(session.session_id)
+        assert messages[-1].content == "The total salary is 300,000."
+    
+    @pytest.mark.asyncio
+    async def test_turns_do_not_load_the_history_for_the_data(self, use_case):
+        """Test that looking up the session's data never reads its messages"""
+        csv_bytes, _ = create_sample_csv_data()
+        session = await use_case.create_session("test.csv", csv_bytes)
+        await use_case.send_message(session.session_id, "Tell me about the data")
+        await use_case.chat_service.history.drain()
+        
+        use_case.chat_service.get_chat_session = AsyncMock(wraps=use_case.chat_service.get_chat_session)
+        await use_case.send_message(session.session_id, "What is the average age?")
+        await use_case.send_message(session.session_id, "Which department pays best?")
+        
+        assert use_case.chat_service.get_chat_session.await_count == 2
+        for call in use_case.chat_service.get_chat_session.await_args_list:
+            assert call.kwargs == {"message_limit": 0}
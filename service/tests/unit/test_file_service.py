@@ -10,6 +10,7 @@ from src.entities.file_analysis import FileAnalysis
 from tests.fixtures.sample_data import (
     create_sample_csv_data,
     create_sample_excel_data,
+    create_multi_sheet_excel_data,
     create_csv_with_missing_data,
     create_csv_with_special_characters
 )
@@ -64,6 +65,33 @@ class TestFileServiceImpl:
         assert analysis.headers == ["product", "price", "category", "stock"]
         assert analysis.file_size == expected_size
     
+    @pytest.mark.asyncio
+    async def test_process_multi_sheet_excel_file(self, file_service):
+        """Test that every sheet of a workbook is profiled"""
+        excel_bytes, _ = create_multi_sheet_excel_data()
+        file_obj = io.BytesIO(excel_bytes)
+        
+        analysis = await file_service.process_file(file_obj, "test.xlsx")
+        
+        # The first sheet is the primary dataset
+        assert analysis.headers == ["product", "price", "category", "stock"]
+        assert [sheet.sheet_name for sheet in analysis.sheets] == ["Products", "Orders"]
+        orders = analysis.sheets[1]
+        assert orders.rows == 3
+        assert orders.headers == ["order_id", "product", "amount", "ordered_at"]
+        assert orders.missing_values == 1
+        assert orders.column_types["amount"] == "float64"
+        assert len(orders.sample_data) == 3
+    
+    @pytest.mark.asyncio
+    async def test_process_csv_file_has_no_sheets(self, file_service):
+        """Test that sheet results are only reported for workbooks"""
+        csv_bytes, _ = create_sample_csv_data()
+        
+        analysis = await file_service.process_file(io.BytesIO(csv_bytes), "test.csv")
+        
+        assert analysis.sheets is None
+    
     def test_read_csv_success(self, file_service):
         """Test successful CSV reading"""
         csv_bytes, _ = create_sample_csv_data()
@@ -175,4 +203,32 @@ class TestFileServiceImpl:
         
         assert len(sample_data) == 3
         assert len(sample_data[0]) == 4  # 4 columns
-        assert sample_data[0][0] == "Alice"  # First row, first column 
\ No newline at end of file
+        assert sample_data[0][0] == "Alice"  # First row, first column 
+    
+    def test_read_csv_uses_dataset_store(self, mock_ai_service, tmp_path):
+        """Test that identical uploads are parsed once"""
+        from src.infrastructure.services.dataset_store_impl import DatasetStoreImpl
+        store = DatasetStoreImpl(str(tmp_path))
+        file_service = FileServiceImpl(mock_ai_service, store)
+        csv_bytes, _ = create_sample_csv_data()
+        
+        first = file_service.read_csv(io.BytesIO(csv_bytes))
+        second = file_service.read_csv(io.BytesIO(csv_bytes))
+        
+        assert second is first
+        stats = store.get_stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["bytes_saved"] == len(csv_bytes)
+    
+    def test_read_csv_optimizes_dtypes(self, file_service):
+        """Test that parsed frames go through the dtype optimisation stage"""
+        csv_bytes = ("region,amount\n" + "north,$1,200\n".replace("$1,200", '"$1,200"') * 20).encode("utf-8")
+        
+        df = file_service.read_csv(io.BytesIO(csv_bytes))
+        
+        assert isinstance(df["region"].dtype, pd.CategoricalDtype)
+        assert df["amount"].iloc[0] == 1200
+        stats = file_service.get_stats()
+        assert stats["frames_optimized"] == 1
+        assert stats["memory_after_bytes"] < stats["memory_before_bytes"]
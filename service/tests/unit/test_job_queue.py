@@ -0,0 +1,190 @@
+"""
+Unit tests for the background analysis job queue
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, AsyncMock
+from src.application.use_cases.analysis_job_use_case import AnalysisJobUseCase
+from src.enums.job_status import AnalysisStage, JobStatus
+from src.infrastructure.services.job_queue_impl import JobQueueImpl
+from src.entities.chat_message import ChatSession
+from src.entities.file_analysis import FileAnalysis
+
+def _analysis() -> FileAnalysis:
+    return FileAnalysis(
+        file_name="test.csv",
+        rows=5,
+        columns=4,
+        headers=["name", "age", "salary", "department"],
+        sample_data=[["Alice", "25", "50000", "Engineering"]],
+        insights=["Insight 1"],
+        sample_questions=["Question 1"],
+        upload_timestamp=datetime(2024, 1, 1, 12, 0),
+        file_size=143
+    )
+
+async def wait_until_finished(queue, job_id):
+    """Wait for a job to complete or fail"""
+    async for job in queue.subscribe(job_id):
+        pass
+    return queue.get_job(job_id)
+
+@pytest.mark.unit
+class TestJobQueueImpl:
+    """Unit tests for JobQueueImpl"""
+    
+    @pytest.mark.asyncio
+    async def test_job_reports_stages_and_result(self):
+        """Test that a job moves through its stages to a stored result"""
+        queue = JobQueueImpl()
+        analysis = _analysis()
+        
+        async def runner(progress):
+            for stage in AnalysisStage:
+                progress(stage)
+                await asyncio.sleep(0)
+            return analysis, None
+        
+        job = await queue.submit("test.csv", runner)
+        assert job.status == JobStatus.QUEUED
+        
+        seen = [snapshot async for snapshot in queue.subscribe(job.job_id)]
+        
+        assert [s.stage for s in seen if s.status == JobStatus.RUNNING and s.stage] == list(AnalysisStage)
+        progress = [s.progress for s in seen]
+        assert progress == sorted(progress)
+        finished = seen[-1]
+        assert finished.status == JobStatus.COMPLETED
+        assert finished.progress == 1.0
+        assert finished.result is analysis
+        assert finished.finished_at is not None
+        await queue.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        """Test that no more than max_concurrent jobs run at once"""
+        queue = JobQueueImpl(max_concurrent=2)
+        running = 0
+        peak = 0
+        
+        async def runner(progress):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return _analysis(), None
+        
+        jobs = [await queue.submit(f"file{i}.csv", runner) for i in range(6)]
+        for job in jobs:
+            assert (await wait_until_finished(queue, job.job_id)).status == JobStatus.COMPLETED
+        
+        assert peak == 2
+        assert queue.get_stats()["completed"] == 6
+        await queue.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_failed_job_keeps_error(self):
+        """Test that a runner exception marks the job failed"""
+        queue = JobQueueImpl()
+        
+        async def runner(progress):
+            progress(AnalysisStage.PARSING)
+            raise ValueError("Error reading CSV file: bad data")
+        
+        job = await queue.submit("bad.csv", runner)
+        finished = await wait_until_finished(queue, job.job_id)
+        
+        assert finished.status == JobStatus.FAILED
+        assert finished.stage == AnalysisStage.PARSING
+        assert "bad data" in finished.error
+        assert queue.get_stats()["failed"] == 1
+        await queue.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_queue_limit(self):
+        """Test that submissions beyond max_queued are rejected"""
+        queue = JobQueueImpl(max_concurrent=1, max_queued=1)
+        release = asyncio.Event()
+        
+        async def runner(progress):
+            await release.wait()
+            return _analysis(), None
+        
+        first = await queue.submit("a.csv", runner)
+        await asyncio.sleep(0)  # let the worker pick the first job up
+        await queue.submit("b.csv", runner)
+        
+        with pytest.raises(ValueError, match="Too many queued analyses"):
+            await queue.submit("c.csv", runner)
+        assert queue.get_stats()["rejected"] == 1
+        
+        release.set()
+        await wait_until_finished(queue, first.job_id)
+        await queue.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire(self):
+        """Test that results are dropped after the TTL"""
+        queue = JobQueueImpl(result_ttl_seconds=60)
+        
+        async def runner(progress):
+            return _analysis(), None
+        
+        job = await queue.submit("test.csv", runner)
+        await wait_until_finished(queue, job.job_id)
+        assert queue.get_job(job.job_id) is not None
+        
+        queue._jobs[job.job_id].finished_at = datetime.now() - timedelta(seconds=61)
+        
+        assert queue.get_job(job.job_id) is None
+        assert [s async for s in queue.subscribe(job.job_id)] == []
+        await queue.shutdown()
+
+@pytest.mark.unit
+class TestAnalysisJobUseCase:
+    """Unit tests for AnalysisJobUseCase"""
+    
+    @pytest.mark.asyncio
+    async def test_submit_runs_analysis_and_creates_session(self):
+        """Test that the job runs the upload use case and opens a chat session"""
+        analysis = _analysis()
+        chat_session = ChatSession(session_id="session-123", file_name="test.csv", messages=[], created_at=None, last_updated=None)
+        file_upload_use_case = Mock()
+        file_upload_use_case.execute = AsyncMock(return_value=analysis)
+        chat_use_case = Mock()
+        chat_use_case.create_session = AsyncMock(return_value=chat_session)
+        queue = JobQueueImpl()
+        use_case = AnalysisJobUseCase(queue, file_upload_use_case, chat_use_case)
+        
+        job = await use_case.submit(b"a,b\n1,2\n", "test.csv")
+        snapshots = [snapshot async for snapshot in use_case.watch(job.job_id)]
+        
+        finished = snapshots[-1]
+        assert finished.status == JobStatus.COMPLETED
+        assert finished.result is analysis
+        assert finished.chat_session is chat_session
+        args = file_upload_use_case.execute.call_args.args
+        assert args[0].read() == b"a,b\n1,2\n"
+        assert args[1] == "test.csv"
+        chat_use_case.create_session.assert_called_once_with("test.csv", b"a,b\n1,2\n")
+        await queue.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_no_chat_session_for_excel(self):
+        """Test that workbooks are analysed without a chat session"""
+        file_upload_use_case = Mock()
+        file_upload_use_case.execute = AsyncMock(return_value=_analysis())
+        chat_use_case = Mock()
+        chat_use_case.create_session = AsyncMock()
+        queue = JobQueueImpl()
+        use_case = AnalysisJobUseCase(queue, file_upload_use_case, chat_use_case)
+        
+        job = await use_case.submit(b"xlsx", "report.xlsx")
+        finished = await wait_until_finished(queue, job.job_id)
+        
+        assert finished.status == JobStatus.COMPLETED
+        assert finished.chat_session is None
+        chat_use_case.create_session.assert_not_called()
+        await queue.shutdown()
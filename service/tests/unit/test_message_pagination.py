@@ -0,0 +1,34 @@
+"""
+Unit tests for message page cursors
+"""
+import random
+import pytest
+from datetime import datetime
+from src.entities.chat_message import MessageCursor
+from src.presentation.api.v1.message_pagination import later_cursor, parse_cursor
+
+@pytest.mark.unit
+class TestMessageCursors:
+    """Unit tests for parse_cursor and later_cursor"""
+    
+    def test_page_cursors(self):
+        """Test that header cursors round trip, with or without a message id"""
+        assert parse_cursor("1704110400.123456789:message-1", "after") == MessageCursor(1704110400.123456789, "message-1")
+        assert parse_cursor("1704110400.5", "after") == MessageCursor(1704110400.5)
+        assert parse_cursor(None, "after") is None
+    
+    def test_since_excludes_the_message_it_was_read_from(self):
+        """Test that passing back a message's ISO time never returns that message again"""
+        rng = random.Random(0)
+        for _ in range(2000):
+            timestamp = 1704110400 + rng.random() * 1000
+            cursor = parse_cursor(datetime.fromtimestamp(timestamp).isoformat(), "since")
+            assert cursor.timestamp >= timestamp
+            # Nor does it skip a message shown a microsecond later
+            assert datetime.fromtimestamp(cursor.timestamp + 1e-6) > datetime.fromtimestamp(timestamp)
+    
+    def test_later_cursor_keeps_zero(self):
+        """Test that the furthest cursor wins and a 0.0 cursor counts"""
+        assert later_cursor(MessageCursor(0.0), None) == MessageCursor(0.0)
+        assert later_cursor(MessageCursor(5.0, "m1"), MessageCursor(5.0)) == MessageCursor(5.0)
+        assert later_cursor(None, None) is None
@@ -0,0 +1,116 @@
+"""
+Unit tests for query mode: the SQL sandbox and the chat flow around it
+"""
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.services.duckdb_query_engine_impl import DuckDBQueryEngineImpl
+from tests.fixtures.sample_data import get_sample_dataframe
+
+@pytest.mark.unit
+class TestDuckDBQueryEngine:
+    """Unit tests for DuckDBQueryEngineImpl"""
+    
+    @pytest.fixture
+    def engine(self):
+        return DuckDBQueryEngineImpl(timeout_seconds=2, max_rows=5)
+    
+    def test_aggregates_over_every_row(self, engine):
+        """Test that queries see the full dataset and results are capped"""
+        df = pd.DataFrame({"city": ["a", "b"] * 500, "amount": range(1000)})
+    
+        result = engine.execute(df, "SELECT city, SUM(amount) AS total FROM data GROUP BY city ORDER BY city;")
+        assert result["total"].tolist() == [249500, 250000]
+    
+        assert len(engine.execute(df, "SELECT * FROM data")) == 5
+        assert engine.get_stats()["queries"] == 2
+    
+    def test_trailing_comment(self, engine):
+        """Test that a comment at the end of the query does not break the row cap"""
+        df = pd.DataFrame({"amount": range(100)})
+        
+        assert engine.execute(df, "SELECT SUM(amount) AS total FROM data -- total")["total"].tolist() == [4950]
+        assert len(engine.execute(df, "SELECT * FROM data -- every row")) == 5
+    
+    def test_long_values_are_truncated(self):
+        """Test that a single aggregate cannot return a whole column"""
+        engine = DuckDBQueryEngineImpl(max_cell_chars=20)
+        df = pd.DataFrame({"city": ["amsterdam", "berlin"] * 5000, "amount": range(10000)})
+        
+        result = engine.execute(df, "SELECT string_agg(city, ',') AS cities, list(amount) AS amounts, COUNT(*) AS n FROM data")
+        
+        assert result["cities"][0] == "amsterdam,berlin,ams..."
+        assert len(result["amounts"][0]) == 23
+        assert result["n"][0] == 10000
+        assert engine.execute(df, "SELECT city FROM data LIMIT 1")["city"][0] == "amsterdam"
+    
+    @pytest.mark.parametrize("sql", [
+        "DROP TABLE data",
+        "COPY data TO 'out.csv'",
+        "SELECT 1; SELECT 2",
+        "SET threads = 64",
+        "not sql at all"
+    ])
+    def test_rejects_anything_but_one_select(self, engine, sql):
+        """Test that statements other than a single SELECT never run"""
+        with pytest.raises(ValueError):
+            engine.execute(get_sample_dataframe(), sql)
+        assert engine.get_stats()["rejected"] == 1
+    
+    def test_cannot_read_files(self, engine, tmp_path):
+        """Test that the sandbox has no file access"""
+        path = tmp_path / "secret.csv"
+        path.write_text("a\n1\n")
+    
+        with pytest.raises(ValueError, match="Query failed"):
+            engine.execute(get_sample_dataframe(), f"SELECT * FROM read_csv('{path}')")
+    
+    def test_long_queries_are_interrupted(self):
+        """Test that a query is stopped at the timeout"""
+        engine = DuckDBQueryEngineImpl(timeout_seconds=0.2)
+    
+        with pytest.raises(ValueError, match="longer than"):
+            engine.execute(get_sample_dataframe(), "SELECT COUNT(*) FROM range(100000000000) a, range(1000) b")
+        assert engine.get_stats()["timeouts"] == 1
+    
+@pytest.mark.unit
+class TestQueryModeChat:
+    """Unit tests for ChatServiceImpl.get_query_response"""
+    
+    @pytest.fixture
+    def mock_ai_service(self):
+        mock_service = Mock()
+        mock_service.make_api_request = Mock()
+        return mock_service
+    
+    @pytest.mark.asyncio
+    async def test_answer_is_phrased_from_the_query_result(self, mock_ai_service):
+        """Test that the model plans the SQL and phrases the computed result"""
+        chat_service = ChatServiceImpl(mock_ai_service, query_engine=DuckDBQueryEngineImpl())
+        session = await chat_service.create_chat_session("test.csv")
+        mock_ai_service.make_api_request.side_effect = [
+            "```sql\nSELECT MAX(age) AS oldest FROM data\n```",
+            "The oldest person is 35."
+        ]
+    
+        response = await chat_service.get_query_response(session.session_id, "Who is oldest?", get_sample_dataframe())
+    
+        assert response == "The oldest person is 35."
+        plan_prompt = mock_ai_service.make_api_request.call_args_list[0].args[0][1]["content"]
+        assert "age (int64)" in plan_prompt
+        answer_prompt = mock_ai_service.make_api_request.call_args_list[1].args[0][1]["content"]
+        assert "oldest\n35" in answer_prompt
+    
+    @pytest.mark.asyncio
+    async def test_failed_query_falls_back_to_chat(self, mock_ai_service):
+        """Test that a bad plan is answered the usual way instead"""
+        chat_service = ChatServiceImpl(mock_ai_service, query_engine=DuckDBQueryEngineImpl())
+        session = await chat_service.create_chat_session("test.csv")
+        mock_ai_service.make_api_request.side_effect = ["DROP TABLE data", "From the summary", "Summary"]
+    
+        response = await chat_service.get_query_response(session.session_id, "Delete it", get_sample_dataframe())
+        await chat_service.history.drain()
+    
+        assert response == "From the summary"
+        assert chat_service.query_engine.get_stats()["rejected"] == 1
@@ -0,0 +1,119 @@
+"""
+Unit tests for streaming blocking provider iterators through the event loop
+"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.streaming import iterate_in_thread
+from tests.fixtures.sample_data import get_sample_dataframe
+
+def _slow_tokens(name: str, count: int, delay: float):
+    """A provider iterator that blocks while waiting for each token"""
+    for i in range(count):
+        time.sleep(delay)
+        yield f"{name}-{i} "
+
+@pytest.mark.unit
+class TestIterateInThread:
+    """Unit tests for iterate_in_thread"""
+    
+    @pytest.mark.asyncio
+    async def test_yields_every_item_in_order(self):
+        """Test that items and the end of the iterator come through"""
+        assert [item async for item in iterate_in_thread(lambda: range(200), max_buffered=8)] == list(range(200))
+    
+    @pytest.mark.asyncio
+    async def test_errors_reach_the_consumer(self):
+        """Test that a failing provider raises in the async loop"""
+        def failing():
+            yield "first"
+            raise ConnectionError("provider went away")
+    
+        received = []
+        with pytest.raises(ConnectionError, match="provider went away"):
+            async for item in iterate_in_thread(failing):
+                received.append(item)
+        assert received == ["first"]
+    
+    @pytest.mark.asyncio
+    async def test_full_buffer_holds_back_the_provider(self):
+        """Test backpressure: a stalled consumer stops the thread, closing early stops it for good"""
+        produced = []
+        closed = threading.Event()
+    
+        def tokens():
+            try:
+                for i in range(1000):
+                    produced.append(i)
+                    yield i
+            finally:
+                closed.set()
+    
+        stream = iterate_in_thread(tokens, max_buffered=4)
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.1)
+        # One taken, four buffered and one waiting to be put
+        assert len(produced) <= 6
+    
+        await stream.aclose()
+        assert await asyncio.to_thread(closed.wait, 1)
+        assert len(produced) < 1000
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_streams_progress_in_parallel(self):
+        """Test that blocking providers do not serialise streams or stall the loop"""
+        streams, tokens, delay = 8, 5, 0.05
+        arrivals = []
+    
+        async def consume(name):
+            async for item in iterate_in_thread(lambda: _slow_tokens(name, tokens, delay)):
+                arrivals.append(item)
+    
+        ticks = 0
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+    
+        beat = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        await asyncio.gather(*[consume(f"s{n}") for n in range(streams)])
+        elapsed = time.perf_counter() - start
+        beat.cancel()
+    
+        assert len(arrivals) == streams * tokens
+        # One after another would take streams * tokens * delay = 2s
+        assert elapsed < streams * tokens * delay / 3
+        # Every stream had its first token before any stream finished
+        first_tokens = [arrivals.index(f"s{n}-0 ") for n in range(streams)]
+        last_tokens = [arrivals.index(f"s{n}-{tokens - 1} ") for n in range(streams)]
+        assert max(first_tokens) < min(last_tokens)
+        assert ticks >= elapsed / 0.01 / 2
+    
+@pytest.mark.unit
+class TestStreamingChatResponse:
+    """Unit tests for streaming chat answers from a blocking provider"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_chats_stream_in_parallel(self):
+        """Test that chat streams over a blocking provider overlap"""
+        mock_ai_service = Mock()
+        mock_ai_service.make_api_request = Mock(return_value="Summary")
+        mock_ai_service.make_streaming_api_request = Mock(side_effect=lambda messages, max_tokens: _slow_tokens("token", 4, 0.05))
+        chat_service = ChatServiceImpl(mock_ai_service)
+        sessions = [await chat_service.create_chat_session("test.csv") for _ in range(6)]
+    
+        async def answer(session):
+            return "".join([chunk async for chunk in chat_service.get_streaming_chat_response(session.session_id, "Hi", get_sample_dataframe())])
+    
+        start = time.perf_counter()
+        answers = await asyncio.gather(*[answer(session) for session in sessions])
+        elapsed = time.perf_counter() - start
+        await chat_service.history.drain()
+    
+        assert answers == ["token-0 token-1 token-2 token-3 "] * 6
+        assert elapsed < 6 * 4 * 0.05 / 2
@@ -0,0 +1,249 @@
+"""
+Unit tests for resumable chunked uploads
+"""
+import asyncio
+import hashlib
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, AsyncMock
+from src.application.use_cases.chunked_upload_use_case import ChunkedUploadUseCase
+from src.application.use_cases.file_upload_use_case import FileUploadUseCase
+from src.entities.file_analysis import FileAnalysis
+from fastapi import HTTPException
+from src.infrastructure.services.upload_service_impl import UploadServiceImpl
+from src.presentation.api.v1.file_routes import read_validated_upload
+from src.presentation.api.v1.upload_routes import read_body
+from tests.fixtures.sample_data import create_large_csv_data
+
+def _chunks(content: bytes, size: int):
+    return [(offset, content[offset:offset + size]) for offset in range(0, len(content), size)]
+
+@pytest.mark.unit
+class TestUploadServiceImpl:
+    """Unit tests for UploadServiceImpl"""
+    
+    @pytest.fixture
+    def upload_service(self, tmp_path):
+        """Create an upload service in a temporary directory"""
+        return UploadServiceImpl(str(tmp_path), max_upload_size=1024 * 1024)
+    
+    def test_out_of_order_chunks_are_assembled(self, upload_service):
+        """Test that chunks written in any order rebuild the file"""
+        content, size = create_large_csv_data(200)
+        session = upload_service.create_upload("data.csv", size)
+        
+        for offset, chunk in reversed(_chunks(content, 1000)):
+            session = upload_service.write_chunk(session.upload_id, offset, chunk)
+        
+        assert session.complete
+        assert session.received_ranges == [[0, size]]
+        assert upload_service.read_upload(session.upload_id) == content
+        assert upload_service.get_checksum(session.upload_id) == hashlib.sha256(content).hexdigest()
+    
+    def test_parallel_chunks(self, upload_service):
+        """Test that concurrent writers do not lose ranges"""
+        content, size = create_large_csv_data(500)
+        session = upload_service.create_upload("data.csv", size)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda chunk: upload_service.write_chunk(session.upload_id, *chunk), _chunks(content, 512)))
+        
+        assert upload_service.get_upload(session.upload_id).complete
+        assert upload_service.get_checksum(session.upload_id) == hashlib.sha256(content).hexdigest()
+    
+    def test_received_ranges_after_gaps_and_retries(self, upload_service):
+        """Test range bookkeeping with a gap and a resent chunk"""
+        session = upload_service.create_upload("data.csv", 100)
+        upload_service.write_chunk(session.upload_id, 0, b"a" * 30)
+        upload_service.write_chunk(session.upload_id, 60, b"c" * 40)
+        session = upload_service.write_chunk(session.upload_id, 0, b"a" * 30)
+        
+        assert session.received_ranges == [[0, 30], [60, 100]]
+        assert session.received_bytes == 70
+        assert not session.complete
+        with pytest.raises(ValueError, match="Upload is incomplete"):
+            upload_service.read_upload(session.upload_id)
+    
+    def test_upload_survives_restart(self, upload_service, tmp_path):
+        """Test that a new service instance resumes from the manifest"""
+        content = b"a,b\n1,2\n3,4\n"
+        session = upload_service.create_upload("data.csv", len(content))
+        upload_service.write_chunk(session.upload_id, 0, content[:5])
+        
+        restarted = UploadServiceImpl(str(tmp_path))
+        resumed = restarted.get_upload(session.upload_id)
+        assert resumed.received_ranges == [[0, 5]]
+        
+        restarted.write_chunk(session.upload_id, 5, content[5:])
+        assert restarted.read_upload(session.upload_id) == content
+        assert restarted.get_checksum(session.upload_id) == hashlib.sha256(content).hexdigest()
+    
+    def test_invalid_requests(self, upload_service):
+        """Test size limits, out of range chunks and unknown ids"""
+        with pytest.raises(ValueError, match="File too large"):
+            upload_service.create_upload("big.csv", 2 * 1024 * 1024)
+        session = upload_service.create_upload("data.csv", 10)
+        with pytest.raises(ValueError, match="outside the upload size"):
+            upload_service.write_chunk(session.upload_id, 5, b"0123456789")
+        assert upload_service.get_upload("../../etc/passwd") is None
+        with pytest.raises(ValueError, match="Upload not found"):
+            upload_service.write_chunk("0" * 32, 0, b"x")
+    
+    def test_delete_and_expiry(self, tmp_path):
+        """Test that deleted and abandoned uploads lose their files"""
+        upload_service = UploadServiceImpl(str(tmp_path), ttl_seconds=0)
+        first = upload_service.create_upload("a.csv", 10)
+        assert upload_service.delete_upload(first.upload_id)
+        assert list(tmp_path.iterdir()) == []
+        
+        upload_service.create_upload("b.csv", 10)
+        upload_service.create_upload("c.csv", 10)
+        
+        stats = upload_service.get_stats()
+        assert stats["uploads_deleted"] == 1
+        assert stats["uploads_expired"] == 1
+        assert stats["active_uploads"] == 1
+
+@pytest.mark.unit
+class TestChunkedUploadUseCase:
+    """Unit tests for ChunkedUploadUseCase"""
+    
+    @pytest.fixture
+    def file_service(self):
+        """Create a mock file service"""
+        mock_service = Mock()
+        mock_service.process_file = AsyncMock(return_value=FileAnalysis(
+            file_name="data.csv", rows=1, columns=2, headers=["a", "b"],
+            sample_data=[["1", "2"]], insights=[], sample_questions=[]
+        ))
+        return mock_service
+    
+    @pytest.fixture
+    def use_case(self, tmp_path, file_service):
+        """Create the use case over a real upload service"""
+        return ChunkedUploadUseCase(UploadServiceImpl(str(tmp_path)), FileUploadUseCase(file_service, Mock()))
+    
+    @pytest.mark.asyncio
+    async def test_analysis_starts_when_last_chunk_arrives(self, use_case, file_service):
+        """Test that analysis runs before completion is requested"""
+        content = b"a,b\n1,2\n"
+        session = await use_case.start("data.csv", len(content), hashlib.sha256(content).hexdigest())
+        
+        await use_case.upload_chunk(session.upload_id, 4, content[4:])
+        assert file_service.process_file.await_count == 0
+        await use_case.upload_chunk(session.upload_id, 0, content[:4])
+        for _ in range(100):
+            if file_service.process_file.await_count:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert file_service.process_file.await_count == 1
+        analysis, chat_session = await use_case.complete(session.upload_id)
+        assert analysis.rows == 1
+        assert chat_session is None
+        # The early analysis was reused and the upload cleaned up
+        assert file_service.process_file.await_count == 1
+        assert await use_case.get_status(session.upload_id) is None
+        uploaded_file, filename = file_service.process_file.await_args.args
+        assert uploaded_file.read() == content
+        assert filename == "data.csv"
+    
+    @pytest.mark.asyncio
+    async def test_checksum_mismatch(self, use_case, file_service):
+        """Test that a corrupt upload is never analysed"""
+        session = await use_case.start("data.csv", 4, "0" * 64)
+        await use_case.upload_chunk(session.upload_id, 0, b"a,b\n")
+        
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            await use_case.complete(session.upload_id)
+        assert file_service.process_file.await_count == 0
+    
+    @pytest.mark.asyncio
+    async def test_abort(self, use_case):
+        """Test that aborting removes the upload"""
+        session = await use_case.start("data.csv", 4)
+        
+        assert await use_case.abort(session.upload_id)
+        assert await use_case.get_status(session.upload_id) is None
+    
+    @pytest.mark.asyncio
+    async def test_expired_uploads_drop_their_analyses(self, tmp_path, file_service):
+        """Test that analyses of abandoned uploads are not kept forever"""
+        use_case = ChunkedUploadUseCase(UploadServiceImpl(str(tmp_path), ttl_seconds=0), FileUploadUseCase(file_service, Mock()))
+        session = await use_case.start("data.csv", 4)
+        await use_case.upload_chunk(session.upload_id, 0, b"a,b\n")
+        assert session.upload_id in use_case._analyses
+        
+        await asyncio.sleep(0.01)
+        await use_case.start("other.csv", 4)
+        assert session.upload_id not in use_case._analyses
+
+@pytest.mark.unit
+class TestReadBody:
+    """Unit tests for the capped chunk body reader"""
+    
+    @staticmethod
+    def _request(parts, content_length=None):
+        request = Mock()
+        request.headers = {} if content_length is None else {"content-length": str(content_length)}
+        async def stream():
+            for part in parts:
+                yield part
+        request.stream = stream
+        return request
+    
+    @pytest.mark.asyncio
+    async def test_body_within_limit(self):
+        """Test that a chunk that fits is read whole"""
+        assert await read_body(self._request([b"ab", b"cd"], 4), 4) == b"abcd"
+    
+    @pytest.mark.asyncio
+    async def test_oversized_body_is_rejected(self):
+        """Test that bodies past the remaining size are refused, declared or not"""
+        with pytest.raises(HTTPException) as declared:
+            await read_body(self._request([b"abcd"], 4), 3)
+        assert declared.value.status_code == 413
+        
+        with pytest.raises(HTTPException) as streamed:
+            await read_body(self._request([b"ab", b"cd", b"ef"]), 3)
+        assert streamed.value.status_code == 413
+
+@pytest.mark.unit
+class TestReadValidatedUpload:
+    """Unit tests for the checked whole-file upload reader"""
+    
+    @staticmethod
+    def _upload(filename, content):
+        upload = Mock()
+        upload.filename = filename
+        upload.read = AsyncMock(side_effect=lambda size=-1: content if size < 0 else content[:size])
+        return upload
+    
+    @pytest.mark.asyncio
+    async def test_upload_within_limit(self):
+        """Test that a supported file that fits is returned whole"""
+        settings = Mock(allowed_extensions=[".csv"], max_file_size=4)
+        
+        assert await read_validated_upload(self._upload("data.csv", b"abcd"), settings) == b"abcd"
+    
+    @pytest.mark.asyncio
+    async def test_oversized_upload_is_not_read_whole(self):
+        """Test that only one byte past the limit is read before refusing"""
+        settings = Mock(allowed_extensions=[".csv"], max_file_size=4)
+        upload = self._upload("data.csv", b"x" * 100)
+        
+        with pytest.raises(HTTPException) as error:
+            await read_validated_upload(upload, settings)
+        assert error.value.status_code == 413
+        upload.read.assert_awaited_once_with(5)
+    
+    @pytest.mark.asyncio
+    async def test_unsupported_extension(self):
+        """Test that unsupported files are refused before being read"""
+        settings = Mock(allowed_extensions=[".csv"], max_file_size=4)
+        upload = self._upload("data.exe", b"ab")
+        
+        with pytest.raises(HTTPException) as error:
+            await read_validated_upload(upload, settings)
+        assert error.value.status_code == 400
+        upload.read.assert_not_awaited()
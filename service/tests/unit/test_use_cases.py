@@ -2,12 +2,16 @@
 Unit tests for use cases
 """
 import pytest
+from datetime import datetime
 import io
 from unittest.mock import Mock, AsyncMock
 from src.application.use_cases.file_upload_use_case import FileUploadUseCase
 from src.application.use_cases.chat_use_case import ChatUseCase
 from src.entities.file_analysis import FileAnalysis
 from src.entities.chat_message import ChatSession
+from src.enums.chat_mode import ChatMode
+from src.infrastructure.services.chat_service_impl import ChatServiceImpl
+from src.infrastructure.services.dataset_store_impl import DatasetStoreImpl
 from tests.fixtures.sample_data import create_sample_csv_data, get_sample_dataframe
 
 @pytest.mark.unit
@@ -62,7 +66,7 @@ class TestFileUploadUseCase:
         assert result.columns == 4
         
         # Verify the service was called
-        mock_file_service.process_file.assert_called_once_with(file_obj, "test.csv")
+        mock_file_service.process_file.assert_called_once_with(file_obj, "test.csv", progress=None)
     
     @pytest.mark.asyncio
     async def test_execute_file_service_error(self, use_case, mock_file_service):
@@ -99,6 +103,7 @@ class TestChatUseCase:
         """Create a mock file service"""
         mock_service = Mock()
         mock_service.read_csv = Mock()
+        mock_service.load_dataframe = AsyncMock()
         return mock_service
     
     @pytest.fixture
@@ -128,7 +133,7 @@ class TestChatUseCase:
         assert result.file_name == "test.csv"
         
         # Verify the service was called
-        mock_chat_service.create_chat_session.assert_called_once_with("test.csv")
+        mock_chat_service.create_chat_session.assert_called_once_with("test.csv", None)
     
     @pytest.mark.asyncio
     async def test_send_message_success(self, use_case, mock_chat_service, mock_file_service):
@@ -138,7 +143,7 @@ class TestChatUseCase:
         sample_df = get_sample_dataframe()
         
         # Mock service responses
-        mock_file_service.read_csv.return_value = sample_df
+        mock_file_service.load_dataframe.return_value = sample_df
         mock_chat_service.add_message.return_value = Mock()
         mock_chat_service.get_chat_response.return_value = "AI response"
         
@@ -150,7 +155,7 @@ class TestChatUseCase:
         
         # Verify services were called
         assert mock_chat_service.add_message.call_count == 2  # User message + AI response
-        mock_file_service.read_csv.assert_called_once()
+        mock_file_service.load_dataframe.assert_called_once()
         mock_chat_service.get_chat_response.assert_called_once_with("session-123", "What is the average age?", sample_df)
     
     @pytest.mark.asyncio
@@ -160,14 +165,14 @@ class TestChatUseCase:
         file_bytes = b"some content"
         
         # Mock file service to raise error
-        mock_file_service.read_csv.side_effect = ValueError("Only CSV files are supported for chat")
+        mock_file_service.load_dataframe.side_effect = ValueError("Only CSV, Parquet, Feather and JSON Lines files are supported for chat")
         
         # Execute the use case - should return error message
         result = await use_case.send_message("session-123", "Hello", file_bytes, "test.txt")
         
         # Should return error message
         assert "Error processing message" in result
-        assert "Only CSV files are supported for chat" in result
+        assert "Only CSV, Parquet, Feather and JSON Lines files are supported for chat" in result
     
     @pytest.mark.asyncio
     async def test_send_message_error_handling(self, use_case, mock_chat_service, mock_file_service):
@@ -176,7 +181,7 @@ class TestChatUseCase:
         csv_bytes, _ = create_sample_csv_data()
         
         # Make file service raise an exception
-        mock_file_service.read_csv.side_effect = Exception("File reading error")
+        mock_file_service.load_dataframe.side_effect = Exception("File reading error")
         
         # Execute the use case
         result = await use_case.send_message("session-123", "Hello", csv_bytes, "test.csv")
@@ -193,7 +198,7 @@ class TestChatUseCase:
         sample_df = get_sample_dataframe()
         
         # Mock service responses
-        mock_file_service.read_csv.return_value = sample_df
+        mock_file_service.load_dataframe.return_value = sample_df
         mock_chat_service.add_message.return_value = Mock()
         
         # Create async generator for streaming response
@@ -218,7 +223,7 @@ class TestChatUseCase:
         
         # Verify services were called
         assert mock_chat_service.add_message.call_count == 2  # User message + AI response
-        mock_file_service.read_csv.assert_called_once()
+        mock_file_service.load_dataframe.assert_called_once()
         mock_chat_service.get_streaming_chat_response.assert_called_once_with("session-123", "What is the average age?", sample_df)
     
     @pytest.mark.asyncio
@@ -228,7 +233,7 @@ class TestChatUseCase:
         csv_bytes, _ = create_sample_csv_data()
         
         # Make file service raise an exception
-        mock_file_service.read_csv.side_effect = Exception("File reading error")
+        mock_file_service.load_dataframe.side_effect = Exception("File reading error")
         
         # Execute the use case
         result_stream = use_case.send_streaming_message("session-123", "Hello", csv_bytes, "test.csv")
@@ -257,7 +262,19 @@ class TestChatUseCase:
         assert result == expected_messages
         
         # Verify the service was called
-        mock_chat_service.get_session_messages.assert_called_once_with("session-123")
+        mock_chat_service.get_session_messages.assert_called_once_with("session-123", before=None, after=None)
+    
+    @pytest.mark.asyncio
+    async def test_get_message_page(self, use_case, mock_chat_service):
+        """Test that one extra message is fetched to tell whether more pages follow"""
+        messages = [Mock(), Mock(), Mock()]
+        mock_chat_service.get_session_messages.return_value = messages
+        cursor = datetime(2024, 1, 1)
+        
+        assert await use_case.get_message_page("session-123", 2) == (messages[1:], True)
+        assert await use_case.get_message_page("session-123", 2, after=cursor) == (messages[:2], True)
+        assert await use_case.get_message_page("session-123", 3) == (messages, False)
+        mock_chat_service.get_session_messages.assert_called_with("session-123", 4, None, None)
     
     @pytest.mark.asyncio
     async def test_get_session(self, use_case, mock_chat_service):
@@ -279,4 +296,91 @@ class TestChatUseCase:
         assert result == expected_session
         
         # Verify the service was called
-        mock_chat_service.get_chat_session.assert_called_once_with("session-123") 
\ No newline at end of file
+        mock_chat_service.get_chat_session.assert_called_once_with("session-123") 
+
+@pytest.mark.unit
+class TestSessionBoundDatasets:
+    """Unit tests for chat sessions that keep their uploaded data"""
+    
+    @pytest.fixture
+    def mock_file_service(self):
+        """Create a mock file service that parses to the sample frame"""
+        mock_service = Mock()
+        mock_service.load_dataframe = AsyncMock(return_value=get_sample_dataframe())
+        return mock_service
+    
+    @pytest.fixture
+    def chat_service(self):
+        """Create a real chat service over a mock AI service"""
+        mock_ai_service = Mock()
+        mock_ai_service.make_api_request = Mock(return_value="AI response")
+        return ChatServiceImpl(mock_ai_service)
+    
+    @pytest.fixture
+    def use_case(self, chat_service, mock_file_service, tmp_path):
+        """Create ChatUseCase with a dataset store"""
+        return ChatUseCase(chat_service, mock_file_service, DatasetStoreImpl(str(tmp_path)))
+    
+    @pytest.mark.asyncio
+    async def test_messages_reuse_the_session_dataset(self, use_case, chat_service, mock_file_service):
+        """Test that the file is parsed once at session creation"""
+        csv_bytes, _ = create_sample_csv_data()
+        
+        session = await use_case.create_session("test.csv", csv_bytes)
+        assert session.dataset_key is not None
+        
+        for _ in range(3):
+            assert await use_case.send_message(session.session_id, "What is the average age?") == "AI response"
+        
+        mock_file_service.load_dataframe.assert_called_once()
+        assert len(await chat_service.get_session_messages(session.session_id)) == 6
+    
+    @pytest.mark.asyncio
+    async def test_file_sent_with_message_is_attached(self, use_case, chat_service, mock_file_service):
+        """Test that sessions created without data pick it up from a message"""
+        csv_bytes, _ = create_sample_csv_data()
+        session = await use_case.create_session("test.csv")
+        
+        result = await use_case.send_message(session.session_id, "Hello")
+        assert "No data is attached to this session" in result
+        
+        assert await use_case.send_message(session.session_id, "Hello", csv_bytes, "test.csv") == "AI response"
+        assert await use_case.send_message(session.session_id, "And now?") == "AI response"
+        assert mock_file_service.load_dataframe.call_count == 1
+        assert (await chat_service.get_chat_session(session.session_id)).dataset_key is not None
+    
+    @pytest.mark.asyncio
+    async def test_cold_dataset_stays_on_disk(self, use_case):
+        """Test that turns with a cached data prompt do not reload a demoted frame"""
+        csv_bytes, _ = create_sample_csv_data()
+        session = await use_case.create_session("test.csv", csv_bytes)
+        await use_case.send_message(session.session_id, "First?")
+        
+        store = use_case.dataset_store
+        store.memory_idle_seconds = 0
+        assert store.demote_idle() == 1
+        assert await use_case.send_message(session.session_id, "Second?") == "AI response"
+        
+        stats = store.get_stats()
+        assert (stats["projected_reads"], stats["memory_items"]) == (1, 0)
+    
+    @pytest.mark.asyncio
+    async def test_query_mode_loads_every_column(self, use_case):
+        """Test that query mode reads the full dataset even with a cached data prompt"""
+        csv_bytes, _ = create_sample_csv_data()
+        session = await use_case.create_session("test.csv", csv_bytes)
+        await use_case.send_message(session.session_id, "First?")
+        
+        store = use_case.dataset_store
+        store.memory_idle_seconds = 0
+        store.demote_idle()
+        assert await use_case.send_message(session.session_id, "How many?", mode=ChatMode.QUERY) == "AI response"
+        
+        stats = store.get_stats()
+        assert (stats["projected_reads"], stats["memory_items"]) == (0, 1)
+    
+    @pytest.mark.asyncio
+    async def test_unsupported_file_at_creation(self, use_case):
+        """Test that sessions cannot be created over unsupported files"""
+        with pytest.raises(ValueError, match="Only CSV, Parquet, Feather and JSON Lines files are supported for chat"):
+            await use_case.create_session("report.xlsx", b"data")